@@ -5,7 +5,7 @@ from django.utils.module_loading import import_string
 
 from rest_framework import routers
 
-from icekit.api.base_views import ModelViewSet
+from icekit.api.base_views import BulkWriteMixin, ModelViewSet
 
 from .models import WorkCreator as WorkCreatorModel
 from .api_serializers import WorkCreator
@@ -17,12 +17,11 @@ logger = logging.getLogger(__name__)
 ######################################################################
 # Create and register API endpoint to mange work-creator relationships
 ######################################################################
-class WorkCreatorAPIViewSet(ModelViewSet):
+class WorkCreatorAPIViewSet(BulkWriteMixin, ModelViewSet):
     """
     WorkCreator resource
     """
-    queryset = WorkCreatorModel.objects.all() \
-        .prefetch_related('work', 'creator', 'role')
+    queryset = WorkCreatorModel.objects.all()
 
     serializer_class = WorkCreator
 
@@ -0,0 +1,46 @@
+"""
+CSV exports of published works and creators, for the ``dump_collection_csv``
+management command.
+"""
+from icekit.api.export import CSVExport
+
+from .models import CreatorBase, WorkBase
+
+
+class WorkCSVExport(CSVExport):
+    model = WorkBase
+    columns = (
+        ('id', 'id'),
+        ('slug', 'slug'),
+        ('accession_number', 'accession_number'),
+        ('title', 'title'),
+        ('subtitle', 'subtitle'),
+        ('creation_date_display', 'creation_date_display'),
+        ('department', 'department'),
+        ('credit_line', 'credit_line'),
+        ('creators', 'workcreator_set.creator.name_display'),
+        ('origin_locations', 'workorigin_set.geographic_location'),
+        ('external_ref', 'external_ref'),
+    )
+
+    def get_queryset(self):
+        return super(WorkCSVExport, self).get_queryset() \
+            .filter(publishing_is_draft=False)
+
+
+class CreatorCSVExport(CSVExport):
+    model = CreatorBase
+    columns = (
+        ('id', 'id'),
+        ('slug', 'slug'),
+        ('name_display', 'name_display'),
+        ('name_sort', 'name_sort'),
+        ('start_date_display', 'start_date_display'),
+        ('end_date_display', 'end_date_display'),
+        ('work_accession_numbers', 'workcreator_set.work.accession_number'),
+        ('external_ref', 'external_ref'),
+    )
+
+    def get_queryset(self):
+        return super(CreatorCSVExport, self).get_queryset() \
+            .filter(publishing_is_draft=False)
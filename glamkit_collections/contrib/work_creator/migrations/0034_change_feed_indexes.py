@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gk_collections_work_creator', '0033_auto_20170615_2002'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='creatorbase',
+            index_together=set([('publishing_modified_at', 'id')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='workbase',
+            index_together=set([('publishing_modified_at', 'id')]),
+        ),
+    ]
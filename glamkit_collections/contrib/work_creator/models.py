@@ -198,6 +198,8 @@ class CreatorBase(
         verbose_name = "creator"
         ordering = ('name_sort', 'slug', 'publishing_is_draft')
         unique_together = ('slug', 'publishing_is_draft',)
+        # For API change feeds, which page through items by modified time
+        index_together = (('publishing_modified_at', 'id'),)
 
     def __unicode__(self):
         return self.get_title()
@@ -401,6 +403,8 @@ class WorkBase(
         verbose_name = "work"
         ordering = ('slug', 'publishing_is_draft', )
         unique_together = ('slug', 'publishing_is_draft',)
+        # For API change feeds, which page through items by modified time
+        index_together = (('publishing_modified_at', 'id'),)
 
     def __unicode__(self):
         if self.creation_date_display:
@@ -2,7 +2,8 @@ import rest_framework_filters as filters
 from rest_framework import routers
 
 from icekit.api.base_serializers import ModelSubSerializer
-from icekit.api.base_views import ModelViewSet
+from icekit.api.base_views import BulkWriteMixin, ChangeFeedMixin, \
+    HTTPCacheMixin, ModelViewSet
 from icekit.api.base_filters import CaseInsensitiveBooleanFilter, \
     WorkHasImagesFilter
 
@@ -62,12 +63,12 @@ class ArtworkFilter(filters.FilterSet):
         exclude = ('date', 'origin', 'url', 'dimensions',)
 
 
-class APIViewSet(ModelViewSet):
+class APIViewSet(BulkWriteMixin, HTTPCacheMixin, ChangeFeedMixin,
+                 ModelViewSet):
     """
     Artwork resource
     """
-    queryset = ArtworkModel.objects.all() \
-        .prefetch_related('creators', 'images')
+    queryset = ArtworkModel.objects.all()
 
     serializer_class = Artwork
     filter_class = ArtworkFilter
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from rest_framework import routers
 
-from icekit.api.base_views import ModelViewSet
+from icekit.api.base_views import BulkWriteMixin, ChangeFeedMixin, \
+    HTTPCacheMixin, ModelViewSet
 
 from ...api_serializers import MovingImageWork
 from .models import Film as FilmModel, Format as FormatModel
@@ -42,12 +43,12 @@ class Film(MovingImageWork):
             MovingImageWork.Meta.disable_unique_together_constraint_fields
 
 
-class APIViewSet(ModelViewSet):
+class APIViewSet(BulkWriteMixin, HTTPCacheMixin, ChangeFeedMixin,
+                 ModelViewSet):
     """
     Film resource
     """
-    queryset = FilmModel.objects.all() \
-        .prefetch_related('creators', 'images')
+    queryset = FilmModel.objects.all()
 
     serializer_class = Film
 
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from rest_framework import routers
 
-from icekit.api.base_views import ModelViewSet
+from icekit.api.base_views import BulkWriteMixin, ChangeFeedMixin, \
+    HTTPCacheMixin, ModelViewSet
 
 from ...api_serializers import MovingImageWork
 from .models import Game as GameModel, GameInputType as GameInputTypeModel, \
@@ -60,12 +61,12 @@ class Game(MovingImageWork):
             MovingImageWork.Meta.disable_unique_together_constraint_fields
 
 
-class APIViewSet(ModelViewSet):
+class APIViewSet(BulkWriteMixin, HTTPCacheMixin, ChangeFeedMixin,
+                 ModelViewSet):
     """
     Game resource
     """
-    queryset = GameModel.objects.all() \
-        .prefetch_related('creators', 'images')
+    queryset = GameModel.objects.all()
 
     serializer_class = Game
 
@@ -1,7 +1,8 @@
 from rest_framework import routers
 from rest_framework import serializers
 
-from icekit.api.base_views import ModelViewSet
+from icekit.api.base_views import BulkWriteMixin, ChangeFeedMixin, \
+    HTTPCacheMixin, ModelViewSet
 
 from ...api_serializers import Creator
 from .models import OrganizationCreator as OrganizationCreatorModel
@@ -73,7 +74,8 @@ class Organization(Creator):
         return obj.get_type_plural()
 
 
-class APIViewSet(ModelViewSet):
+class APIViewSet(BulkWriteMixin, HTTPCacheMixin, ChangeFeedMixin,
+                 ModelViewSet):
     """
     Organization resource.
     """
@@ -1,7 +1,8 @@
 from rest_framework import routers, serializers
 
 from icekit.api.base_serializers import ModelSubSerializer
-from icekit.api.base_views import ModelViewSet
+from icekit.api.base_views import BulkWriteMixin, ChangeFeedMixin, \
+    HTTPCacheMixin, ModelViewSet
 
 from ...api_serializers import Creator
 from .models import PersonCreator as PersonCreatorModel
@@ -117,7 +118,8 @@ class Person(Creator):
             Creator.Meta.disable_unique_together_constraint_fields
 
 
-class APIViewSet(ModelViewSet):
+class APIViewSet(BulkWriteMixin, HTTPCacheMixin, ChangeFeedMixin,
+                 ModelViewSet):
     """
     Artist resource.
     """
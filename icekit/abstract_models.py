@@ -8,7 +8,6 @@ from django.db import models
 from django.template.loader import get_template
 from django.utils import encoding, timezone
 from django.utils.translation import ugettext_lazy as _
-from fluent_contents.analyzer import get_template_placeholder_data
 from icekit.admin_tools.filters import ChildModelFilter
 
 from . import fields, plugins
@@ -69,6 +68,7 @@ class AbstractLayout(AbstractBaseModel):
         the given models to it. Append the verbose name of each model to the
         title with the given ``separator`` keyword argument.
         """
+        from icekit.utils.fluent_contents import warm_placeholder_data
         separator = kwargs.get('separator', ', ')
         content_types = ContentType.objects.get_for_models(*models).values()
         try:
@@ -86,19 +86,30 @@ class AbstractLayout(AbstractBaseModel):
         else:
             title = [layout.title]
             # Update.
+            existing_ids = set(
+                layout.content_types.values_list('pk', flat=True))
             for ct in content_types:
-                if not layout.content_types.filter(pk=ct.pk).exists():
+                if ct.pk not in existing_ids:
                     title.append(ct.model_class()._meta.verbose_name)
             layout.title = separator.join(sorted(title))
             layout.save()
             layout.content_types.add(*content_types)
+        # Parse placeholders now, so they are ready when the layout is used.
+        warm_placeholder_data([template_name])
         return layout
 
     def get_placeholder_data(self):
         """
-        Return placeholder data for this layout's template.
+        Return placeholder data for the template returned by `get_template`,
+        from the registry of parsed templates.
         """
-        return get_template_placeholder_data(self.get_template())
+        from icekit.utils.fluent_contents import get_loaded_template_name, \
+            get_placeholder_data
+        template = self.get_template()
+        return get_placeholder_data(
+            get_loaded_template_name(template) or self.template_name,
+            template,
+        )
 
     def get_template(self):
         """
@@ -6,3 +6,7 @@ class AppConfig(AppConfig):
     label = 'icekit_dashboard'
 
     verbose_name = 'Dashboard'
+
+    def ready(self):
+        from .previews import connect_preview_cache_invalidation
+        connect_preview_cache_invalidation()
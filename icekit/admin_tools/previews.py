@@ -1,14 +1,25 @@
+import re
+
 from django.contrib.contenttypes.models import ContentType
 from icekit.admin_tools.utils import admin_link
+from icekit.utils.cache import get_object_cache_parts, get_or_set, \
+    invalidate_namespace, make_key
 
 from django import http
+from django.apps import apps
 from django.conf.urls import patterns, url
 from django.contrib import admin
+from django.db.models import signals
+from django.db.models.fields import FieldDoesNotExist
 try:
     import json
 except ImportError:
     from django.utils import simplejson as json
 
+PREVIEW_FIELD_NAME_RE = re.compile(r'^[\w\d-]+$')
+PREVIEW_RAW_IDS_RE = re.compile(r'^[\d,]*$')
+
+
 class RawIdPreviewAdminMixin(admin.ModelAdmin):
     """
     Dynamically display preview rendering of FK/M2M fields in admin forms,
@@ -44,11 +55,20 @@ class RawIdPreviewAdminMixin(admin.ModelAdmin):
                 obj.image.url, unicode(obj))
 
     For InlineAdmins, call the function preview_<modelname>_<fieldname>.
+
+    Rendered previews are cached per object and its last modified date, and
+    invalidated whenever an object of the same model is saved or deleted. Set
+    `preview_cache_enabled = False` to disable caching for previews that vary
+    per request.
     """
 
     # Override this attribute with field names for which to show preview
     preview_fields = []
 
+    preview_cache_enabled = True
+    # Defaults to the `ICEKIT['CACHE_TIMEOUT']` setting
+    preview_cache_timeout = None
+
     class Media:
         js = ('admin/js/preview-field-admin.js',)
         css = {
@@ -73,6 +93,47 @@ class RawIdPreviewAdminMixin(admin.ModelAdmin):
             msg = unicode(exception)
         return u'<p class="error">{0}</p>'.format(msg)
 
+    def render_field_preview(self, obj, admin, request, field_name):
+        """
+        Return the preview HTML for a single object, which may raise an
+        exception if it cannot be rendered.
+        """
+        try:
+            obj_preview = admin.preview(obj, request)
+        except AttributeError:
+            try:
+                obj_preview = obj.preview(request)
+            except AttributeError:
+                try:
+                    obj_preview = getattr(self, 'preview_{0}'.format(
+                        field_name))(obj, request)
+                except AttributeError:
+                    # Fall back to default field rendering
+                    obj_preview = self.render_field_default(obj, request)
+        return admin_link(obj, inner_html=obj_preview)
+
+    def get_cached_field_preview(self, obj, admin, request, field_name):
+        """
+        Return the preview HTML for a single object from the cache, rendering
+        and caching it if necessary. Cached previews are invalidated when any
+        object of the same model is saved or deleted.
+        """
+        if not self.preview_cache_enabled:
+            return self.render_field_preview(obj, admin, request, field_name)
+        key = make_key(
+            get_preview_cache_namespace(type(obj)),
+            type(admin).__name__,
+            type(self).__name__,
+            field_name,
+            *get_object_cache_parts(obj)
+        )
+        return get_or_set(
+            key,
+            lambda: self.render_field_preview(
+                obj, admin, request, field_name),
+            timeout=self.preview_cache_timeout,
+        )
+
     def render_field_previews(self, id_and_obj_list, admin, request, field_name):
         """
         Override this to customise the preview representation of all objects.
@@ -82,24 +143,12 @@ class RawIdPreviewAdminMixin(admin.ModelAdmin):
             try:
                 # Handle invalid IDs
                 if obj is None:
-                    obj_preview = self.render_field_error(
+                    obj_link = self.render_field_error(
                         obj_id, obj, None, request
                     )
                 else:
-                    try:
-                        obj_preview = admin.preview(obj, request)
-                    except AttributeError:
-                        try:
-                            obj_preview = obj.preview(request)
-                        except AttributeError:
-                            try:
-                                obj_preview = getattr(self, 'preview_{0}'.format(
-                                    field_name))(obj, request)
-                            except AttributeError:
-                                # Fall back to default field rendering
-                                obj_preview = self.render_field_default(obj, request)
-
-                obj_link = admin_link(obj, inner_html=obj_preview)
+                    obj_link = self.get_cached_field_preview(
+                        obj, admin, request, field_name)
             except Exception as ex:
                 obj_link = self.render_field_error(obj_id, obj, ex, request)
             obj_preview_list.append(obj_link)
@@ -110,54 +159,67 @@ class RawIdPreviewAdminMixin(admin.ModelAdmin):
         else:
             return ''
 
-    def fetch_field_previews(self, request, pk, field_name, raw_ids):
-
+    def get_preview_model(self, request, pk):
+        """
+        Return the model class of the object being edited, without loading
+        the object itself.
+        """
         # polymorphic models need to resolve to the child model
         try:
-            instance = self.get_queryset(request).get(pk=pk)
-            if hasattr(instance, "get_real_instance"):
-                instance = instance.get_real_instance()
-            model = type(instance)
+            qs = self.get_queryset(request).filter(pk=pk)
+            if hasattr(qs, 'non_polymorphic'):
+                ct_id = qs.non_polymorphic() \
+                    .values_list('polymorphic_ctype_id', flat=True).get()
+                return ContentType.objects.get_for_id(ct_id).model_class()
+            return self.model
         except ValueError: # pk = "add"
             # if this is a polymorphic add, get the child model
             if request.GET.get('ct_id', None):
-                model = ContentType.objects.get(id=request.GET['ct_id']).model_class()
+                return ContentType.objects.get_for_id(
+                    request.GET['ct_id']).model_class()
             else:
-                model = self.model
+                return self.model
 
-        try:
-            ids = map(int, raw_ids.split(','))
-        except ValueError:
-            if raw_ids == '':
-                ids = []
-            else:
-                raise http.Http404
+    def get_related_admin(self, model, field_name):
+        """
+        Return the admin for the model targeted by a relationship field, or
+        raise `Http404` if the field is not a relationship.
+        """
+        rel = getattr(model._meta.get_field(field_name), 'rel', None)
+        if rel is None:
+            raise http.Http404
+        return self.admin_site._registry.get(rel.to)
 
+    def get_preview_target_admin(self, request, model, field_name):
+        """
+        Return a tuple of the admin for the model targeted by a field, and the
+        simplified field name used for `preview_<fieldname>` overrides.
+        """
         # in inlines, the field name is "inlinemodel_field-num-fieldname"
         if "-" in field_name:
-            inline_model_name, num, sub_field_name = field_name.split("-")
+            try:
+                inline_model_name, num, sub_field_name = field_name.split("-")
+            except ValueError:
+                raise http.Http404
 
             target_model_admin = None
 
-            if hasattr(model, inline_model_name):
-                # the inline model is an attribute of the parent model
-                # (e.g. 'FOO_set' or similar).
-                target_model_admin = self.admin_site._registry.get(
-                    # deep breath...
-                    getattr(model, inline_model_name).
-                        related.related_model.
-                        _meta.get_field(sub_field_name).rel.to
-                )
+            # the inline model may be an attribute of the parent model
+            # (e.g. 'FOO_set' or similar).
+            related = getattr(
+                getattr(model, inline_model_name, None), 'related', None)
+            if related is not None:
+                target_model_admin = self.get_related_admin(
+                    related.related_model, sub_field_name)
             else:
                 # look in (injected) inlines for the inline model
                 inlines = self.get_inline_instances(request)
                 for inline in inlines:
-                    content_type = ContentType.objects.get_for_model(inline.model)
-                    if inline_model_name == content_type.model:
+                    # Matches `ContentType.model` without a lookup
+                    if inline_model_name == inline.model._meta.model_name:
                         # this is our guy
-                        target_model_admin = self.admin_site._registry.get(
-                            inline.model._meta.get_field(sub_field_name).rel.to
-                        )
+                        target_model_admin = self.get_related_admin(
+                            inline.model, sub_field_name)
                         break
 
             # make a simplified field name for preview_FOO override
@@ -166,9 +228,20 @@ class RawIdPreviewAdminMixin(admin.ModelAdmin):
             if target_model_admin is None:
                 raise http.Http404
         else: # not an inline, just a field
-            target_model_admin = self.admin_site._registry.get(
-                model._meta.get_field(field_name).rel.to
-            )
+            target_model_admin = self.get_related_admin(model, field_name)
+        return target_model_admin, field_name
+
+    def get_field_previews_html(self, request, model, field_name, raw_ids):
+        try:
+            ids = map(int, raw_ids.split(','))
+        except ValueError:
+            if raw_ids == '':
+                ids = []
+            else:
+                raise http.Http404
+
+        target_model_admin, field_name = self.get_preview_target_admin(
+            request, model, field_name)
 
         if (
             target_model_admin and
@@ -180,17 +253,47 @@ class RawIdPreviewAdminMixin(admin.ModelAdmin):
             obj_dict = dict([(obj.pk, obj) for obj in qs.all()])
             ids_and_objs_list = map(lambda id: (id, obj_dict.get(id)), ids)
             # Generate preview HTML list
-            response_data = self.render_field_previews(
+            return self.render_field_previews(
                 ids_and_objs_list, admin=target_model_admin, request=request, field_name=field_name)
-        else:
-            response_data = ''  # graceful-ish.
+        return ''  # graceful-ish.
+
+    def fetch_field_previews(self, request, pk, field_name, raw_ids):
+        model = self.get_preview_model(request, pk)
+        response_data = self.get_field_previews_html(
+            request, model, field_name, raw_ids)
         return http.HttpResponse(
             json.dumps(response_data), content_type='application/json')
 
+    def fetch_field_previews_batch(self, request, pk):
+        """
+        Return previews for many fields in one request, as a JSON object
+        mapping field names to preview HTML, or `null` for fields that could
+        not be previewed.
+
+        Fields and their IDs are given as repeated `field` GET parameters in
+        the format `field=<fieldname>:<id>,<id>,...`.
+        """
+        model = self.get_preview_model(request, pk)
+        response_data = {}
+        for field_spec in request.GET.getlist('field'):
+            field_name, _, raw_ids = field_spec.partition(':')
+            if not PREVIEW_FIELD_NAME_RE.match(field_name) \
+                    or not PREVIEW_RAW_IDS_RE.match(raw_ids):
+                raise http.Http404
+            try:
+                response_data[field_name] = self.get_field_previews_html(
+                    request, model, field_name, raw_ids)
+            except (http.Http404, FieldDoesNotExist):
+                response_data[field_name] = None
+        return http.HttpResponse(
+            json.dumps(response_data), content_type='application/json')
 
     def get_urls(self):
         urlpatterns = patterns(
             '',
+            url(
+                r'^(?P<pk>.+)/preview-fields/$',
+                self.admin_site.admin_view(self.fetch_field_previews_batch)),
             url(
                 r'^(?P<pk>.+)/preview-field/(?P<field_name>[\w\d-]+)/(?P<raw_ids>[\d,]+)/$',
                 self.admin_site.admin_view(self.fetch_field_previews))
@@ -199,6 +302,47 @@ class RawIdPreviewAdminMixin(admin.ModelAdmin):
         return urlpatterns + super(RawIdPreviewAdminMixin, self).get_urls()
 
 
+def get_preview_cache_namespace(model):
+    return 'admin_previews:%s.%s' % (
+        model._meta.app_label, model._meta.model_name)
+
+
+def invalidate_preview_cache(sender, **kwargs):
+    """
+    Invalidate cached previews for all objects of the saved or deleted
+    object's model.
+    """
+    invalidate_namespace(get_preview_cache_namespace(sender))
+
+
+def get_preview_models():
+    """
+    Return the models that relationship fields, and so raw ID fields, can
+    target, including subclasses of those models.
+    """
+    targets = set()
+    for model in apps.get_models():
+        for field in model._meta.fields + model._meta.many_to_many:
+            rel = getattr(field, 'rel', None)
+            if rel is not None and isinstance(rel.to, type):
+                targets.add(rel.to)
+    targets = tuple(targets)
+    return [m for m in apps.get_models() if issubclass(m, targets)]
+
+
+def connect_preview_cache_invalidation():
+    """
+    Connect `invalidate_preview_cache` for the models that can be previewed,
+    so saves in any process invalidate cached previews.
+    """
+    for model in get_preview_models():
+        dispatch_uid = get_preview_cache_namespace(model)
+        signals.post_save.connect(
+            invalidate_preview_cache, sender=model, dispatch_uid=dispatch_uid)
+        signals.post_delete.connect(
+            invalidate_preview_cache, sender=model, dispatch_uid=dispatch_uid)
+
+
 # TODO: Holdover from CookedIdAdmin. Not sure whether this is still needed.
 
 # class MediaWithInlineJS(Media):
@@ -16,35 +16,71 @@
 			preview_container.html(html);
 		}
 
-		function fetchPreview(field) {
-			var ids = field.val();
+		function sanitizeIds(ids) {
 			if (!ids) {
 				return "";
 			}
 			// Convoluted process to sanitize list of IDs into 1,2,3 format.
 			// In particular this fixes leading, trailing or repeated commas or
 			// spaces.
-			ids = ids.replace(/[ ,]+/g, " ").trim().split(" ").join(",");
+			return ids.replace(/[ ,]+/g, " ").trim().split(" ").join(",");
+		}
+
+		// Fields waiting for a preview, keyed by name. Changes made in the
+		// same tick, such as the initial load of the form, are coalesced into
+		// a single request for all fields.
+		var pending_fields = {};
+		var pending_timeout = null;
+
+		function fetchPendingPreviews() {
+			var fields = pending_fields;
+			pending_fields = {};
+			pending_timeout = null;
+
+			var params = [];
+			$.each(fields, function(name, field) {
+				var ids = sanitizeIds(field.val());
+				if (ids) {
+					params.push({name: "field", value: name + ":" + ids});
+				} else {
+					insertPreview(field, "");
+					delete fields[name];
+				}
+			});
+			if (!params.length) {
+				return;
+			}
 
 			var url_base = window.location.pathname;
 			var url_search = window.location.search;
-			var preview_fetch_url = url_base + "preview-field/" + field.attr("name") + "/" + ids + "/";
-			if (url_search) {
-				preview_fetch_url += url_search;
-			}
-			$.get(preview_fetch_url
-			).done(function(html_response) {
-				insertPreview(field, html_response);
+			var preview_fetch_url = url_base + "preview-fields/" +
+				(url_search ? url_search + "&" : "?") + $.param(params);
+			$.getJSON(preview_fetch_url
+			).done(function(previews) {
+				$.each(fields, function(name, field) {
+					var html = previews[name];
+					if (html === null || html === undefined) {
+						html = "Could not load preview";
+					}
+					insertPreview(field, html);
+				});
 			}).fail(function(response) {
-				insertPreview(field, "Could not load preview");
+				$.each(fields, function(name, field) {
+					insertPreview(field, "Could not load preview");
+				});
 			});
 		}
 
+		function fetchPreview(field) {
+			pending_fields[field.attr("name")] = field;
+			if (pending_timeout === null) {
+				pending_timeout = setTimeout(fetchPendingPreviews, 0);
+			}
+		}
+
 		// Attach `change` event handler to previewable fields
 		$("body").on('change', input_selector, function() {
-			var field = $(this);
-			var html = fetchPreview(field);
-			insertPreview(field, html);
+			fetchPreview($(this));
 		} );
 		//trigger initial change to load preview on initial form load.
 		$(input_selector).change();
@@ -1,7 +1,104 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_save
+
+
+def get_tombstone_models():
+    """
+    Return the models whose deletions are recorded as `Tombstone`s for API
+    change feeds: publishable models, including the published copies deleted
+    when items are unpublished, and images.
+    """
+    from icekit.publishing.models import PublishingModel
+    tombstone_models = []
+    for model in apps.get_models():
+        opts = model._meta
+        if opts.proxy:
+            continue
+        if issubclass(model, PublishingModel) or \
+                (opts.app_label, opts.model_name) == \
+                ('icekit_plugins_image', 'image'):
+            tombstone_models.append(model)
+    return tombstone_models
+
+
+def get_alias_models():
+    """
+    Return the models whose objects' identifiers are kept as `SlugAlias`es:
+    all installed models with a ``slug`` field, so any `RedirectViewset` can
+    look up their objects.
+    """
+    from django.core.exceptions import FieldDoesNotExist
+    alias_models = []
+    for model in apps.get_models():
+        if model._meta.proxy:
+            continue
+        try:
+            model._meta.get_field('slug')
+        except FieldDoesNotExist:
+            continue
+        alias_models.append(model)
+    return alias_models
+
+
+def get_cached_viewsets():
+    """
+    Return the `HTTPCacheMixin` viewsets of the ICEkit APIs and of the routers
+    in the ``EXTRA_API_ROUTERS`` setting.
+    """
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+    from .base_views import HTTPCacheMixin
+    from .images.views import ImageViewSet
+    from .pages.views import PageViewSet
+    viewsets = [ImageViewSet, PageViewSet]
+    for __, router in getattr(settings, 'EXTRA_API_ROUTERS', []):
+        if isinstance(router, basestring):
+            router = import_string(router)
+        viewsets.extend(viewset for __, viewset, __ in router.registry)
+    return [
+        viewset for viewset in viewsets
+        if issubclass(viewset, HTTPCacheMixin)
+    ]
+
+
+def get_cached_models():
+    """
+    Return the models rendered by `HTTPCacheMixin` viewsets, as planned by
+    `icekit.api.prefetch`, whose changes invalidate cached API data.
+    """
+    from .prefetch import get_prefetch_plan
+    cached_models = set()
+    for viewset in get_cached_viewsets():
+        cached_models.add(viewset.queryset.model)
+        serializer = viewset.serializer_class()
+        if hasattr(getattr(serializer, 'Meta', None), 'model'):
+            cached_models.update(get_prefetch_plan(serializer).get_models())
+    return cached_models
 
 
 class APIConfig(AppConfig):
     name = '.'.join(__name__.split('.')[:-1])  # Package with `apps` module
     label = '_'.join(__name__.split('.')[:-1])
     verbose_name = 'ICEkitAPI'
+
+    def ready(self):
+        from .models import delete_slug_aliases, invalidate_api_cache, \
+            record_tombstone, update_slug_aliases
+        from icekit.utils.cache import connect_invalidation
+        tombstone_models = get_tombstone_models()
+        for model in tombstone_models:
+            db_table = model._meta.db_table
+            post_delete.connect(
+                record_tombstone, sender=model,
+                dispatch_uid='icekit_api_tombstone_%s' % db_table)
+        # Changes to these models, or their subclasses, invalidate the cached
+        # data of the viewsets rendering them
+        connect_invalidation(
+            invalidate_api_cache,
+            tuple(set(tombstone_models) | get_cached_models()))
+        # Proxies of these models are connected too
+        alias_models = tuple(get_alias_models())
+        connect_invalidation(
+            update_slug_aliases, alias_models, signals=(post_save,))
+        connect_invalidation(
+            delete_slug_aliases, alias_models, signals=(post_delete,))
@@ -2,6 +2,7 @@ from collections import OrderedDict
 
 import attr
 
+from django.core.exceptions import FieldDoesNotExist
 from rest_framework import serializers
 from rest_framework.relations import HyperlinkedIdentityField
 from rest_framework.validators import UniqueValidator, UniqueTogetherValidator
@@ -74,6 +75,42 @@ class ModelSubSerializer(serializers.ModelSerializer):
         return instance
 
 
+class CompactFieldsMixin(object):
+    """
+    Serializer mixin to leave out heavy fields, named in the
+    ``compact_exclude_fields`` option of the serializer's `Meta`, from the
+    representation of ``GET`` requests with a ``compact`` query parameter,
+    unless they are selected with the ``fields`` query parameter.
+
+    This keeps responses small, and the columns loaded for them few, for
+    clients that list many items, like image pickers:
+
+        /api/image/?compact=1
+    """
+    compact_query_param = 'compact'
+
+    def __init__(self, *args, **kwargs):
+        super(CompactFieldsMixin, self).__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        query_params = getattr(request, 'query_params', request.GET)
+        compact = query_params.get(self.compact_query_param)
+        if compact is None or compact.lower() in ('0', 'false', 'no'):
+            return
+        selected = query_params.get('fields', '').split(',')
+        for fieldname in getattr(self.Meta, 'compact_exclude_fields', ()):
+            if fieldname not in selected:
+                self.fields.pop(fieldname, None)
+
+
+class RelatedInstanceError(TypeError):
+    """
+    Raised when the data given for a writable related field cannot be used to
+    look up, update or create a related instance.
+    """
+
+
 @attr.s
 class WritableRelatedFieldSettings(object):
     """
@@ -131,22 +168,12 @@ class WritableSerializerHelperMixin(object):
                 if field_data:
                     validated_data.update(field_data)
 
-    def _prepare_related_single_or_m2m_relations(self, validated_data):
+    def _get_writable_related_fields(self):
         """
-        Handle writing to nested related model fields for both single and
-        many-to-many relationships.
-
-        For single relationships, any existing or new instance resulting from
-        the provided data is set back into the provided `validated_data` to
-        be applied by DjangoRestFramework's default handling.
-
-        For M2M relationships, any existing or new instances resulting from
-        the provided data are returned in a dictionary mapping M2M field names
-        to a list of instances to be related. The actual relationship is then
-        applied by `_write_related_m2m_relations` because DjangoRestFramework
-        does not support assigning M2M fields.
+        Return a list of ``(fieldname, ModelClass, is_list_field)`` tuples for
+        the nested model serializer fields that may be written to.
         """
-        many_to_many_relationships = {}
+        related_fields = []
         for fieldname, field in self.get_fields().items():
             if (
                 # `ModelSubSerializer` is handled separately
@@ -162,12 +189,88 @@ class WritableSerializerHelperMixin(object):
                 continue  # Skip field
 
             is_list_field = isinstance(field, serializers.ListSerializer)
-
             if is_list_field:
                 ModelClass = field.child.Meta.model
-                field_data_list = validated_data.pop(fieldname, [])
             else:
                 ModelClass = field.Meta.model
+            related_fields.append((fieldname, ModelClass, is_list_field))
+        return related_fields
+
+    def _get_related_field_settings(self, ModelClass, fieldname):
+        """
+        Return the `WritableRelatedFieldSettings` for a related field, failing
+        if the field does not have valid settings.
+        """
+        writable_related_fields = getattr(
+            self.Meta, 'writable_related_fields', {})
+
+        # Get settings for writable related field
+        if fieldname not in writable_related_fields:
+            raise TypeError(
+                "Cannot write related model field '%s' for %s on %s"
+                " without corresponding 'writable_related_fields' settings"
+                " in the Meta class"
+                % (fieldname, ModelClass.__name__,
+                   self.Meta.model.__name__)
+            )
+        field_settings = writable_related_fields[fieldname]
+        if not isinstance(field_settings, WritableRelatedFieldSettings):
+            raise TypeError(
+                "Settings for related model field '%s' in"
+                " '%s.Meta.writable_related_fields' must be of type"
+                " 'WritableRelatedFieldSettings': %s"
+                % (fieldname, ModelClass.__name__, type(field_settings))
+            )
+        return field_settings
+
+    def _get_lookup_fields(self, field_settings):
+        # Settings for lookup field may be a string or a strings list
+        lookup_fields = field_settings.lookup_field
+        if not isinstance(lookup_fields, (list, tuple)):
+            lookup_fields = [lookup_fields]
+        return lookup_fields
+
+    def _get_existing_related_instance(
+            self, ModelClass, lookup_field, lookup_value):
+        """
+        Return the instance of ``ModelClass`` matching the lookup value,
+        from the instances resolved in bulk by `resolve_related_instances`
+        if available.
+        """
+        resolved = self.context.get('related_instances')
+        key = (ModelClass, lookup_field, lookup_value)
+        if resolved is None or key not in resolved:
+            return ModelClass.objects.get(**{lookup_field: lookup_value})
+        instances = resolved[key]
+        if not instances:
+            raise ModelClass.DoesNotExist
+        if len(instances) > 1:
+            raise ModelClass.MultipleObjectsReturned(
+                "get() returned more than one %s -- it returned %s!"
+                % (ModelClass.__name__, len(instances)))
+        return instances[0]
+
+    def _prepare_related_single_or_m2m_relations(self, validated_data):
+        """
+        Handle writing to nested related model fields for both single and
+        many-to-many relationships.
+
+        For single relationships, any existing or new instance resulting from
+        the provided data is set back into the provided `validated_data` to
+        be applied by DjangoRestFramework's default handling.
+
+        For M2M relationships, any existing or new instances resulting from
+        the provided data are returned in a dictionary mapping M2M field names
+        to a list of instances to be related. The actual relationship is then
+        applied by `_write_related_m2m_relations` because DjangoRestFramework
+        does not support assigning M2M fields.
+        """
+        many_to_many_relationships = {}
+        for fieldname, ModelClass, is_list_field in \
+                self._get_writable_related_fields():
+            if is_list_field:
+                field_data_list = validated_data.pop(fieldname, [])
+            else:
                 field_data_list = validated_data.pop(fieldname, None)
                 field_data_list = field_data_list and [field_data_list] or []
 
@@ -227,31 +330,9 @@ class WritableSerializerHelperMixin(object):
               - create a new instance with provided data
               - return the new instance
         """
-        writable_related_fields = getattr(
-            self.Meta, 'writable_related_fields', {})
-
-        # Get settings for writable related field
-        if fieldname not in writable_related_fields:
-            raise TypeError(
-                "Cannot write related model field '%s' for %s on %s"
-                " without corresponding 'writable_related_fields' settings"
-                " in the Meta class"
-                % (fieldname, ModelClass.__name__,
-                   self.Meta.model.__name__)
-            )
-        field_settings = writable_related_fields[fieldname]
-        if not isinstance(field_settings, WritableRelatedFieldSettings):
-            raise TypeError(
-                "Settings for related model field '%s' in"
-                " '%s.Meta.writable_related_fields' must be of type"
-                " 'WritableRelatedFieldSettings': %s"
-                % (fieldname, ModelClass.__name__, type(field_settings))
-            )
-
-        # Get settings for lookup field; may be a string or a strings list
-        lookup_fields = field_settings.lookup_field
-        if not isinstance(lookup_fields, (list, tuple)):
-            lookup_fields = [lookup_fields]
+        field_settings = self._get_related_field_settings(
+            ModelClass, fieldname)
+        lookup_fields = self._get_lookup_fields(field_settings)
 
         # We use the first of potentially multiple lookup field values for
         # which we have been given field data.
@@ -263,7 +344,7 @@ class WritableSerializerHelperMixin(object):
 
         # Fail if we have no lookup value and we cannot create an instance
         if lookup_value is None and not field_settings.can_create:
-            raise TypeError(
+            raise RelatedInstanceError(
                 "Cannot look up related model field '%s' for %s on %s"
                 " using the lookup field(s) %r because no value"
                 " was provided for the lookup field(s) in %s"
@@ -275,8 +356,8 @@ class WritableSerializerHelperMixin(object):
 
         # Fetch existing instance using lookup field
         try:
-            related_instance = ModelClass.objects.get(
-                **{lookup_field: lookup_value})
+            related_instance = self._get_existing_related_instance(
+                ModelClass, lookup_field, lookup_value)
 
             # Update existing related instance with values provided in
             # parent's create/update operation, if such updates are
@@ -287,7 +368,7 @@ class WritableSerializerHelperMixin(object):
                 original_value = getattr(related_instance, name)
                 if value != original_value:
                     if not field_settings.can_update:
-                        raise TypeError(
+                        raise RelatedInstanceError(
                             u"Cannot update instance for related model"
                             u" field '%s' for %s on %s because"
                             u" 'can_update' is not set for this field in"
@@ -303,7 +384,7 @@ class WritableSerializerHelperMixin(object):
             if is_updated:
                 related_instance.save()
         except ModelClass.MultipleObjectsReturned, ex:
-            raise TypeError(
+            raise RelatedInstanceError(
                 "Cannot look up related model field '%s' for %s on %s"
                 " using '%s' as the lookup field because it returns"
                 " multiple results for value '%s': %s"
@@ -313,7 +394,7 @@ class WritableSerializerHelperMixin(object):
         # If a related instance does not yet exist, optionally create one
         except ModelClass.DoesNotExist:
             if not field_settings.can_create:
-                raise TypeError(
+                raise RelatedInstanceError(
                     "Cannot create instance for related model field '%s'"
                     " for %s on %s because 'can_create' is not set for"
                     " this field in 'writable_related_fields'"
@@ -332,6 +413,11 @@ class WritableSerializerHelperMixin(object):
         a list of object instances, apply the instance listing to the `obj`s
         named many-to-many relationship field.
         """
+        pending = self.context.get('pending_m2m_relations')
+        if pending is not None:
+            # Written in bulk by `write_m2m_relations`
+            pending.append((obj, many_to_many_relationships))
+            return
         for fieldname, related_objs in many_to_many_relationships.items():
             # TODO On PATCH avoid clearing existing relationships not provided?
             setattr(obj, fieldname, related_objs)
@@ -355,6 +441,101 @@ class WritableSerializerHelperMixin(object):
         return obj
 
 
+def resolve_related_instances(serializers_list, related_instances):
+    """
+    Look up the related instances referred to by the validated data of
+    ``serializers_list``, a list of `WritableSerializerHelperMixin`
+    serializers, with one query per related model and lookup field, and add
+    them to ``related_instances`` by ``(ModelClass, lookup_field, value)``.
+
+    Nothing is written: missing instances are left out, to be looked up again
+    and maybe created as each serializer is saved. Pass ``related_instances``
+    to the serializers as the context item of the same name to use these
+    instances when saving.
+    """
+    # Lookup values, by model and lookup field
+    lookups = OrderedDict()
+    for serializer in serializers_list:
+        data = dict(serializer.validated_data)
+        serializer._populate_validated_data_with_sub_field_data(data)
+        for fieldname, ModelClass, is_list_field in \
+                serializer._get_writable_related_fields():
+            field_data_list = data.get(fieldname)
+            if not field_data_list:
+                continue
+            if not is_list_field:
+                field_data_list = [field_data_list]
+            try:
+                field_settings = serializer._get_related_field_settings(
+                    ModelClass, fieldname)
+            except TypeError:
+                continue  # Reported when the serializer is saved
+            lookup_fields = serializer._get_lookup_fields(field_settings)
+            for field_data in field_data_list:
+                # Use the same lookup field as when the item is saved
+                for lookup_field in lookup_fields:
+                    if lookup_field in field_data:
+                        value = field_data[lookup_field]
+                        if value is not None:
+                            lookups.setdefault(
+                                (ModelClass, lookup_field), set()).add(value)
+                        break
+
+    for (ModelClass, lookup_field), values in lookups.items():
+        found = OrderedDict()
+        for obj in ModelClass.objects.filter(
+                **{'%s__in' % lookup_field: list(values)}):
+            found.setdefault(
+                obj.serializable_value(lookup_field), []).append(obj)
+        for value, instances in found.items():
+            related_instances[(ModelClass, lookup_field, value)] = instances
+
+
+def write_m2m_relations(pending_m2m_relations):
+    """
+    Write the many-to-many relationships collected by serializers given a
+    ``pending_m2m_relations`` context item, as ``(obj, relationships)`` pairs,
+    with one delete and one `bulk_create` query per field.
+
+    Fields with custom through models, or relating publishable models, are
+    written one object at a time so their signals are sent.
+    """
+    links = OrderedDict()
+    for obj, many_to_many_relationships in pending_m2m_relations:
+        for fieldname, related_objs in many_to_many_relationships.items():
+            links.setdefault((type(obj), fieldname), []).append(
+                (obj, related_objs))
+
+    for (model, fieldname), obj_links in links.items():
+        try:
+            field = model._meta.get_field(fieldname)
+        except FieldDoesNotExist:
+            field = None
+        if field is None or not field.many_to_many or not field.concrete or \
+                not field.rel.through._meta.auto_created or \
+                hasattr(field.related_model, 'publishing_linked'):
+            for obj, related_objs in obj_links:
+                setattr(obj, fieldname, related_objs)
+            continue
+
+        through = field.rel.through
+        source_name = field.m2m_field_name()
+        target_name = field.m2m_reverse_field_name()
+        through.objects.filter(**{
+            '%s__in' % source_name: [obj.pk for obj, __ in obj_links]
+        }).delete()
+        rows = []
+        for obj, related_objs in obj_links:
+            related_pks = set()
+            for related_obj in related_objs:
+                if related_obj.pk in related_pks:
+                    continue
+                related_pks.add(related_obj.pk)
+                rows.append(through(
+                    **{source_name: obj, target_name: related_obj}))
+        through.objects.bulk_create(rows)
+
+
 class PolymorphicHyperlinkedRelatedField(HyperlinkedIdentityField):
     """
     Custom `HyperlinkedIdentityField` that allows the lookup view name for a
@@ -1,12 +1,18 @@
 import json
+import os
+import time
+from collections import OrderedDict
 from pytz import timezone
 
+import django
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import utc, is_aware
 
 from rest_framework.test import APITestCase
@@ -15,12 +21,24 @@ from django_dynamic_fixture import G
 
 from rest_framework.authtoken.models import Token
 
+from icekit.utils.cache import invalidate_namespace
+
+from .models import API_CACHE_NAMESPACE
+
 
 User = get_user_model()
 Image = apps.get_model('icekit_plugins_image.Image')
 
 TZ = timezone(settings.TIME_ZONE)
 
+# Path of the JSON file to write API performance measurements to, if any
+PERFORMANCE_REPORT_PATH = os.environ.get('ICEKIT_API_PERFORMANCE_REPORT')
+# Multiplier for the number of items seeded for API performance tests
+PERFORMANCE_SCALE = int(os.environ.get('ICEKIT_API_PERFORMANCE_SCALE', 1))
+
+# Measurements by API, endpoint and page size, see `write_performance_report`
+_performance_results = OrderedDict()
+
 
 class _BaseAPITestCase(APITestCase):
     API_NAME = None  # Set to reverse-able name for API URLs
@@ -353,3 +371,137 @@ class _BaseAPITestCase(APITestCase):
         )
         self.assert_user_has_patch_permission(True, item_id)
         self.assert_user_has_delete_permission(True, item_id)
+
+
+def write_performance_report(path=PERFORMANCE_REPORT_PATH):
+    """
+    Merge the measurements recorded by API performance tests into the JSON
+    report at ``path``, keyed so reports from different releases can be
+    compared entry by entry.
+    """
+    if not path or not _performance_results:
+        return
+    try:
+        with open(path) as f:
+            report = json.load(f)
+    except (IOError, ValueError):
+        report = {}
+    report['meta'] = OrderedDict([
+        ('django', django.get_version()),
+        ('database', connection.vendor),
+        ('scale', PERFORMANCE_SCALE),
+    ])
+    report.setdefault('results', {}).update(_performance_results)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+class _BaseAPIPerformanceTestCase(_BaseAPITestCase):
+    """
+    Measure the number of queries, time taken and size of responses for an
+    API's listing and detail endpoints, with items seeded by `seed`, and fail
+    if listings run extra queries per item or measurements exceed budgets.
+
+    Measurements are written to the JSON report named by the
+    ``ICEKIT_API_PERFORMANCE_REPORT`` environment variable. Set the
+    ``ICEKIT_API_PERFORMANCE_SCALE`` environment variable to seed more items.
+    API responses are measured without cached representations.
+    """
+    # Number of items to seed for listings, multiplied by the scale. Listings
+    # are measured across more items than fit on a page, like a collection.
+    SEED_COUNT = 200
+    # Page sizes to measure listings with, if the API accepts a page size
+    PAGE_SIZES = (5, 20)
+    # Extra queries allowed for each extra item in a listing
+    MAX_QUERIES_PER_ITEM = 0
+    # Budgets per request; `None` to only record measurements
+    QUERY_BUDGET = None
+    SECONDS_BUDGET = None
+    BYTES_PER_ITEM_BUDGET = None
+
+    # Authentication is tested by each API's own test case
+    test_supports_session_authentication = None
+    test_supports_token_authentication = None
+
+    @classmethod
+    def tearDownClass(cls):
+        super(_BaseAPIPerformanceTestCase, cls).tearDownClass()
+        write_performance_report()
+
+    def seed(self, count):
+        """
+        Create ``count`` items with typical related data to be listed by the
+        API, and return them.
+        """
+        raise NotImplementedError(
+            "%s must implement `seed`" % type(self).__name__)
+
+    def measure(self, url, data=None):
+        """
+        Return the number of queries, seconds taken, size in bytes and number
+        of items of the response to a ``GET`` request.
+        """
+        invalidate_namespace(API_CACHE_NAMESPACE)
+        with CaptureQueriesContext(connection) as queries:
+            start = time.time()
+            response = self.client.get(url, data or {})
+            seconds = time.time() - start
+        self.assertEqual(200, response.status_code)
+        items = 1
+        if 'results' in response.data:
+            items = len(response.data['results'])
+        return OrderedDict([
+            ('queries', len(queries)),
+            ('seconds', round(seconds, 4)),
+            ('bytes', len(response.content)),
+            ('items', items),
+        ])
+
+    def record(self, endpoint, measurement, page_size=None):
+        key = '%s %s' % (self.API_NAME, endpoint)
+        if page_size:
+            key += ' page_size=%s' % page_size
+        _performance_results[key] = measurement
+
+    def assert_within_budget(self, endpoint, measurement):
+        checks = (
+            ('queries', measurement['queries'], self.QUERY_BUDGET),
+            ('seconds', measurement['seconds'], self.SECONDS_BUDGET),
+            ('bytes per item',
+             measurement['bytes'] // max(measurement['items'], 1),
+             self.BYTES_PER_ITEM_BUDGET),
+        )
+        for name, value, budget in checks:
+            if budget is not None and value > budget:
+                self.fail("%s %s: %s %s exceeds the budget of %s" % (
+                    self.API_NAME, endpoint, value, name, budget))
+
+    def test_listing_queries_per_item(self):
+        if self.MAX_QUERIES_PER_ITEM is None:
+            self.skipTest('Queries per item are not limited')
+        page_size = max(self.PAGE_SIZES)
+        self.seed(2)
+        first = self.measure(self.listing_url(), {'page_size': page_size})
+        self.seed(2)
+        second = self.measure(self.listing_url(), {'page_size': page_size})
+        extra_items = second['items'] - first['items']
+        self.assertTrue(extra_items > 0)
+        extra_queries = second['queries'] - first['queries']
+        if extra_queries > self.MAX_QUERIES_PER_ITEM * extra_items:
+            self.fail(
+                "%s listing ran %d more queries for %d more items"
+                % (self.API_NAME, extra_queries, extra_items))
+
+    def test_listing_performance(self):
+        self.seed(self.SEED_COUNT * PERFORMANCE_SCALE)
+        for page_size in self.PAGE_SIZES:
+            measurement = self.measure(
+                self.listing_url(), {'page_size': page_size})
+            self.record('list', measurement, page_size)
+            self.assert_within_budget('list', measurement)
+
+    def test_detail_performance(self):
+        item = self.seed(1)[0]
+        measurement = self.measure(self.detail_url(item.pk))
+        self.record('detail', measurement)
+        self.assert_within_budget('detail', measurement)
@@ -1,29 +1,555 @@
-from django.core.exceptions import FieldError
+import calendar
+from collections import OrderedDict
+from datetime import timedelta
+from hashlib import md5
 
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, \
+    ValidationError as DjangoValidationError
+from django.db import DatabaseError, transaction
+from django.db.models import Q
 from django.http import Http404, HttpResponseRedirect
-from rest_framework import viewsets
-from rest_framework.generics import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.encoding import force_bytes, force_text
+from django.utils.http import http_date, parse_etags, \
+    parse_http_date_safe, quote_etag
+from django.utils.translation import get_language
+from rest_framework import permissions, serializers, status, viewsets
+from rest_framework.decorators import list_route
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
+from rest_framework.utils.urls import replace_query_param
+
+from icekit import appsettings
+from icekit.content_collections.listings import Listing
+from icekit.utils.cache import MODIFIED_FIELD_NAMES, get_modified_timestamp, \
+    get_namespace_version, get_object_cache_parts, get_timeout, make_key
+
+from .base_serializers import RelatedInstanceError, \
+    resolve_related_instances, write_m2m_relations
+from .models import ALIAS_CACHE_NAMESPACE, API_CACHE_NAMESPACE, Tombstone, \
+    get_alias_filter, get_api_cache_namespace, get_field_alias_filter, \
+    get_model_content_types, has_slug_aliases
+from .prefetch import get_prefetch_plan, prefetch_for_serializer
 
 
 class ModelViewSet(viewsets.ModelViewSet):
     """
     ICEkit default API model viewset, ready for any customisation required.
+
+    For read requests, related objects rendered by the serializer are loaded
+    with `select_related` and `prefetch_related` lookups planned from the
+    serializer's fields, and only the columns the serializer reads are loaded
+    where possible. Set ``auto_prefetch = False`` to disable this. Viewsets
+    overriding `get_queryset` should pass their queryset through
+    `prefetch_queryset`.
     """
     lookup_field = 'pk'
+    auto_prefetch = True
+
+    def prefetch_queryset(self, queryset):
+        request = getattr(self, 'request', None)
+        if self.auto_prefetch and request is not None and \
+                request.method in permissions.SAFE_METHODS:
+            queryset = prefetch_for_serializer(
+                queryset, self.get_serializer())
+        return queryset
+
+    def get_queryset(self):
+        return self.prefetch_queryset(
+            super(ModelViewSet, self).get_queryset())
+
+
+class ChangeFeedMixin(object):
+    """
+    Viewset mixin adding a ``changes/`` listing of the items modified within a
+    time window, and the IDs of items deleted within it, so clients can keep a
+    copy of the data in sync without downloading everything.
+
+    The window starts at the ``since`` query parameter (an ISO 8601 time) and
+    ends shortly before the time of the first request, which is returned as
+    ``until``. The lag, set by the ``ICEKIT['API_CHANGE_FEED_LAG']`` setting,
+    leaves time for transactions to commit changes saved before ``until``. A
+    client follows the ``next`` links to the end of the listing, then uses
+    ``until`` as ``since`` for its next sync. Items modified during a sync are
+    picked up by the next one.
+
+    Items and deletions are paginated by cursors on the modified and deleted
+    times, so each page is fetched with a ``WHERE`` clause rather than an
+    ``OFFSET``. Deletions are recorded as `Tombstone`s, see `icekit.api.apps`,
+    which are kept for ``ICEKIT['API_TOMBSTONE_RETENTION_DAYS']``.
+    """
+    # Name of the field recording when items were last modified. Defaults to
+    # the first of `icekit.utils.cache.MODIFIED_FIELD_NAMES` on the model.
+    change_feed_field = None
+    change_feed_lag = appsettings.API_CHANGE_FEED_LAG
+    since_query_param = 'since'
+    until_query_param = 'until'
+    cursor_query_param = 'cursor'
+    deleted_cursor_query_param = 'deleted_cursor'
+    # Cursor for listings that have been paginated to the end
+    end_cursor = 'end'
+
+    def get_change_feed_field(self):
+        if self.change_feed_field:
+            return self.change_feed_field
+        opts = self.queryset.model._meta
+        for name in MODIFIED_FIELD_NAMES:
+            try:
+                opts.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            return name
+        raise ImproperlyConfigured(
+            "%s must set `change_feed_field`" % type(self).__name__)
+
+    def get_time_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            time = parse_datetime(value)
+        except ValueError:
+            time = None
+        if time is None:
+            raise ParseError(
+                "'%s' must be a time in ISO 8601 format" % name)
+        if timezone.is_naive(time):
+            time = timezone.make_aware(time, timezone.utc)
+        return time
+
+    def get_since(self):
+        since = self.get_time_param(self.since_query_param)
+        days = appsettings.API_TOMBSTONE_RETENTION_DAYS
+        if since is not None and days is not None and \
+                since < timezone.now() - timedelta(days=days):
+            raise ParseError(
+                "'%s' must be within the last %d days, leave it out to list "
+                "all items" % (self.since_query_param, days))
+        return since
+
+    def get_until(self):
+        return self.get_time_param(self.until_query_param) or \
+            timezone.now() - timedelta(seconds=self.change_feed_lag)
+
+    def get_deleted_queryset(self, since, until):
+        return Tombstone.objects.filter(
+            content_type__in=get_model_content_types(self.queryset.model),
+            deleted_at__gte=since,
+            deleted_at__lt=until,
+        )
+
+    def paginate_changes(self, queryset, ordering, page_size, cursor_param):
+        """
+        Return a `ListingResult` for the page of ``queryset`` after the cursor
+        in ``cursor_param``, or `None` if it has been paginated to the end.
+        """
+        cursor = self.request.query_params.get(cursor_param)
+        if cursor == self.end_cursor:
+            return None
+        return Listing(queryset, ordering=ordering, page_size=page_size) \
+            .paginate(cursor)
+
+    def get_next_cursor(self, result):
+        if result is None or not result.has_next:
+            return self.end_cursor
+        return result.next_cursor
+
+    @list_route(methods=['get'])
+    def changes(self, request, *args, **kwargs):
+        field_name = self.get_change_feed_field()
+        since = self.get_since()
+        until = self.get_until()
+
+        queryset = self.filter_queryset(self.get_queryset()) \
+            .filter(**{'%s__lt' % field_name: until})
+        if since is not None:
+            queryset = queryset.filter(**{'%s__gte' % field_name: since})
+        page_size = None
+        if self.paginator is not None:
+            page_size = self.paginator.get_page_size(request)
+        result = self.paginate_changes(
+            queryset, (field_name, 'pk'), page_size, self.cursor_query_param)
+        deleted_result = None
+        if since is not None:
+            # Clients have no data to remove on their first sync
+            deleted_result = self.paginate_changes(
+                self.get_deleted_queryset(since, until),
+                ('deleted_at', 'pk'),
+                page_size,
+                self.deleted_cursor_query_param,
+            )
+
+        until_value = serializers.DateTimeField().to_representation(until)
+        data = OrderedDict()
+        data['until'] = until_value
+        data['next'] = None
+        if any(r is not None and r.has_next
+               for r in (result, deleted_result)):
+            url = replace_query_param(
+                request.build_absolute_uri(),
+                self.until_query_param, until_value)
+            url = replace_query_param(
+                url, self.cursor_query_param, self.get_next_cursor(result))
+            data['next'] = replace_query_param(
+                url, self.deleted_cursor_query_param,
+                self.get_next_cursor(deleted_result))
+        data['deleted'] = [
+            tombstone.object_id for tombstone in deleted_result or ()]
+        data['results'] = self.get_serializer(
+            result.items if result is not None else [], many=True).data
+        return Response(data)
+
+
+class HTTPCacheMixin(object):
+    """
+    Viewset mixin adding HTTP caching to the ``list`` and ``retrieve``
+    actions.
+
+    Responses carry an ``ETag`` derived from the items rendered and a
+    ``Last-Modified`` time from the latest of their modified times, see
+    `icekit.utils.cache.MODIFIED_FIELD_NAMES`. Conditional requests for
+    unchanged items are answered with ``304 Not Modified`` without serialising
+    anything. Otherwise each item's representation is cached per item state
+    and selection of fields, so only changed items are serialised again.
+
+    Cached data is kept in a namespace per model, and is invalidated when
+    objects of the models rendered by the serializer, as planned by
+    `icekit.api.prefetch`, are saved or deleted, see `icekit.api.apps`.
+    Viewsets must be registered with the ICEkit API router, or a router in the
+    ``EXTRA_API_ROUTERS`` setting, for these changes to be tracked.
+    """
+    # Seconds to cache representations for, defaults to the setting
+    cache_timeout = None
+
+    def get_representation_key_parts(self, serializer):
+        """
+        Return the parts of cache keys that, with an item's state, determine
+        its representation.
+        """
+        request = self.request
+        return (
+            type(self).__module__,
+            type(self).__name__,
+            request.scheme,
+            request.get_host(),
+            get_language(),
+            ','.join(serializer.fields.keys()),
+        )
+
+    def get_cache_version(self, serializer):
+        """
+        Return the combined version of the cache namespaces of the models
+        rendered by ``serializer``, and of the namespace of all API data.
+        """
+        models = set([self.get_queryset().model])
+        if hasattr(getattr(serializer, 'Meta', None), 'model'):
+            models.update(get_prefetch_plan(serializer).get_models())
+        namespaces = [API_CACHE_NAMESPACE] + sorted(set(
+            get_api_cache_namespace(model) for model in models))
+        return '.'.join([
+            '%s' % get_namespace_version(namespace)
+            for namespace in namespaces
+        ])
+
+    def get_cache_validators(self, objects):
+        """
+        Return the ``(etag, last_modified)`` pair for a response rendering
+        ``objects``. ``last_modified`` is `None` unless all objects have a
+        modified time.
+        """
+        timestamps = [get_modified_timestamp(obj) for obj in objects]
+        last_modified = None
+        if timestamps and None not in timestamps:
+            last_modified = max(timestamps)
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        parts = [
+            self.get_cache_version(self.get_serializer()),
+            self.request.get_full_path(),
+            renderer.media_type if renderer else '',
+            get_language(),
+        ]
+        parts.extend(
+            '%s:%s' % (obj.pk, timestamp)
+            for obj, timestamp in zip(objects, timestamps))
+        etag = md5(force_bytes(
+            u'\n'.join([u'%s' % (p,) for p in parts]))).hexdigest()
+        return quote_etag(etag), last_modified
+
+    def is_not_modified(self, etag, last_modified=None):
+        """
+        Return whether the client's copy, as described by the conditional
+        request headers, matches the given validators.
+        """
+        meta = self.request.META
+        if_none_match = meta.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or etag.strip('"') in etags
+        if_modified_since = parse_http_date_safe(
+            meta.get('HTTP_IF_MODIFIED_SINCE', ''))
+        if if_modified_since is None or last_modified is None:
+            return False
+        return if_modified_since >= \
+            calendar.timegm(last_modified.utctimetuple())
+
+    def not_modified_response(self, etag, last_modified=None):
+        return self.set_cache_headers(
+            Response(status=status.HTTP_304_NOT_MODIFIED),
+            etag, last_modified)
+
+    def set_cache_headers(self, response, etag, last_modified=None):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(
+                calendar.timegm(last_modified.utctimetuple()))
+        return response
+
+    def get_representations(self, objects):
+        """
+        Return the serialised data for ``objects``, from the cache where
+        possible.
+        """
+        if not objects:
+            return []
+        serializer = self.get_serializer()
+        parts = self.get_representation_key_parts(serializer)
+        version = self.get_cache_version(serializer)
+        keys = [
+            make_key(
+                API_CACHE_NAMESPACE,
+                *(parts + get_object_cache_parts(obj)),
+                version=version)
+            for obj in objects
+        ]
+        cached = cache.get_many(keys)
+        missing = [
+            (key, obj) for key, obj in zip(keys, objects)
+            if key not in cached
+        ]
+        if missing:
+            data = self.get_serializer(
+                [obj for __, obj in missing], many=True).data
+            new = dict(zip([key for key, __ in missing], data))
+            cache.set_many(new, get_timeout(
+                self.cache_timeout or appsettings.API_CACHE_TIMEOUT))
+            cached.update(new)
+        return [cached[key] for key in keys]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        objects = list(queryset) if page is None else list(page)
+
+        etag, last_modified = self.get_cache_validators(objects)
+        # Deleted items leave the latest modified time of a listing alone, so
+        # listings are only matched by ETag.
+        if self.is_not_modified(etag):
+            return self.not_modified_response(etag, last_modified)
+
+        data = self.get_representations(objects)
+        if page is None:
+            response = Response(data)
+        else:
+            response = self.get_paginated_response(data)
+        return self.set_cache_headers(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.get_cache_validators([instance])
+        if self.is_not_modified(etag, last_modified):
+            return self.not_modified_response(etag, last_modified)
+        data = self.get_representations([instance])[0]
+        return self.set_cache_headers(Response(data), etag, last_modified)
+
+
+class BulkWriteMixin(object):
+    """
+    Viewset mixin adding a ``bulk/`` endpoint that creates or updates a list
+    of items in one ``POST`` request. Items with an ``id`` update the existing
+    item with the fields given, others are created.
+
+    Items are written in chunks of ``bulk_chunk_size``, each in one
+    transaction, and each item in a savepoint with the related instances it
+    creates and its many-to-many relationships. For serializers using
+    `WritableSerializerHelperMixin`, existing related instances are looked up
+    with one query per related model for a chunk.
+
+    The response lists the outcome of each item by ``index``, with its
+    ``status`` and either the ``id`` written or the ``errors`` preventing it
+    from being written. Errors for one item do not prevent other items from
+    being written.
+    """
+    bulk_chunk_size = 100
+
+    def check_bulk_update_permissions(self, request):
+        """
+        Check the user may update items, as well as create them.
+        """
+        model = self.get_queryset().model
+        for permission in self.get_permissions():
+            if hasattr(permission, 'get_required_permissions') and \
+                    not request.user.has_perms(
+                        permission.get_required_permissions('PATCH', model)):
+                self.permission_denied(request)
+
+    def get_bulk_instances(self, items):
+        """
+        Return a dict of the existing items to update by the ``id`` given.
+        """
+        ids = [
+            item['id'] for item in items
+            if isinstance(item, dict) and
+            force_text(item.get('id', '')).isdigit()
+        ]
+        if not ids:
+            return {}
+        return dict(
+            (force_text(obj.pk), obj)
+            for obj in self.get_queryset().filter(pk__in=ids))
+
+    def write_bulk_chunk(self, items, offset=0):
+        """
+        Write a chunk of items, and return a list of their outcomes.
+        """
+        context = self.get_serializer_context()
+        context['related_instances'] = {}
+        context['pending_m2m_relations'] = []
+        serializer_class = self.get_serializer_class()
+        instances = self.get_bulk_instances(items)
+
+        results = []
+        serializers_to_save = []
+        for index, item in enumerate(items, offset):
+            result = OrderedDict([('index', index)])
+            results.append(result)
+            if not isinstance(item, dict):
+                result['status'] = status.HTTP_400_BAD_REQUEST
+                result['errors'] = {'non_field_errors': ['Expected an object']}
+                continue
+            instance = None
+            if item.get('id') is not None:
+                instance = instances.get(force_text(item['id']))
+                if instance is None:
+                    result['status'] = status.HTTP_404_NOT_FOUND
+                    result['errors'] = {'id': ['Not found']}
+                    continue
+            serializer = serializer_class(
+                instance, data=item, partial=instance is not None,
+                context=context)
+            if not serializer.is_valid():
+                result['status'] = status.HTTP_400_BAD_REQUEST
+                result['errors'] = serializer.errors
+                continue
+            serializers_to_save.append((result, serializer))
+
+        with transaction.atomic():
+            resolve_related_instances(
+                [serializer for __, serializer in serializers_to_save
+                 if hasattr(serializer, '_get_writable_related_fields')],
+                context['related_instances'])
+            for result, serializer in serializers_to_save:
+                is_update = serializer.instance is not None
+                context['pending_m2m_relations'] = []
+                try:
+                    # Related rows and links are written in the item's
+                    # savepoint, so they are rolled back with it
+                    with transaction.atomic():
+                        obj = serializer.save()
+                        write_m2m_relations(context['pending_m2m_relations'])
+                except serializers.ValidationError as ex:
+                    errors = ex.detail
+                except DjangoValidationError as ex:
+                    errors = {'non_field_errors': ex.messages}
+                except (RelatedInstanceError, DatabaseError) as ex:
+                    errors = {'non_field_errors': [force_text(ex)]}
+                else:
+                    result['status'] = status.HTTP_200_OK if is_update \
+                        else status.HTTP_201_CREATED
+                    result['id'] = obj.pk
+                    continue
+                # Related instances may have been changed by the rolled back
+                # save, so look them up again for the remaining items
+                context['related_instances'].clear()
+                result['status'] = status.HTTP_400_BAD_REQUEST
+                result['errors'] = errors
+        return results
+
+    @list_route(methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list):
+            raise ParseError('Expected a list of items')
+        if any(isinstance(item, dict) and item.get('id') is not None
+               for item in items):
+            self.check_bulk_update_permissions(request)
+        results = []
+        for start in range(0, len(items), self.bulk_chunk_size):
+            results.extend(self.write_bulk_chunk(
+                items[start:start + self.bulk_chunk_size], start))
+        return Response({'results': results})
 
 
 class RedirectViewset(viewsets.ReadOnlyModelViewSet):
+    """
+    Read only viewset that redirects requests for identifiers an object is or
+    was known by, like old or alternative slugs, legacy accession numbers,
+    external IDs and primary keys, to the object's canonical URL.
+
+    Identifiers are looked up in one query on the `SlugAlias` index, and
+    identifiers that match nothing are cached as misses. Until the index has
+    entries for the model, for example before ``rebuild_slug_aliases`` is
+    run, identifiers are also looked up in the model's identifier fields.
+    """
     lookup_field = 'slug'
     lookup_value_regex = ".+"
     # TODO: this will catch .format at the end, and '/'.
 
+    def get_alias_values(self, slug):
+        values = [slug]
+        try:
+            from glamkit_collections.utils import alt_slugify
+        except ImportError:
+            pass
+        else:
+            alt_slug = alt_slugify(slug)
+            if alt_slug and alt_slug != slug:
+                values.append(alt_slug)
+        return values
+
+    def get_alias_object(self, slug):
+        """
+        Return the object known by the identifier ``slug``, or `None`.
+        """
+        miss_key = make_key(
+            ALIAS_CACHE_NAMESPACE,
+            type(self).__module__,
+            type(self).__name__,
+            slug,
+        )
+        if cache.get(miss_key):
+            return None
+        queryset = self.get_queryset()
+        values = self.get_alias_values(slug)
+        alias_filter = get_alias_filter(queryset.model, values)
+        if slug.isdigit():
+            alias_filter |= Q(pk=int(slug))
+        instance = queryset.filter(alias_filter).first()
+        if instance is None and not has_slug_aliases(queryset.model):
+            field_filter = get_field_alias_filter(queryset.model, values)
+            if field_filter is not None:
+                instance = queryset.filter(field_filter).first()
+        if instance is None:
+            cache.set(miss_key, True, get_timeout())
+        return instance
+
     def retrieve(self, request, *args, **kwargs):
         """
-        If the URL slug doesn't match an object, try slugifying the URL param
-        and searching alt_url for that.
-        If found, redirect to the canonical URL.
+        If the URL slug doesn't match an object, look it up as an alias of
+        one. If found, redirect to the canonical URL.
         If still not found, raise 404.
         """
 
@@ -35,37 +561,9 @@ class RedirectViewset(viewsets.ReadOnlyModelViewSet):
             pass
 
         lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
-        slug = self.kwargs[lookup_url_kwarg]
-
-        # fall back to accession_temp_fallback
-        try:
-            tmp = get_object_or_404(
-                self.queryset, accession_temp_fallback=slug)
-            return HttpResponseRedirect(
-                reverse(self.redirect_view_name, (tmp.slug, ))
-            )
-        except (Http404, FieldError):
-            pass
-
-        # fall back to embark ID
-        try:
-            embark = get_object_or_404(self.queryset, id=int(slug))
-            return HttpResponseRedirect(
-                reverse(self.redirect_view_name, (embark.slug, ))
-            )
-        except (Http404, ValueError):
-            pass
-
-        # fall back to alt slug
-        try:
-            from glamkit_collections.utils import alt_slugify
-            alt_slug = alt_slugify(slug)
-            alt = get_object_or_404(self.queryset, alt_slug=alt_slug)
-            return HttpResponseRedirect(
-                reverse(self.redirect_view_name, (alt.slug, ))
-            )
-        except Http404:
-            pass
-
-        # well, we tried
-        raise Http404
+        instance = self.get_alias_object(self.kwargs[lookup_url_kwarg])
+        if instance is None:
+            raise Http404
+        return HttpResponseRedirect(
+            reverse(self.redirect_view_name, (instance.slug, ))
+        )
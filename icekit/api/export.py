@@ -0,0 +1,288 @@
+"""
+Helpers to export the data behind API viewsets and models in bulk, as used by
+the ``dump_collection_api`` and ``dump_collection_csv`` management commands.
+
+Objects are loaded in chunks of primary keys, with the prefetches planned for
+the viewset's serializer or the exported columns, and chunks can be processed
+by a pool of worker processes while results are written in order by the
+parent process.
+"""
+import csv
+import gzip
+from functools import partial
+from multiprocessing import Pool
+
+from django.db import connections
+from django.db.models import Manager, Model
+from django.test import RequestFactory
+from django.utils import six
+from django.utils.encoding import force_text
+from django.utils.module_loading import import_string
+from django.utils.six.moves.urllib.parse import urlparse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .prefetch import get_prefetch_plan_for_paths, prefetch_for_serializer
+
+DEFAULT_BASE_URL = 'http://localhost/'
+DEFAULT_CHUNK_SIZE = 500
+
+# Viewsets set up in this process, by dotted path and base URL
+_viewsets = {}
+
+
+def get_default_csv_exports():
+    """
+    Return a list of ``(name, dotted path)`` pairs for the CSV exports of
+    GLAMkit Collections works and creators, if installed.
+    """
+    try:
+        from glamkit_collections.contrib.work_creator import exports
+    except ImportError:
+        return []
+    return [
+        ('works', '%s.WorkCSVExport' % exports.__name__),
+        ('creators', '%s.CreatorCSVExport' % exports.__name__),
+    ]
+
+
+def get_default_viewsets():
+    """
+    Return a list of ``(name, dotted path)`` pairs for the viewsets of
+    installed GLAMkit Collections plugins with an API.
+    """
+    try:
+        from glamkit_collections.contrib.work_creator.api \
+            import plugins_router
+    except ImportError:
+        return []
+    return [
+        (prefix, '%s.%s' % (viewset.__module__, viewset.__name__))
+        for prefix, viewset, __ in plugins_router.registry
+    ]
+
+
+def make_request(base_url=DEFAULT_BASE_URL):
+    """
+    Return a GET request for ``base_url``, so hyperlinks are rendered with
+    its scheme and host.
+    """
+    url = urlparse(base_url)
+    return Request(RequestFactory().get(
+        url.path or '/',
+        HTTP_HOST=url.netloc,
+        secure=url.scheme == 'https',
+    ))
+
+
+def get_viewset(viewset_path, base_url=DEFAULT_BASE_URL):
+    """
+    Return an instance of the viewset class at ``viewset_path``, set up as if
+    it is handling a listing request.
+    """
+    key = (viewset_path, base_url)
+    if key not in _viewsets:
+        viewset_class = import_string(viewset_path)
+        _viewsets[key] = viewset_class(
+            request=make_request(base_url),
+            format_kwarg=None,
+            args=(),
+            kwargs={},
+            action='list',
+        )
+    return _viewsets[key]
+
+
+def iter_pk_chunks(queryset, chunk_size=DEFAULT_CHUNK_SIZE, limit=None):
+    """
+    Yield lists of up to ``chunk_size`` primary keys of the objects in
+    ``queryset``, in order.
+    """
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    if limit is not None:
+        pks = pks[:limit]
+    chunk = []
+    for pk in pks.iterator():
+        chunk.append(pk)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def get_chunk_objects(viewset, pks):
+    """
+    Return a list of the objects with the given primary keys from the
+    viewset's queryset, in order, with related objects prefetched.
+    """
+    queryset = viewset.get_queryset()
+    if not getattr(viewset, 'auto_prefetch', False):
+        queryset = prefetch_for_serializer(queryset, viewset.get_serializer())
+    return list(queryset.filter(pk__in=pks).order_by('pk'))
+
+
+def render_json_chunk(viewset_path, base_url, indent, pks):
+    """
+    Return a list of ``(pk, JSON content)`` pairs for the objects with the
+    given primary keys, serialised by the viewset at ``viewset_path``.
+    """
+    viewset = get_viewset(viewset_path, base_url)
+    objects = get_chunk_objects(viewset, pks)
+    data = viewset.get_serializer(objects, many=True).data
+    renderer = JSONRenderer()
+    renderer_context = {'indent': indent}
+    return [
+        (obj.pk, renderer.render(item, renderer_context=renderer_context))
+        for obj, item in zip(objects, data)
+    ]
+
+
+def map_chunks(func, chunks, processes=1):
+    """
+    Yield ``func(chunk)`` for each of ``chunks`` in order, using a pool of
+    worker processes if ``processes`` is more than one. ``func`` must be
+    picklable, like a module-level function or a `partial` of one.
+    """
+    if processes <= 1:
+        for chunk in chunks:
+            yield func(chunk)
+        return
+
+    # Worker processes must open their own database connections rather than
+    # share the parent's.
+    for connection in connections.all():
+        connection.close()
+    pool = Pool(processes)
+    try:
+        for result in pool.imap(func, chunks):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def iter_rendered_json(viewset_path, queryset, base_url=DEFAULT_BASE_URL,
+                       indent=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                       processes=1, limit=None):
+    """
+    Yield ``(pk, JSON content)`` pairs for the objects in ``queryset``, in
+    order, serialised by the viewset at ``viewset_path``.
+    """
+    render = partial(render_json_chunk, viewset_path, base_url, indent)
+    chunks = iter_pk_chunks(queryset, chunk_size, limit=limit)
+    for results in map_chunks(render, chunks, processes):
+        for pk, content in results:
+            yield pk, content
+
+
+class CSVExport(object):
+    """
+    A declarative mapping of a model's objects to CSV rows.
+
+    ``columns`` is a sequence of ``(header, source)`` pairs. A source is a
+    dotted path of attribute names, which may include related managers, or a
+    callable taking an object. Values of paths through related managers are
+    joined with ``separator``. Methods along paths are called without
+    arguments.
+
+    Relations along source paths are loaded with ``select_related`` and
+    ``prefetch_related`` for each chunk of objects. Add any lookups needed by
+    callable sources to ``prefetch_related``.
+    """
+    model = None
+    columns = ()
+    separator = ','
+    prefetch_related = ()
+
+    def get_queryset(self):
+        queryset = self.model._default_manager.all()
+        if hasattr(queryset, 'non_polymorphic'):
+            # Columns are read from the base model, so avoid fetching objects
+            # as their real types.
+            queryset = queryset.non_polymorphic()
+        return queryset
+
+    def get_headers(self):
+        return [header for header, __ in self.columns]
+
+    def get_chunk_queryset(self, queryset, pks):
+        paths = [
+            source for __, source in self.columns
+            if isinstance(source, six.string_types)
+        ]
+        queryset = get_prefetch_plan_for_paths(self.model, paths) \
+            .apply(queryset.filter(pk__in=pks).order_by('pk'))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+    def get_value(self, obj, source):
+        if callable(source):
+            return source(obj)
+        values = [obj]
+        is_many = False
+        for attname in source.split('.'):
+            next_values = []
+            for value in values:
+                if value is None:
+                    continue
+                value = getattr(value, attname)
+                if isinstance(value, Manager):
+                    is_many = True
+                    next_values.extend(value.all())
+                    continue
+                if callable(value) and not isinstance(value, Model):
+                    value = value()
+                next_values.append(value)
+            values = next_values
+        if is_many:
+            return self.separator.join(
+                force_text(v) for v in values if v is not None)
+        return values[0] if values else None
+
+    def get_row(self, obj):
+        return [self.get_value(obj, source) for __, source in self.columns]
+
+
+def _encode_csv_value(value):
+    if value is None:
+        return ''
+    value = force_text(value)
+    if six.PY2:
+        value = value.encode('utf-8')
+    return value
+
+
+def open_csv_file(path, compress=False):
+    """
+    Open a file to write CSV to, compressed with gzip if ``compress``.
+    """
+    if six.PY2:
+        return gzip.open(path, 'wb') if compress else open(path, 'wb')
+    if compress:
+        return gzip.open(path, 'wt', newline='')
+    return open(path, 'w', newline='')
+
+
+def write_csv_export(export_path, destination_file, compress=False,
+                     chunk_size=DEFAULT_CHUNK_SIZE, limit=None):
+    """
+    Write the rows of the `CSVExport` at ``export_path`` to a CSV file, one
+    chunk of objects at a time. Returns the number of rows written.
+    """
+    export = import_string(export_path)()
+    queryset = export.get_queryset()
+    count = 0
+    with open_csv_file(destination_file, compress) as f:
+        writer = csv.writer(f)
+        writer.writerow([_encode_csv_value(h) for h in export.get_headers()])
+        for pks in iter_pk_chunks(queryset, chunk_size, limit=limit):
+            rows = [
+                [_encode_csv_value(v) for v in export.get_row(obj)]
+                for obj in export.get_chunk_queryset(queryset, pks)
+            ]
+            writer.writerows(rows)
+            count += len(rows)
+    return count
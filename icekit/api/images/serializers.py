@@ -4,8 +4,8 @@ from rest_framework import serializers
 from rest_framework.settings import api_settings
 from drf_queryfields import QueryFieldsMixin
 
-from icekit.api.base_serializers import WritableSerializerHelperMixin, \
-    WritableRelatedFieldSettings
+from icekit.api.base_serializers import CompactFieldsMixin, \
+    WritableSerializerHelperMixin, WritableRelatedFieldSettings
 
 
 Image = apps.get_model('icekit_plugins_image.Image')
@@ -35,6 +35,7 @@ class MediaCategorySerializer(serializers.ModelSerializer):
 
 class ImageSerializer(
     WritableSerializerHelperMixin,
+    CompactFieldsMixin,
     QueryFieldsMixin,
     serializers.HyperlinkedModelSerializer
 ):
@@ -77,6 +78,8 @@ class ImageSerializer(
             'categories': WritableRelatedFieldSettings(
                 lookup_field=['id', 'name'], can_create=True),
         }
+        # Long text fields left out of `?compact` responses
+        compact_exclude_fields = ('caption', 'license', 'notes')
 
 
 # TODO It is probably not a good idea to allow API user to set auto-gen ID
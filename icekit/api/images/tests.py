@@ -1,11 +1,15 @@
 from django.apps import apps
 
 from django_dynamic_fixture import G
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
 
 from icekit.utils.testing import get_test_image, setup_with_context_manager
 
 from .. import base_tests
 from ..base_tests import Image
+from ..prefetch import get_prefetch_plan
+from .serializers import ImageSerializer
 
 MediaCategory = apps.get_model('icekit.MediaCategory')
 
@@ -77,6 +81,31 @@ class ImageAPITests(base_tests._BaseAPITestCase):
             },
             response.data)
 
+    def test_list_images_with_get_and_compact_fields(self):
+        response = self.client.get(self.listing_url(), {'compact': 1})
+        self.assertEqual(200, response.status_code)
+        item = response.data['results'][0]
+        self.assertEqual(self.image.title, item['title'])
+        for fieldname in ('caption', 'license', 'notes'):
+            self.assertNotIn(fieldname, item)
+
+        response = self.client.get(
+            self.listing_url(), {'compact': 1, 'fields': 'id,caption'})
+        self.assertEqual(
+            [{'id': self.image.pk, 'caption': self.image.caption}],
+            response.data['results'])
+
+    def test_image_prefetch_plan(self):
+        request = Request(APIRequestFactory().get(
+            self.listing_url(), {'fields': 'id,image,title,categories'}))
+        plan = get_prefetch_plan(
+            ImageSerializer(context={'request': request}))
+        self.assertEqual(
+            ['categories'], [l for l, __ in plan.prefetch_related])
+        self.assertEqual(
+            ['date_modified', 'height', 'id', 'image', 'title', 'width'],
+            plan.only)
+
     def test_get_image_detail_with_get(self):
         response = self.client.get(self.detail_url(self.image.pk))
         self.assertEqual(200, response.status_code)
@@ -1,7 +1,7 @@
 from django.apps import apps
 
-from rest_framework import viewsets
-
+from icekit.api.base_views import BulkWriteMixin, ChangeFeedMixin, \
+    HTTPCacheMixin, ModelViewSet
 from icekit.utils.pagination import ICEKitAPIPagination
 
 from . import serializers
@@ -10,7 +10,8 @@ from . import serializers
 Image = apps.get_model('icekit_plugins_image.Image')
 
 
-class ImageViewSet(viewsets.ModelViewSet):
+class ImageViewSet(BulkWriteMixin, HTTPCacheMixin, ChangeFeedMixin,
+                   ModelViewSet):
     """
     Read and write viewset for image objects.
     """
@@ -23,4 +24,4 @@ class ImageViewSet(viewsets.ModelViewSet):
     queryset = Image.objects.none()
 
     def get_queryset(self):
-        return Image.objects.all()
+        return self.prefetch_queryset(Image.objects.all())
@@ -1,171 +1,392 @@
-import fnmatch
-import shutil
-from django.core.management import CommandError
-from django.core.management.base import BaseCommand
-from optparse import make_option
+import json
 import os
+import shutil
 import sys
+from datetime import timedelta
+from optparse import make_option
 
-from django.test import RequestFactory
+from django.core.management import CommandError
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.module_loading import import_string
 from django.utils.six.moves import input
-from django.utils.text import slugify
-from rest_framework.renderers import JSONRenderer
-import progressbar
-import glob
 
-from sfmoma.api.collection_views import ArtistViewSet, ArtworkViewSet, ExhibitionViewSet
+from icekit import appsettings
+from icekit.api.export import DEFAULT_BASE_URL, DEFAULT_CHUNK_SIZE, \
+    get_default_viewsets, get_viewset, iter_rendered_json
 
-rf = RequestFactory()
+STATE_FILENAME = '.dump_collection_api.json'
+# Index of the combined file, in each viewset's folder, see `write_combined`
+INDEX_FILENAME = '.index'
 
-TEST_URL = "http://testserver/api/"
-PROPER_URL = "https://www.sfmoma.org/api/"
 
 def ensure_exists(path):
     if not os.path.exists(path):
         os.makedirs(path)
 
 
-def dump_viewset(viewset_class, root_folder, folder_fn=lambda i: ".", sample_size=None):
+def get_object_path(root_folder, pk):
     """
-    Dump the contents of a rest-api queryset to a folder structure.
+    Return the path of the JSON file for an object, in a subfolder per
+    thousand primary keys to keep folders small.
+    """
+    return os.path.join(root_folder, str(pk // 1000), '%s.json' % pk)
 
-    :param viewset_class: A rest-api viewset to iterate through
-    :param root_folder: The root folder to write results to.
-    :param folder_fn: A function to generate a subfolder name for the instance.
-    :param sample_size: Number of items to process, for test purposes.
-    :return:
+
+def write_file(path, content):
+    ensure_exists(os.path.dirname(path))
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def get_index_path(root_folder):
+    """
+    Return the path of the index of the combined file written for the object
+    files in ``root_folder``.
     """
-    if os.path.exists(root_folder):
-        shutil.rmtree(root_folder)
-    os.makedirs(root_folder)
+    return os.path.join(root_folder, INDEX_FILENAME)
 
-    vs = viewset_class()
-    vs.request = rf.get('')
 
-    serializer_class = vs.get_serializer_class()
-    serializer = serializer_class(context={'request': vs.request, 'format': 'json', 'view': vs})
+def write_combined(destination_file, documents, output_format='json',
+                   index_file=None):
+    """
+    Write ``(pk, JSON document)`` pairs to one file, as a JSON list or as JSON
+    Lines. The file is replaced once it is complete.
 
-    renderer = PrettyJSONRenderer()
+    The primary key, offset and length of each document in the file are
+    written to ``index_file``, if given, so the documents can be read back by
+    `iter_combined`.
+    """
+    tmp_file = destination_file + '.tmp'
+    index = []
+    with open(tmp_file, 'wb') as f:
+        if output_format == 'json':
+            f.write(b'[\n')
+        for i, (pk, document) in enumerate(documents):
+            if i and output_format == 'json':
+                f.write(b',\n')
+            index.append((pk, f.tell(), len(document)))
+            f.write(document)
+            if output_format == 'jsonl':
+                f.write(b'\n')
+        if output_format == 'json':
+            f.write(b'\n]\n')
+    if index_file is not None:
+        with open(index_file + '.tmp', 'w') as f:
+            for entry in index:
+                f.write('%d %d %d\n' % entry)
+        os.rename(index_file + '.tmp', index_file)
+    os.rename(tmp_file, destination_file)
 
-    bar = progressbar.ProgressBar()
-    for instance in bar(vs.get_queryset()[:sample_size]):
-        dct = serializer.to_representation(instance)
-        content = renderer.render(dct)
-        folder = os.path.join(root_folder, folder_fn(instance))
-        if not os.path.exists(folder):
-            os.makedirs(folder)
-        filename = "%s.json" % instance.slug
 
-        f = file(os.path.join(folder, filename), 'w')
-        f.write(content)
-        f.close()
+def iter_combined(combined_file, index_file):
+    """
+    Yield the ``(pk, JSON document)`` pairs of a combined file written by
+    `write_combined`, in order, using its index.
+    """
+    with open(index_file) as index, open(combined_file, 'rb') as f:
+        for line in index:
+            pk, offset, length = [int(value) for value in line.split()]
+            f.seek(offset)
+            yield pk, f.read(length)
+
 
-def concatenate_json(source_folder, destination_file):
+def merge_documents(documents, changed_pks, root_folder, deleted_pks):
     """
-    Concatenate all the json files in a folder to one big JSON file.
+    Yield the ``(pk, JSON document)`` pairs of a previous dump, in primary key
+    order, replacing those of changed objects with their new object files and
+    leaving out deleted objects.
     """
-    matches = []
-    for root, dirnames, filenames in os.walk(source_folder):
-        for filename in fnmatch.filter(filenames, '*.json'):
-            matches.append(os.path.join(root, filename))
+    changed_pks = sorted(changed_pks)
+
+    def read_object_file(pk):
+        with open(get_object_path(root_folder, pk), 'rb') as f:
+            return f.read()
+
+    i = 0
+    for pk, document in documents:
+        while i < len(changed_pks) and changed_pks[i] <= pk:
+            yield changed_pks[i], read_object_file(changed_pks[i])
+            i += 1
+        if pk in deleted_pks or pk in changed_pks[i - 1:i]:
+            continue
+        yield pk, document
+    for changed_pk in changed_pks[i:]:
+        yield changed_pk, read_object_file(changed_pk)
+
+
+def dump_viewset(viewset_path, root_folder, destination_file,
+                 output_format='json', base_url=DEFAULT_BASE_URL,
+                 chunk_size=DEFAULT_CHUNK_SIZE, processes=1,
+                 sample_size=None, since=None, until=None):
+    """
+    Dump the contents of a rest-api viewset to one JSON file per object in a
+    folder structure, and to a combined file.
+
+    :param viewset_path: The dotted path of a rest-api viewset to dump.
+    :param root_folder: The root folder to write object files to.
+    :param destination_file: The path of the combined file.
+    :param output_format: ``json`` for pretty-printed objects and a JSON list
+    in the combined file, or ``jsonl`` for compact objects and JSON Lines.
+    :param base_url: The base URL for hyperlinks.
+    :param chunk_size: Number of objects to load and serialise at a time.
+    :param processes: Number of worker processes to serialise objects with.
+    :param sample_size: Number of items to process, for test purposes.
+    :param since: Only dump objects changed or deleted since this time, and
+    keep the existing files of other objects. The combined file is updated
+    from the previous one, which must have been written in the same
+    ``output_format``. The viewset must have a change feed, see
+    `icekit.api.base_views.ChangeFeedMixin`.
+    :param until: The time of the dump, which should lag behind the current
+    time like the viewset's change feed, see `ChangeFeedMixin.get_until`.
+    Objects changed or deleted since then are left for the next incremental
+    dump.
+    :return: The number of objects dumped.
+    """
+    viewset = get_viewset(viewset_path, base_url)
+    queryset = viewset.get_queryset()
+    index_file = get_index_path(root_folder)
+    if since is None:
+        if os.path.exists(root_folder):
+            shutil.rmtree(root_folder)
+    else:
+        field_name = viewset.get_change_feed_field()
+        queryset = queryset.filter(**{
+            '%s__gte' % field_name: since,
+            '%s__lt' % field_name: until,
+        })
+    ensure_exists(root_folder)
+
+    objects = iter_rendered_json(
+        viewset_path,
+        queryset,
+        base_url=base_url,
+        indent=2 if output_format == 'json' else None,
+        chunk_size=chunk_size,
+        processes=processes,
+        limit=sample_size,
+    )
+
+    count = [0]
+
+    def iter_documents():
+        for pk, content in objects:
+            write_file(get_object_path(root_folder, pk), content)
+            count[0] += 1
+            yield pk, content
+
+    if since is None:
+        # Write object files and the combined file in one pass
+        write_combined(
+            destination_file, iter_documents(), output_format, index_file)
+    else:
+        changed_pks = set(pk for pk, __ in iter_documents())
+        deleted_pks = set(
+            viewset.get_deleted_queryset(since, until)
+            .values_list('object_id', flat=True).iterator()
+        ) - changed_pks
+        for pk in deleted_pks:
+            path = get_object_path(root_folder, pk)
+            if os.path.exists(path):
+                os.remove(path)
+        # Only changed objects are read from their files
+        write_combined(
+            destination_file,
+            merge_documents(
+                iter_combined(destination_file, index_file),
+                changed_pks, root_folder, deleted_pks),
+            output_format,
+            index_file,
+        )
+    return count[0]
 
-    with open(destination_file, "wb") as f:
-        f.write("[\n")
-        for m in matches[:-1]:
-            f.write(open(m, "rb").read())
-            f.write(",\n")
-        f.write(open(matches[-1], "rb").read())
-        f.write("\n]")
 
+def read_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return {}
 
-class PrettyJSONRenderer(JSONRenderer):
-    def get_indent(self, *args, **kwargs):
-        return 2
 
-    def render(self, *args, **kwargs):
-        default = super(PrettyJSONRenderer, self).render(*args, **kwargs)
-        return default.replace(TEST_URL, PROPER_URL)
+def write_state(path, state):
+    with open(path, 'w') as f:
+        json.dump(state, f, indent=2)
+
 
 class Command(BaseCommand):
-    args = "<destination folder>"
-    help = ('Dump all items in the artists and artworks API to a series of json files and 2 csv files, ready for '
-            'publishing.\n\nWARNING: This will overwrite files in the destination folder.')
+    args = "<destination folder> [[<name>=]<viewset dotted path> ...]"
+    help = ('Dump all items in the given API viewsets, or the GLAMkit '
+            'Collections APIs by default, to one JSON file per item and a '
+            'combined file per viewset, ready for publishing.\n\n'
+            'WARNING: This will overwrite files in the destination folder.')
 
     option_list = BaseCommand.option_list + (
         make_option(
             '--sample',
             dest='sample',
             type='int',
-            help='Number of Artists and Artworks to use',
+            help='Number of items per viewset to dump',
             default=None
         ),
         make_option(
             '--models',
             dest='models',
-            help='Which models to dump',
-            default="artist,artwork,exhibition"
+            help='Comma-separated names of the viewsets to dump, '
+                 'defaults to all',
+            default=None
+        ),
+        make_option(
+            '--format',
+            dest='format',
+            type='choice',
+            choices=('json', 'jsonl'),
+            help='Format of the combined file: "json" for a JSON list '
+                 '(default) or "jsonl" for JSON Lines',
+            default='json'
+        ),
+        make_option(
+            '--base-url',
+            dest='base_url',
+            help='Base URL for links to the API (default: %s)'
+                 % DEFAULT_BASE_URL,
+            default=DEFAULT_BASE_URL
+        ),
+        make_option(
+            '--chunk-size',
+            dest='chunk_size',
+            type='int',
+            help='Number of items to serialise at a time (default: %d)'
+                 % DEFAULT_CHUNK_SIZE,
+            default=DEFAULT_CHUNK_SIZE
+        ),
+        make_option(
+            '--processes',
+            dest='processes',
+            type='int',
+            help='Number of processes to serialise items with (default: 1)',
+            default=1
+        ),
+        make_option(
+            '--incremental',
+            action='store_true',
+            dest='incremental',
+            help='Only dump items changed or deleted since the last dump to '
+                 'the destination folder',
+            default=False
+        ),
+        make_option(
+            '--noinput',
+            action='store_false',
+            dest='interactive',
+            help='Create the destination folder without asking',
+            default=True
         ),
     )
 
+    def get_viewsets(self, args, models=None):
+        if args:
+            viewsets = []
+            for arg in args:
+                name, __, viewset_path = arg.rpartition('=')
+                try:
+                    viewset_class = import_string(viewset_path)
+                except ImportError as ex:
+                    raise CommandError(
+                        "Failed to load viewset '%s': %s" % (arg, ex))
+                if not name:
+                    name = viewset_class.queryset.model._meta.model_name
+                viewsets.append((name, viewset_path))
+        else:
+            viewsets = get_default_viewsets()
+        if models:
+            models = models.split(',')
+            viewsets = [(n, p) for n, p in viewsets if n in models]
+        if not viewsets:
+            raise CommandError('Please give the dotted paths of viewsets')
+        return viewsets
+
+    def get_since(self, viewset_state, output_format, root_folder,
+                  destination_file):
+        """
+        Return the time of the previous dump of a viewset to update
+        incrementally, or `None` if it must be dumped in full because there is
+        no complete previous dump in ``output_format``, or because it is older
+        than ``ICEKIT['API_TOMBSTONE_RETENTION_DAYS']`` and deletions since
+        then may have been pruned.
+        """
+        if not isinstance(viewset_state, dict) or \
+                viewset_state.get('format') != output_format or \
+                not os.path.exists(destination_file) or \
+                not os.path.exists(get_index_path(root_folder)):
+            return None
+        since = parse_datetime(viewset_state['until'])
+        days = appsettings.API_TOMBSTONE_RETENTION_DAYS
+        if days is not None and \
+                since < timezone.now() - timedelta(days=days):
+            return None
+        return since
+
     def handle(self, *args, **options):
         try:
             path = os.path.abspath(args[0])
         except IndexError:
             raise CommandError('Please give a path to a destination folder')
         if not os.path.exists(path):
-            if input("The folder %s does not exist. Create it now? (y/n): " % path) in ['yes', 'y']:
+            if not options['interactive'] or input(
+                    "The folder %s does not exist. Create it now? (y/n): "
+                    % path) in ['yes', 'y']:
                 os.makedirs(path)
             else:
                 sys.exit()
 
-        if 'artist' in options['models']:
-            root_folder = os.path.join(path, "artists")
-            dump_viewset(
-                viewset_class=ArtistViewSet,
-                root_folder=root_folder,
-                folder_fn=lambda x: slugify(x.slug)[0],
-                sample_size=options['sample'],
-            )
-            json_path = path+"/json/"
-            if not os.path.exists(json_path):
-                if input("The folder %s does not exist. Create it now? (y/n): " % json_path) in ['yes', 'y']:
-                    os.makedirs(json_path)
-                    concatenate_json(root_folder, os.path(json_path))
-                else:
-                    sys.exit()
-            concatenate_json(root_folder, os.path.join(json_path, "sfmoma_raw_data_artists.json"))
-            
-
-        if 'artwork' in options['models']:
-            root_folder = os.path.join(path, "artworks")
-            dump_viewset(
-                viewset_class=ArtworkViewSet,
-                root_folder=root_folder,
-                folder_fn=lambda x: os.path.join(*x.slug.split(".")[:-1] or x.slug),
-                sample_size=options['sample'],
-            )
-            json_path = path+"/json/"
-            if not os.path.exists(json_path):
-                if input("The folder %s does not exist. Create it now? (y/n): " % json_path) in ['yes', 'y']:
-                    os.makedirs(json_path)
-                    concatenate_json(root_folder, os.path(json_path))
-                else:
-                    sys.exit()
-            concatenate_json(root_folder, os.path.join(json_path, "sfmoma_raw_data_artworks.json"))
-            
-
-        if 'exhibition' in options['models']:
-            root_folder = os.path.join(path, "exhibitions")
-            dump_viewset(
-                viewset_class=ExhibitionViewSet,
+        viewsets = self.get_viewsets(args[1:], options['models'])
+        output_format = options['format']
+        json_path = os.path.join(path, 'json')
+        ensure_exists(json_path)
+
+        state_path = os.path.join(path, STATE_FILENAME)
+        state = read_state(state_path)
+        for name, viewset_path in viewsets:
+            # Leave recent changes, which may not be committed yet, for the
+            # next dump like the change feed does
+            viewset = get_viewset(viewset_path, options['base_url'])
+            if hasattr(viewset, 'get_until'):
+                until = viewset.get_until()
+            else:
+                until = timezone.now()
+            root_folder = os.path.join(path, name)
+            destination_file = os.path.join(
+                json_path, '%s.%s' % (name, output_format))
+            since = None
+            if options['incremental']:
+                since = self.get_since(
+                    state.get(name), output_format, root_folder,
+                    destination_file)
+                if since is None and int(options['verbosity']) >= 1:
+                    self.stdout.write(
+                        'No recent previous %s dump in %s format, dumping all '
+                        'items'
+                        % (name, output_format))
+            count = dump_viewset(
+                viewset_path=viewset_path,
                 root_folder=root_folder,
-                folder_fn=lambda x: slugify(x.slug)[0],
+                destination_file=destination_file,
+                output_format=output_format,
+                base_url=options['base_url'],
+                chunk_size=options['chunk_size'],
+                processes=options['processes'],
                 sample_size=options['sample'],
+                since=since,
+                until=until,
             )
-            json_path = path+"/json/"
-            if not os.path.exists(json_path):
-                if input("The folder %s does not exist. Create it now? (y/n): " % json_path) in ['yes', 'y']:
-                    os.makedirs(json_path)
-                else:
-                    sys.exit()
-            concatenate_json(root_folder, os.path.join(json_path, "sfmoma_raw_data_exhibitions.json"))
+            if not options['sample']:
+                state[name] = {
+                    'until': until.isoformat(),
+                    'format': output_format,
+                }
+                write_state(state_path, state)
+            if int(options['verbosity']) >= 1:
+                self.stdout.write('Dumped %d %s items%s' % (
+                    count, name, ' (changed)' if since else ''))
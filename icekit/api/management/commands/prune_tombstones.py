@@ -0,0 +1,26 @@
+from optparse import make_option
+
+from django.core.management.base import NoArgsCommand
+
+from icekit.api.models import prune_tombstones
+
+
+class Command(NoArgsCommand):
+    help = ('Delete the records of deleted objects kept for API change feeds '
+            'that are older than the ICEKIT["API_TOMBSTONE_RETENTION_DAYS"] '
+            'setting. Run this daily.')
+
+    option_list = NoArgsCommand.option_list + (
+        make_option(
+            '--days',
+            dest='days',
+            type='int',
+            help='Number of days of records to keep, instead of the setting',
+            default=None
+        ),
+    )
+
+    def handle_noargs(self, **options):
+        count = prune_tombstones(options['days'])
+        if int(options['verbosity']) >= 1:
+            self.stdout.write('Deleted %d tombstones' % count)
@@ -0,0 +1,22 @@
+from django.core.management.base import NoArgsCommand
+
+from icekit.api.apps import get_alias_models
+from icekit.api.models import update_slug_aliases
+
+
+class Command(NoArgsCommand):
+    help = ('Add the identifiers of existing objects, like their slugs and '
+            'external IDs, to the slug alias index used to redirect old URLs.')
+
+    def handle_noargs(self, **options):
+        for model in get_alias_models():
+            count = 0
+            queryset = model._default_manager.all()
+            if hasattr(queryset, 'non_polymorphic'):
+                queryset = queryset.non_polymorphic()
+            for obj in queryset.iterator():
+                update_slug_aliases(model, obj)
+                count += 1
+            if int(options['verbosity']) >= 1:
+                self.stdout.write('Indexed %d %s' % (
+                    count, model._meta.verbose_name_plural))
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('icekit_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlugAlias',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('object_id', models.PositiveIntegerField()),
+                ('alias', models.CharField(max_length=255)),
+                ('content_type', models.ForeignKey(to='contenttypes.ContentType', on_delete=django.db.models.deletion.CASCADE)),
+            ],
+            options={
+                'verbose_name_plural': 'slug aliases',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='slugalias',
+            unique_together=set([('content_type', 'alias', 'object_id')]),
+        ),
+    ]
@@ -0,0 +1,270 @@
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.utils import timezone
+from django.utils.encoding import python_2_unicode_compatible
+
+from icekit import appsettings
+from icekit.publishing.models import PublishingModel
+from icekit.utils.cache import invalidate_namespace
+
+# Namespace for serialised objects cached by `HTTPCacheMixin` viewsets, and
+# prefix of the namespace per model, see `get_api_cache_namespace`
+API_CACHE_NAMESPACE = 'api'
+
+# Namespace for identifiers cached as not matching any `SlugAlias`
+ALIAS_CACHE_NAMESPACE = 'api_alias'
+
+# Names of fields holding identifiers that `SlugAlias`es are kept for, besides
+# the primary key: current and alternative slugs, legacy accession numbers and
+# external IDs.
+ALIAS_FIELD_NAMES = (
+    'slug',
+    'alt_slug',
+    'accession_temp_fallback',
+    'external_ref',
+)
+
+
+@python_2_unicode_compatible
+class Tombstone(models.Model):
+    """
+    A record of a deleted object, so API change feeds can tell clients which
+    objects to remove from their copy of the data.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        get_latest_by = 'deleted_at'
+        index_together = (
+            ('content_type', 'deleted_at'),
+        )
+
+    def __str__(self):
+        return u'%s %s deleted at %s' % (
+            self.content_type, self.object_id, self.deleted_at)
+
+
+@python_2_unicode_compatible
+class SlugAlias(models.Model):
+    """
+    An identifier an object is or was known by, so requests for old or
+    alternative URLs can be redirected to the object's canonical URL with one
+    query, see `icekit.api.base_views.RedirectViewset`.
+
+    Aliases are kept for objects of models with a ``slug`` field, under the
+    content type of the model that defines the field, so an alias of a
+    polymorphic child is found through its base model. Aliases of publishable
+    objects are kept for their drafts, which outlive their published copies.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    alias = models.CharField(max_length=255)
+
+    class Meta:
+        unique_together = (
+            ('content_type', 'alias', 'object_id'),
+        )
+        verbose_name_plural = 'slug aliases'
+
+    def __str__(self):
+        return self.alias
+
+
+def get_alias_content_type(model):
+    """
+    Return the content type `SlugAlias`es for objects of ``model`` are kept
+    under, or `None` if ``model`` has no ``slug`` field.
+    """
+    try:
+        field = model._meta.get_field('slug')
+    except FieldDoesNotExist:
+        return None
+    return ContentType.objects.get_for_model(field.model)
+
+
+def get_alias_values(instance):
+    """
+    Return the set of identifiers ``instance`` is known by.
+    """
+    values = set([u'%s' % instance.pk])
+    for field_name in ALIAS_FIELD_NAMES:
+        value = getattr(instance, field_name, None)
+        if value:
+            values.add(u'%s' % value)
+    max_length = SlugAlias._meta.get_field('alias').max_length
+    return set(value for value in values if len(value) <= max_length)
+
+
+def get_alias_filter(model, values):
+    """
+    Return a `Q` object matching the objects of ``model`` known by any of
+    ``values``, for use in a single query.
+    """
+    object_ids = SlugAlias.objects.filter(
+        content_type=get_alias_content_type(model),
+        alias__in=values,
+    ).values('object_id')
+    alias_filter = Q(pk__in=object_ids)
+    if issubclass(model, PublishingModel):
+        alias_filter |= Q(publishing_draft__pk__in=object_ids)
+    return alias_filter
+
+
+def has_slug_aliases(model):
+    """
+    Return whether any `SlugAlias`es are kept for objects of ``model``, which
+    may have been saved before the index was added.
+    """
+    return SlugAlias.objects.filter(
+        content_type=get_alias_content_type(model)).exists()
+
+
+def get_field_alias_filter(model, values):
+    """
+    Return a `Q` object matching the objects of ``model`` whose identifier
+    fields hold any of ``values``, for models without `SlugAlias`es yet, or
+    `None` if ``model`` has no identifier fields.
+    """
+    field_filters = []
+    for field_name in ALIAS_FIELD_NAMES:
+        try:
+            model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            continue
+        field_filters.append(Q(**{'%s__in' % field_name: values}))
+    if not field_filters:
+        return None
+    return reduce(or_, field_filters)
+
+
+def _is_published_copy(instance):
+    return getattr(instance, 'publishing_is_draft', True) is False
+
+
+def update_slug_aliases(sender, instance, raw=False, **kwargs):
+    """
+    Add any new identifiers of a saved object as `SlugAlias`es, keeping its
+    old ones. This is connected to the `post_save` signal of models with a
+    ``slug`` field by the app config.
+    """
+    if raw or instance.pk is None:
+        return
+    if _is_published_copy(instance):
+        # A newly published object may match identifiers cached as misses
+        invalidate_namespace(ALIAS_CACHE_NAMESPACE)
+        return
+    content_type = get_alias_content_type(type(instance))
+    if content_type is None:
+        return
+    aliases = SlugAlias.objects.filter(
+        content_type=content_type, object_id=instance.pk)
+    new_values = get_alias_values(instance) - \
+        set(aliases.values_list('alias', flat=True))
+    if not new_values:
+        return
+    SlugAlias.objects.bulk_create([
+        SlugAlias(
+            content_type=content_type, object_id=instance.pk, alias=value)
+        for value in new_values
+    ])
+    invalidate_namespace(ALIAS_CACHE_NAMESPACE)
+
+
+def delete_slug_aliases(sender, instance, **kwargs):
+    """
+    Delete the `SlugAlias`es of a deleted object. This is connected to the
+    `post_delete` signal of models with a ``slug`` field by the app config.
+    """
+    if instance.pk is None or _is_published_copy(instance):
+        return
+    content_type = get_alias_content_type(type(instance))
+    if content_type is None:
+        return
+    SlugAlias.objects.filter(
+        content_type=content_type, object_id=instance.pk).delete()
+
+
+def get_model_content_types(model):
+    """
+    Return the content types of ``model`` and its installed subclasses, whose
+    deletions are recorded under their own content types.
+    """
+    return ContentType.objects.get_for_models(*[
+        m for m in apps.get_models() if issubclass(m, model)
+    ]).values()
+
+
+def record_tombstone(sender, instance, **kwargs):
+    """
+    Record a `Tombstone` for a deleted object. This is connected to the
+    `post_delete` signal of models with API change feeds by the app config.
+
+    Deleting an object of a polymorphic model also deletes the rows of its
+    parent models, which are skipped so only one `Tombstone` is recorded,
+    under the content type of the object's own model.
+    """
+    if instance.pk is None:
+        return
+    ctype_id = getattr(instance, 'polymorphic_ctype_id', None)
+    if ctype_id is not None:
+        model = ContentType.objects.get_for_id(ctype_id).model_class()
+        if model is not None and \
+                model._meta.concrete_model is not sender._meta.concrete_model:
+            return
+    Tombstone.objects.create(
+        content_type=ContentType.objects.get_for_model(sender),
+        object_id=instance.pk,
+    )
+
+
+def prune_tombstones(days=None):
+    """
+    Delete `Tombstone`s older than ``days``, which defaults to the
+    ``ICEKIT['API_TOMBSTONE_RETENTION_DAYS']`` setting, and return the number
+    deleted.
+    """
+    if days is None:
+        days = appsettings.API_TOMBSTONE_RETENTION_DAYS
+    if days is None:
+        return 0
+    tombstones = Tombstone.objects.filter(
+        deleted_at__lt=timezone.now() - timedelta(days=days))
+    count = tombstones.count()
+    tombstones.delete()
+    return count
+
+
+def get_api_cache_namespace(model):
+    """
+    Return the namespace of serialised objects cached by `HTTPCacheMixin`
+    viewsets that depend on instances of ``model``.
+    """
+    opts = model._meta.concrete_model._meta
+    return '%s:%s.%s' % (API_CACHE_NAMESPACE, opts.app_label, opts.model_name)
+
+
+def invalidate_api_cache(sender, instance, signal=None, **kwargs):
+    """
+    Invalidate serialised objects cached for API viewsets that render
+    instances of ``sender`` or of its parent models. This is connected to the
+    signals of models with API change feeds by the app config.
+
+    Saving a draft leaves published items alone, and the representation of
+    the draft itself is cached by its modified time, so draft saves are
+    skipped.
+    """
+    if signal is post_save and \
+            getattr(instance, 'publishing_is_draft', False):
+        return
+    for model in [sender] + sender._meta.get_parent_list():
+        invalidate_namespace(get_api_cache_namespace(model))
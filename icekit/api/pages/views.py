@@ -5,11 +5,12 @@ from rest_framework.permissions import AllowAny
 from rest_framework.decorators import permission_classes
 
 from . import serializers
+from icekit.api.base_views import HTTPCacheMixin
 from icekit.utils.pagination import ICEKitAPIPagination
 
 
 @permission_classes((AllowAny, ))
-class PageViewSet(viewsets.ReadOnlyModelViewSet):
+class PageViewSet(HTTPCacheMixin, viewsets.ReadOnlyModelViewSet):
     """
     Read only viewset for published page objects.
     """
@@ -1,8 +1,83 @@
+from collections import OrderedDict
+
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from icekit.content_collections.listings import Listing
+
+
+class KeysetPaginationMixin(object):
+    """
+    Mixin for `PageNumberPagination` classes that switches to keyset (cursor)
+    pagination when the ``cursor`` query parameter is given, starting with an
+    empty ``cursor`` value.
+
+    Keyset pages are fetched with an indexable ``WHERE`` clause instead of an
+    ``OFFSET``, are stable when items are added, and are not counted unless
+    the ``count`` query parameter is also given. This suits clients like
+    harvesters that walk through every item.
+
+    Items are ordered by the ``ordering`` query parameter, if supported by the
+    view, or by ``keyset_ordering`` (the primary key by default) rather than
+    the model's default ordering, which may not be indexed.
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    keyset_ordering = ('pk',)
+
+    listing_result = None
+
+    def is_keyset_request(self, request):
+        return self.cursor_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_keyset_request(request):
+            return super(KeysetPaginationMixin, self).paginate_queryset(
+                queryset, request, view=view)
+
+        self.request = request
+        self.display_page_controls = False
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        listing = Listing(
+            queryset,
+            ordering=queryset.query.order_by or self.keyset_ordering,
+            page_size=page_size,
+        )
+        self.listing_result = listing.paginate(
+            request.query_params[self.cursor_query_param])
+        self.count = None
+        if request.query_params.get(self.count_query_param) in \
+                ('1', 'true', 'True'):
+            self.count = queryset.count()
+        return list(self.listing_result)
+
+    def get_next_cursor_link(self):
+        if not self.listing_result.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.listing_result.next_cursor,
+        )
+
+    def get_paginated_response(self, data):
+        if self.listing_result is None:
+            return super(KeysetPaginationMixin, self) \
+                .get_paginated_response(data)
+        response_data = OrderedDict()
+        if self.count is not None:
+            response_data['count'] = self.count
+        response_data['next'] = self.get_next_cursor_link()
+        response_data['results'] = data
+        return Response(response_data)
 
 
-class DefaultPageNumberPagination(PageNumberPagination):
+class DefaultPageNumberPagination(KeysetPaginationMixin, PageNumberPagination):
     """ Default REST pagination settings to apply in ICEkit """
     page_size_query_param = 'page_size'
     max_page_size = api_settings.PAGE_SIZE
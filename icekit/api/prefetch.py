@@ -0,0 +1,278 @@
+"""
+Plan the `select_related` and `prefetch_related` lookups a queryset needs to
+be rendered by a serializer without per-row queries.
+
+The plan is derived from the serializer's (nested) field tree, so it stays in
+step with the serializer and with the fields selected by `drf_queryfields`
+through the ``fields`` or ``fields!`` query parameters. Where the columns a
+serializer reads can be worked out, the plan also limits the columns loaded
+with `only`.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils import six
+from polymorphic.models import PolymorphicModel
+from rest_framework import serializers
+from rest_framework.relations import HyperlinkedIdentityField, \
+    ManyRelatedField, RelatedField
+
+from icekit.utils.cache import LOCAL_CACHE_MAX_ENTRIES, MODIFIED_FIELD_NAMES
+
+from .base_serializers import ModelSubSerializer
+
+# Plans by serializer class and the names of its selected fields, up to
+# `LOCAL_CACHE_MAX_ENTRIES`
+_prefetch_plans = {}
+
+
+class PrefetchPlan(object):
+    """
+    The lookups to load the relations rendered for instances of ``model``.
+
+    ``prefetch_related`` holds ``(lookup, plan)`` pairs, where ``plan`` is the
+    `PrefetchPlan` for the related model used to build a `Prefetch` queryset.
+    ``only`` holds the names of the only fields to load, or is `None` to load
+    all fields.
+    """
+    def __init__(self, model):
+        self.model = model
+        self.select_related = []
+        self.prefetch_related = []
+        self.only = None
+
+    def __bool__(self):
+        return bool(self.select_related or self.prefetch_related)
+    __nonzero__ = __bool__
+
+    def get_prefetches(self, exclude=()):
+        """
+        Return `Prefetch` objects for the planned lookups, skipping any lookup
+        that is in ``exclude`` or is a prefix of a lookup in ``exclude``.
+        """
+        prefetches = []
+        for lookup, plan in self.prefetch_related:
+            if any(e == lookup or e.startswith(lookup + '__')
+                   for e in exclude):
+                continue
+            prefetches.append(Prefetch(
+                lookup, queryset=plan.apply(plan.model._default_manager.all())))
+        return prefetches
+
+    def get_models(self):
+        """
+        Return the set of models whose instances are loaded by the plan.
+        """
+        models = set([self.model])
+        for lookup in self.select_related:
+            model = self.model
+            for name in lookup.split('__'):
+                model = _get_relations(model)[name].related_model
+                models.add(model)
+        for __, plan in self.prefetch_related:
+            models.update(plan.get_models())
+        return models
+
+    def apply(self, queryset):
+        """
+        Return ``queryset`` with the planned lookups added, leaving alone any
+        lookups that were already prefetched and any deferred fields.
+        """
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        elif self.only is not None and not queryset.query.deferred_loading[0]:
+            queryset = queryset.only(*self.only)
+        existing = [
+            lookup if isinstance(lookup, six.string_types)
+            else lookup.prefetch_to
+            for lookup in queryset._prefetch_related_lookups
+        ]
+        prefetches = self.get_prefetches(exclude=existing)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+
+def _get_relations(model):
+    """
+    Return a dict of the relation fields of ``model`` by attribute name.
+    """
+    relations = {}
+    for field in model._meta.get_fields():
+        if not field.is_relation or field.related_model is None:
+            continue
+        if field.concrete:
+            relations[field.name] = field
+        else:
+            relations[field.get_accessor_name()] = field
+    return relations
+
+
+def _get_child_serializer(field):
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+
+def _plan_serializer(serializer, plan, prefix=''):
+    """
+    Add the lookups for the fields of ``serializer``, which renders instances
+    of ``plan.model`` reached through the ``prefix`` lookup, to ``plan``.
+    """
+    relations = _get_relations(plan.model)
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        child = _get_child_serializer(field)
+        # Fields grouping attributes of the same instance
+        if isinstance(field, ModelSubSerializer) or field.source == '*':
+            if child is not None:
+                _plan_serializer(child, plan, prefix)
+            continue
+        # Only direct relations of the instance are planned, not dotted sources
+        relation = relations.get(field.source)
+        if relation is None:
+            continue
+        if child is None and not isinstance(field, ManyRelatedField):
+            if not isinstance(field, RelatedField) or \
+                    field.use_pk_only_optimization():
+                # Rendered from the foreign key value alone
+                continue
+
+        related_plan, related_prefix = _plan_relation(
+            plan, relation, prefix, field.source)
+        if child is not None:
+            _plan_serializer(child, related_plan, related_prefix)
+
+
+def _plan_relation(plan, relation, prefix, name):
+    """
+    Add the lookup for a relation to ``plan``, and return the plan and the
+    lookup prefix for relations of the related objects.
+    """
+    lookup = prefix + name
+    is_many = relation.many_to_many or relation.one_to_many
+    if not is_many and \
+            not issubclass(relation.related_model, PolymorphicModel):
+        if lookup not in plan.select_related:
+            plan.select_related.append(lookup)
+        return plan, lookup + '__'
+    # Related polymorphic instances are prefetched rather than joined so they
+    # are fetched as their real types in bulk.
+    for existing_lookup, related_plan in plan.prefetch_related:
+        if existing_lookup == lookup:
+            return related_plan, ''
+    related_plan = PrefetchPlan(relation.related_model)
+    plan.prefetch_related.append((lookup, related_plan))
+    return related_plan, ''
+
+
+def _plan_path(plan, attrs, prefix=''):
+    """
+    Add the lookups for the relations along a path of attribute names, from
+    instances of ``plan.model`` reached through the ``prefix`` lookup.
+    """
+    relation = _get_relations(plan.model).get(attrs[0])
+    if relation is None:
+        return
+    related_plan, prefix = _plan_relation(plan, relation, prefix, attrs[0])
+    if len(attrs) > 1:
+        _plan_path(related_plan, attrs[1:], prefix)
+
+
+def _plan_only(serializer, opts, names):
+    """
+    Add the names of the concrete fields of the model with options ``opts``
+    that ``serializer`` reads to ``names``. Return `False` if some fields
+    read attributes that are not model fields, like properties or methods.
+    """
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if isinstance(field, HyperlinkedIdentityField):
+            if field.lookup_field != 'pk':
+                names.add(field.lookup_field)
+            continue
+        # Fields grouping attributes of the same instance
+        if isinstance(field, ModelSubSerializer) or field.source == '*':
+            child = _get_child_serializer(field)
+            if child is None or not _plan_only(child, opts, names):
+                return False
+            continue
+        try:
+            model_field = opts.get_field(field.source)
+        except FieldDoesNotExist:
+            return False
+        if not model_field.concrete or model_field.many_to_many:
+            # Related objects are loaded by the primary key
+            continue
+        names.add(model_field.name)
+        # Image dimensions are read as image field values are loaded
+        for attname in ('width_field', 'height_field'):
+            if getattr(model_field, attname, None):
+                names.add(getattr(model_field, attname))
+    return True
+
+
+def get_only_fields(serializer):
+    """
+    Return the names of the only fields to load for rendering instances with
+    ``serializer``, or `None` if all fields should be loaded.
+
+    Modified times are always loaded for cache validators and change feeds.
+    Fields of polymorphic models are not limited, since instances may be
+    fetched again as their real types.
+    """
+    opts = serializer.Meta.model._meta
+    if issubclass(serializer.Meta.model, PolymorphicModel):
+        return None
+    names = set([opts.pk.name])
+    if not _plan_only(serializer, opts, names):
+        return None
+    for name in MODIFIED_FIELD_NAMES:
+        try:
+            opts.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        names.add(name)
+    return sorted(names)
+
+
+def get_prefetch_plan(serializer):
+    """
+    Return the `PrefetchPlan` for rendering instances with ``serializer``,
+    which must be a `ModelSerializer`.
+    """
+    key = (type(serializer), tuple(serializer.fields.keys()))
+    try:
+        return _prefetch_plans[key]
+    except KeyError:
+        pass
+    plan = PrefetchPlan(serializer.Meta.model)
+    _plan_serializer(serializer, plan)
+    plan.only = get_only_fields(serializer)
+    # Keys depend on the fields selected by clients, so bound the cache
+    if len(_prefetch_plans) >= LOCAL_CACHE_MAX_ENTRIES:
+        _prefetch_plans.clear()
+    _prefetch_plans[key] = plan
+    return plan
+
+
+def get_prefetch_plan_for_paths(model, paths):
+    """
+    Return the `PrefetchPlan` for reading the dotted attribute ``paths``, like
+    ``'workcreator_set.creator.name_display'``, of instances of ``model``.
+    """
+    plan = PrefetchPlan(model)
+    for path in paths:
+        _plan_path(plan, path.split('.'))
+    return plan
+
+
+def prefetch_for_serializer(queryset, serializer):
+    """
+    Return ``queryset`` with the lookups needed to render its instances with
+    ``serializer`` added.
+    """
+    return get_prefetch_plan(serializer).apply(queryset)
@@ -1,7 +1,35 @@
+import csv
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
 from django.apps import apps
+from django.core.management import call_command
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from django_dynamic_fixture import G
+from mock import patch
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from glamkit_collections.contrib.work_creator.exports import WorkCSVExport
+from icekit.content_collections.listings import encode_cursor
+from icekit.utils.cache import get_namespace_version
 
 from . import base_tests
+from .base_views import ChangeFeedMixin, RedirectViewset
+from .export import CSVExport
+from .management.commands.dump_collection_api import STATE_FILENAME, \
+    Command as DumpCollectionAPICommand
+from .models import SlugAlias, Tombstone, get_api_cache_namespace
+from .prefetch import _prefetch_plans, get_prefetch_plan
 
 Artwork = apps.get_model('gk_collections_artwork.Artwork')
 Film = apps.get_model('gk_collections_film.Film')
@@ -13,6 +41,20 @@ WorkCreator = apps.get_model(
     'gk_collections_work_creator.WorkCreator')
 Role = apps.get_model(
     'gk_collections_work_creator.Role')
+WorkImage = apps.get_model(
+    'gk_collections_work_creator.WorkImage')
+WorkBase = apps.get_model(
+    'gk_collections_work_creator.WorkBase')
+
+
+class AllWorksCSVExport(WorkCSVExport):
+    """ Export draft as well as published works """
+    def get_queryset(self):
+        return CSVExport.get_queryset(self)
+
+
+class ArtworkRedirectViewSet(RedirectViewset):
+    queryset = Artwork.objects.filter(publishing_is_draft=False)
 
 
 class _BaseCollectionAPITestCase(base_tests._BaseAPITestCase):
@@ -121,6 +163,236 @@ class ArtworkAPITestCase(_BaseCollectionAPITestCase):
         }
         self.assertEqual(expected, response.data)
 
+    def test_list_artworks_with_cursor(self):
+        response = self.client.get(
+            self.listing_url() + '?cursor=&page_size=1')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(['next', 'results'], list(response.data))
+        self.assertEqual(
+            [self.artwork.pk], [r['id'] for r in response.data['results']])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [self.artwork_published.pk],
+            [r['id'] for r in response.data['results']])
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get(self.listing_url() + '?cursor=&count=1')
+        self.assertEqual(2, response.data['count'])
+
+        # Forged cursors with invalid values return the first page
+        response = self.client.get(self.listing_url(), {
+            'cursor': encode_cursor({'o': 1, 'v': ['not a pk']}),
+            'page_size': 1,
+        })
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            [self.artwork.pk], [r['id'] for r in response.data['results']])
+
+    def test_list_artwork_changes(self):
+        changes_url = reverse('api:%s-changes' % self.API_NAME)
+        # The default window ends a little before now, so pass the end
+        response = self.client.get(
+            changes_url, {'until': self.iso8601(timezone.now())})
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([], response.data['deleted'])
+        self.assertEqual(
+            [self.artwork.pk, self.artwork_published.pk],
+            sorted(r['id'] for r in response.data['results']))
+
+        # Unpublishing deletes the published copy and modifies the draft
+        published_pk = self.artwork_published.pk
+        self.artwork.unpublish()
+        # Parent rows of deleted objects are not recorded separately
+        self.assertEqual(1, Tombstone.objects.count())
+        response = self.client.get(changes_url, {
+            'since': response.data['until'],
+            'until': self.iso8601(timezone.now()),
+        })
+        self.assertEqual([published_pk], response.data['deleted'])
+        self.assertEqual(
+            [self.artwork.pk], [r['id'] for r in response.data['results']])
+
+        response = self.client.get(changes_url, {'since': 'yesterday'})
+        self.assertEqual(400, response.status_code)
+        # Deletions before the retention period may have been pruned
+        response = self.client.get(changes_url, {
+            'since': self.iso8601(timezone.now() - timedelta(days=1000))})
+        self.assertEqual(400, response.status_code)
+
+    def test_list_artwork_changes_paginates_deletions(self):
+        changes_url = reverse('api:%s-changes' % self.API_NAME)
+        since = self.iso8601(timezone.now())
+        published_pks = [self.artwork_published.pk]
+        self.artwork.unpublish()
+        for i in range(2):
+            artwork = Artwork.objects.create(title='Artwork %d' % i)
+            published_pks.append(artwork.publish().pk)
+            artwork.unpublish()
+
+        response = self.client.get(changes_url, {
+            'since': since,
+            'until': self.iso8601(timezone.now()),
+            'page_size': 2,
+        })
+        deleted = response.data['deleted']
+        results = response.data['results']
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            deleted += response.data['deleted']
+            results += response.data['results']
+        self.assertEqual(published_pks, deleted)
+        self.assertEqual(3, len(results))
+
+        # Old tombstones are pruned
+        Tombstone.objects.update(
+            deleted_at=timezone.now() - timedelta(days=1000))
+        call_command('prune_tombstones', verbosity=0)
+        self.assertFalse(Tombstone.objects.exists())
+
+    def test_dump_artworks(self):
+        path = tempfile.mkdtemp()
+        try:
+            call_command(
+                'dump_collection_api', path,
+                'artwork=glamkit_collections.contrib.work_creator.plugins'
+                '.artwork.api.APIViewSet',
+                interactive=False, verbosity=0)
+            with open(os.path.join(path, 'json', 'artwork.json')) as f:
+                data = json.load(f)
+            self.assertEqual(
+                [self.artwork.pk, self.artwork_published.pk],
+                [item['id'] for item in data])
+            self.assertTrue(os.path.exists(os.path.join(
+                path, 'artwork', '0', '%s.json' % self.artwork.pk)))
+            # The dump lags behind like the change feed
+            with open(os.path.join(path, STATE_FILENAME)) as f:
+                state = json.load(f)
+            self.assertLessEqual(
+                parse_datetime(state['artwork']['until']),
+                timezone.now() - timedelta(
+                    seconds=ChangeFeedMixin.change_feed_lag))
+
+            # Incremental dumps only remove and add changed items. Changes are
+            # dumped without a lag to see them straight away.
+            lag_patch = patch.object(ChangeFeedMixin, 'change_feed_lag', 0)
+            lag_patch.start()
+            self.addCleanup(lag_patch.stop)
+            published_pk = self.artwork_published.pk
+            self.artwork.unpublish()
+            call_command(
+                'dump_collection_api', path,
+                'artwork=glamkit_collections.contrib.work_creator.plugins'
+                '.artwork.api.APIViewSet',
+                incremental=True, interactive=False, verbosity=0)
+            with open(os.path.join(path, 'json', 'artwork.json')) as f:
+                data = json.load(f)
+            self.assertEqual([self.artwork.pk], [item['id'] for item in data])
+            self.assertFalse(os.path.exists(os.path.join(
+                path, 'artwork', '0', '%s.json' % published_pk)))
+
+            # Items changed since the last dump are merged into the combined
+            # file
+            new_artwork = Artwork.objects.create(title='New Artwork')
+            call_command(
+                'dump_collection_api', path,
+                'artwork=glamkit_collections.contrib.work_creator.plugins'
+                '.artwork.api.APIViewSet',
+                incremental=True, interactive=False, verbosity=0)
+            with open(os.path.join(path, 'json', 'artwork.json')) as f:
+                data = json.load(f)
+            self.assertEqual(
+                [self.artwork.pk, new_artwork.pk],
+                [item['id'] for item in data])
+
+            # Dumps in another format are not incremental
+            call_command(
+                'dump_collection_api', path,
+                'artwork=glamkit_collections.contrib.work_creator.plugins'
+                '.artwork.api.APIViewSet',
+                format='jsonl', incremental=True, interactive=False,
+                verbosity=0)
+            with open(os.path.join(path, 'json', 'artwork.jsonl')) as f:
+                data = [json.loads(line) for line in f]
+            self.assertEqual(
+                [self.artwork.pk, new_artwork.pk],
+                [item['id'] for item in data])
+
+            # Dumps older than the tombstone retention period are not
+            # incremental, as deletions since then may have been pruned
+            viewset_state = {
+                'until': (timezone.now() - timedelta(days=1000)).isoformat(),
+                'format': 'jsonl',
+            }
+            self.assertIsNone(DumpCollectionAPICommand().get_since(
+                viewset_state, 'jsonl', os.path.join(path, 'artwork'),
+                os.path.join(path, 'json', 'artwork.jsonl')))
+            viewset_state['until'] = timezone.now().isoformat()
+            self.assertIsNotNone(DumpCollectionAPICommand().get_since(
+                viewset_state, 'jsonl', os.path.join(path, 'artwork'),
+                os.path.join(path, 'json', 'artwork.jsonl')))
+        finally:
+            shutil.rmtree(path)
+
+    def test_artwork_prefetch_plan(self):
+        from glamkit_collections.contrib.work_creator.plugins.artwork.api \
+            import Artwork as ArtworkSerializer
+        plan = get_prefetch_plan(ArtworkSerializer())
+        self.assertEqual([], plan.select_related)
+        prefetches = dict(plan.prefetch_related)
+        self.assertEqual(
+            ['workcreator_set', 'workimage_set', 'workorigin_set'],
+            sorted(prefetches))
+        # Polymorphic creators are prefetched, other relations are joined
+        self.assertEqual(
+            ['role'], prefetches['workcreator_set'].select_related)
+        self.assertEqual(
+            ['creator'],
+            [l for l, __ in prefetches['workcreator_set'].prefetch_related])
+        self.assertEqual(
+            ['image', 'type'], prefetches['workimage_set'].select_related)
+        self.assertEqual(
+            ['image__categories'],
+            [l for l, __ in prefetches['workimage_set'].prefetch_related])
+
+        # Only relations for selected fields are planned
+        request = Request(APIRequestFactory().get(
+            self.listing_url(), {'fields': 'id,images'}))
+        plan = get_prefetch_plan(
+            ArtworkSerializer(context={'request': request}))
+        self.assertEqual(
+            ['workimage_set'], [l for l, __ in plan.prefetch_related])
+
+        # Plans for the fields selected by clients are cached up to a limit
+        with patch('icekit.api.prefetch.LOCAL_CACHE_MAX_ENTRIES', 2):
+            for fields in ('id', 'id,slug', 'id,title'):
+                request = Request(APIRequestFactory().get(
+                    self.listing_url(), {'fields': fields}))
+                get_prefetch_plan(
+                    ArtworkSerializer(context={'request': request}))
+                self.assertLessEqual(len(_prefetch_plans), 2)
+
+    def test_list_artworks_query_count_is_constant(self):
+        def add_related(artwork):
+            role = G(Role)
+            person = Person.objects.create(name_full='Test Person')
+            WorkCreator.objects.create(
+                work=artwork, creator=person, role=role)
+            WorkImage.objects.create(work=artwork, image=G(base_tests.Image))
+
+        add_related(self.artwork)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.listing_url())
+        self.assertEqual(200, response.status_code)
+        num_queries = len(queries)
+
+        for i in range(3):
+            add_related(Artwork.objects.create(title='Artwork %d' % i))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.listing_url())
+        self.assertEqual(5, response.data['count'])
+        self.assertEqual(num_queries, len(queries))
+
     def test_get_artwork_detail_with_get(self):
         response = self.client.get(
             self.detail_url(self.artwork_published.pk))
@@ -139,6 +411,120 @@ class ArtworkAPITestCase(_BaseCollectionAPITestCase):
         })
         self.assertEqual(expected, response.data)
 
+    def test_get_artwork_with_conditional_get(self):
+        url = self.detail_url(self.artwork_published.pk)
+        response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(etag, response['ETag'])
+        response = self.client.get(
+            self.listing_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        response = self.client.get(
+            self.listing_url(), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(304, response.status_code)
+
+        self.artwork_published.title = 'Changed Artwork'
+        self.artwork_published.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('Changed Artwork', response.data['title'])
+
+    def test_artwork_conditional_get_with_changed_role(self):
+        role = Role.objects.create(
+            slug='painter',
+            title='Painter',
+            title_plural='Painters',
+            past_tense='Painted',
+        )
+        WorkCreator.objects.create(
+            work=self.artwork_published,
+            creator=Person.objects.create(name_full='Test Person'),
+            role=role,
+        )
+        url = self.detail_url(self.artwork_published.pk)
+        response = self.client.get(url)
+        self.assertEqual(200, response.status_code)
+        etag = response['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, response.status_code)
+
+        # Changing a related role changes the representation
+        role.title = 'Artist'
+        role.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(200, response.status_code)
+
+    def test_artwork_cache_invalidation(self):
+        artwork_namespace = get_api_cache_namespace(Artwork)
+        work_namespace = get_api_cache_namespace(WorkBase)
+        image_namespace = get_api_cache_namespace(base_tests.Image)
+        versions = [
+            get_namespace_version(namespace) for namespace in
+            (artwork_namespace, work_namespace, image_namespace)]
+        # Saving a draft does not invalidate cached data
+        self.artwork.title = 'Changed Artwork'
+        self.artwork.save()
+        self.assertEqual(versions, [
+            get_namespace_version(namespace) for namespace in
+            (artwork_namespace, work_namespace, image_namespace)])
+        # Saving a published artwork only invalidates data of works
+        self.artwork_published.save()
+        self.assertNotEqual(
+            versions[0], get_namespace_version(artwork_namespace))
+        self.assertNotEqual(
+            versions[1], get_namespace_version(work_namespace))
+        self.assertEqual(
+            versions[2], get_namespace_version(image_namespace))
+
+    def test_get_artwork_by_alias(self):
+        self.artwork.slug = 'renamed-artwork'
+        self.artwork.alt_slug = 'legacyname'
+        self.artwork.external_ref = 'EXT-1'
+        self.artwork.save()
+        artwork_published = self.artwork.publish()
+
+        viewset = ArtworkRedirectViewSet(
+            request=Request(APIRequestFactory().get('/')),
+            format_kwarg=None,
+            args=(),
+            kwargs={},
+        )
+        for identifier in ('test-artwork', 'renamed-artwork', 'legacy-name',
+                           'EXT-1', str(self.artwork.pk)):
+            with self.assertNumQueries(1):
+                self.assertEqual(
+                    artwork_published, viewset.get_alias_object(identifier))
+        # Misses also check that the model is indexed
+        with self.assertNumQueries(2):
+            self.assertIsNone(viewset.get_alias_object('unknown'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(viewset.get_alias_object('unknown'))
+
+        # Before the index is built, identifier fields are looked up
+        SlugAlias.objects.all().delete()
+        for identifier in ('renamed-artwork', 'legacy-name', 'EXT-1'):
+            self.assertEqual(
+                artwork_published, viewset.get_alias_object(identifier))
+
+    def test_slug_aliases_are_kept_for_models_with_slugs(self):
+        role = Role.objects.create(
+            slug='painter',
+            title='Painter',
+            title_plural='Painters',
+            past_tense='Painted',
+        )
+        self.assertEqual(
+            set(['painter', str(role.pk)]),
+            set(SlugAlias.objects.filter(object_id=role.pk).filter(
+                content_type__app_label=Role._meta.app_label,
+                content_type__model=Role._meta.model_name,
+            ).values_list('alias', flat=True)))
+
     def test_add_artwork_with_post(self):
         response = self.client.post(
             self.listing_url(),
@@ -1147,6 +1533,21 @@ class WorkCreatorRelationshipAPITestCase(_BaseCollectionAPITestCase):
         }
         self.assertEqual(expected, response.data)
 
+    def test_dump_csv(self):
+        path = tempfile.mkdtemp()
+        try:
+            call_command(
+                'dump_collection_csv', path,
+                'works=icekit.api.test_collections.AllWorksCSVExport',
+                gzip=True, interactive=False, verbosity=0)
+            with gzip.open(os.path.join(path, 'works.csv.gz')) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(1, len(rows))
+            self.assertEqual(str(self.artwork.pk), rows[0]['id'])
+            self.assertEqual('Test Person', rows[0]['creators'])
+        finally:
+            shutil.rmtree(path)
+
     def test_get_workcreator_detail_with_get(self):
         response = self.client.get(
             self.detail_url(self.workcreator.pk))
@@ -1194,6 +1595,73 @@ class WorkCreatorRelationshipAPITestCase(_BaseCollectionAPITestCase):
         self.assertEqual(self.organization, new_workcreator.creator)
         self.assertEqual('funder', new_workcreator.role.slug)
 
+    def test_bulk_write_workcreators(self):
+        funder_role = {
+            'slug': 'funder',
+            'title': 'Funder',
+            'title_plural': 'Funders',
+            'past_tense': 'Funded',
+        }
+        response = self.client.post(
+            reverse('api:%s-bulk' % self.API_NAME),
+            [
+                {'id': self.workcreator.pk, 'is_primary': False},
+                {
+                    'work': {'id': self.artwork.pk},
+                    'creator': {'id': self.organization.pk},
+                    'role': funder_role,
+                },
+                {
+                    'work': {'id': self.artwork.pk},
+                    'creator': {'id': self.person.pk},
+                    'role': funder_role,
+                },
+                {
+                    'work': {'id': 0},
+                    'creator': {'id': self.person.pk},
+                },
+                {'id': 0},
+            ],
+        )
+        self.assertEqual(200, response.status_code)
+        results = response.data['results']
+        self.assertEqual(
+            [200, 201, 201, 400, 404], [r['status'] for r in results])
+        self.assertEqual(
+            [0, 1, 2, 3, 4], [r['index'] for r in results])
+        self.assertFalse(
+            WorkCreator.objects.get(pk=self.workcreator.pk).is_primary)
+        self.assertEqual(3, WorkCreator.objects.count())
+        # The new role is created once for both items referring to it
+        role = Role.objects.get(slug='funder')
+        self.assertEqual(
+            [role.pk, role.pk],
+            [WorkCreator.objects.get(pk=r['id']).role_id
+             for r in results[1:3]])
+
+    def test_bulk_write_rolls_back_failed_item(self):
+        response = self.client.post(
+            reverse('api:%s-bulk' % self.API_NAME),
+            [
+                {
+                    'work': {'id': 0},
+                    'creator': {'id': self.person.pk},
+                    'role': {
+                        'slug': 'patron',
+                        'title': 'Patron',
+                        'title_plural': 'Patrons',
+                        'past_tense': 'Supported',
+                    },
+                },
+            ],
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            [400], [r['status'] for r in response.data['results']])
+        # The role created for the failed item is rolled back with it
+        self.assertFalse(Role.objects.filter(slug='patron').exists())
+        self.assertEqual(1, WorkCreator.objects.count())
+
     def test_replace_workcreator_creator_with_put(self):
         self.assertEqual(self.person, self.workcreator.creator)
 
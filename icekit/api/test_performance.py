@@ -0,0 +1,125 @@
+"""
+Performance regression tests for the APIs, see
+`base_tests._BaseAPIPerformanceTestCase`.
+
+Run with ``ICEKIT_API_PERFORMANCE_REPORT=report.json`` to write measurements
+to a report for comparison with other releases.
+"""
+from django.apps import apps
+
+from django_dynamic_fixture import G
+from fluent_contents.plugins.rawhtml.models import RawHtmlItem
+
+from icekit import models
+from icekit.page_types.layout_page.models import LayoutPage
+from icekit.utils import fluent_contents
+
+from . import base_tests
+
+Artwork = apps.get_model('gk_collections_artwork.Artwork')
+Person = apps.get_model('gk_collections_person.PersonCreator')
+WorkCreator = apps.get_model(
+    'gk_collections_work_creator.WorkCreator')
+Role = apps.get_model(
+    'gk_collections_work_creator.Role')
+WorkImage = apps.get_model(
+    'gk_collections_work_creator.WorkImage')
+MediaCategory = apps.get_model('icekit.MediaCategory')
+
+
+class _BaseCollectionAPIPerformanceTestCase(
+        base_tests._BaseAPIPerformanceTestCase):
+    QUERY_BUDGET = 30
+
+    def seed_image(self):
+        image = G(
+            base_tests.Image,
+            title='Image %d' % self.get_unique_int(),
+            width=800,
+            height=600,
+        )
+        image.categories.add(G(
+            MediaCategory, name='Category %d' % self.get_unique_int()))
+        return image
+
+    def seed_artwork(self):
+        """
+        Create an artwork with a creator and an image, like most works in a
+        collection.
+        """
+        role, __ = Role.objects.get_or_create(
+            slug='artist',
+            defaults={
+                'title': 'Artist',
+                'title_plural': 'Artists',
+                'past_tense': 'Made',
+            },
+        )
+        artwork = Artwork.objects.create(
+            title='Artwork %d' % self.get_unique_int())
+        person = Person.objects.create(
+            name_full='Person %d' % self.get_unique_int())
+        WorkCreator.objects.create(work=artwork, creator=person, role=role)
+        WorkImage.objects.create(work=artwork, image=self.seed_image())
+        return artwork
+
+
+class ArtworkAPIPerformanceTestCase(_BaseCollectionAPIPerformanceTestCase):
+    API_NAME = 'artwork-api'
+
+    def seed(self, count):
+        return [self.seed_artwork() for __ in range(count)]
+
+
+class PersonAPIPerformanceTestCase(_BaseCollectionAPIPerformanceTestCase):
+    API_NAME = 'person-api'
+
+    def seed(self, count):
+        return [
+            self.seed_artwork().workcreator_set.get().creator
+            for __ in range(count)
+        ]
+
+
+class WorkCreatorAPIPerformanceTestCase(
+        _BaseCollectionAPIPerformanceTestCase):
+    API_NAME = 'workcreator-api'
+    QUERY_BUDGET = 20
+
+    def seed(self, count):
+        return [
+            self.seed_artwork().workcreator_set.get()
+            for __ in range(count)
+        ]
+
+
+class ImageAPIPerformanceTestCase(_BaseCollectionAPIPerformanceTestCase):
+    API_NAME = 'image-api'
+    QUERY_BUDGET = 10
+
+    def seed(self, count):
+        return [self.seed_image() for __ in range(count)]
+
+
+class PageAPIPerformanceTestCase(base_tests._BaseAPIPerformanceTestCase):
+    API_NAME = 'page-api'
+    API_IS_PUBLIC_READ = True
+    # Page content is rendered by content plugins, one page at a time
+    MAX_QUERIES_PER_ITEM = None
+
+    def seed(self, count):
+        layout = G(
+            models.Layout,
+            template_name='icekit/layouts/default.html',
+        )
+        pages = []
+        for __ in range(count):
+            page = LayoutPage.objects.create(
+                author=self.superuser,
+                title='Page %d' % self.get_unique_int(),
+                layout=layout,
+            )
+            fluent_contents.create_content_instance(
+                RawHtmlItem, page, html='<p>Content</p>')
+            pages.append(page.publish())
+        return pages
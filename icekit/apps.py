@@ -9,7 +9,7 @@ from django.apps import AppConfig, apps
 from django.conf import settings
 from django.core.management.color import no_style
 from django.db import connection
-from django.db.models.signals import post_migrate
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.utils.module_loading import autodiscover_modules
 
 
@@ -37,6 +37,39 @@ def update_site(sender, **kwargs):
             cursor.execute(command)
 
 
+def invalidate_sharedcontent_cache(sender, **kwargs):
+    """
+    Invalidate the cached slugs used by the `sharedcontent_exists` filter.
+    """
+    from icekit.templatetags.icekit_tags import SHAREDCONTENT_CACHE_NAMESPACE
+    from icekit.utils.cache import invalidate_namespace
+    invalidate_namespace(SHAREDCONTENT_CACHE_NAMESPACE)
+
+
+def invalidate_content_item_render_cache(sender, instance, **kwargs):
+    """
+    Invalidate output cached by `RenderCachePluginMixin` for content items
+    that are saved or deleted.
+    """
+    from django.core.cache import cache
+    from icekit.utils.fluent_contents import \
+        get_content_item_render_cache_key
+    cache.delete(get_content_item_render_cache_key(instance.pk))
+
+
+def warm_layout_placeholder_data():
+    """
+    Parse placeholder data for layout templates found in the
+    ``ICEKIT['LAYOUT_TEMPLATES']`` directories, without using the database.
+    """
+    from icekit.models import Layout
+    from icekit.plugins import FileSystemLayoutsPlugin
+    from icekit.utils.fluent_contents import warm_placeholder_data
+    plugin = FileSystemLayoutsPlugin(Layout._meta.get_field('template_name'))
+    warm_placeholder_data(
+        template_name for template_name, label in plugin.choices)
+
+
 class AppConfig(AppConfig):
     name = 'icekit'
 
@@ -55,6 +88,18 @@ class AppConfig(AppConfig):
 
         # Connect signal handlers.
         post_migrate.connect(update_site, sender=self)
+        from fluent_contents.models import ContentItem
+        from icekit.utils.cache import connect_invalidation
+        connect_invalidation(invalidate_content_item_render_cache, ContentItem)
+        if 'fluent_contents.plugins.sharedcontent' in settings.INSTALLED_APPS:
+            from fluent_contents.plugins.sharedcontent.models \
+                import SharedContent
+            post_save.connect(
+                invalidate_sharedcontent_cache, sender=SharedContent)
+            post_delete.connect(
+                invalidate_sharedcontent_cache, sender=SharedContent)
 
         # Import plugins from installed apps.
         autodiscover_modules('plugins')
+
+        warm_layout_placeholder_data()
@@ -10,3 +10,34 @@ FILE_CLASS = ICEKIT.get('FILE_CLASS', 'icekit_plugins_file.File')
 
 DASHBOARD_FEATURED_APPS = ICEKIT.get('DASHBOARD_FEATURED_APPS', ())
 DASHBOARD_SORTED_APPS = ICEKIT.get('DASHBOARD_SORTED_APPS', ())
+
+# Default timeout, in seconds, for values cached by `icekit.utils.cache`.
+CACHE_TIMEOUT = ICEKIT.get('CACHE_TIMEOUT', 60 * 60 * 24)
+
+# Cache rendered navigation HTML per navigation, active items and user
+# authentication state in the `render_navigation` template tag.
+NAVIGATION_CACHE_HTML = ICEKIT.get('NAVIGATION_CACHE_HTML', True)
+
+# Default number of items per page for `AbstractListingPage` listings, or
+# `None` to list all items on one page.
+LISTING_PAGE_SIZE = ICEKIT.get('LISTING_PAGE_SIZE', None)
+
+# Seconds to wait before updating a `ReadabilityMixin` object's readability
+# score after it is saved. Further saves in that time share the same update.
+READABILITY_DEBOUNCE = ICEKIT.get('READABILITY_DEBOUNCE', 10)
+
+# Seconds to cache serialised objects for `icekit.api.base_views.HTTPCacheMixin`
+# viewsets. Changes to related objects that do not modify the object itself
+# may not show until then.
+API_CACHE_TIMEOUT = ICEKIT.get('API_CACHE_TIMEOUT', 60 * 5)
+
+# Seconds that the end of an API change feed's default time window lags
+# behind the current time, so changes saved by transactions that commit after
+# the feed is read are picked up by the next sync.
+API_CHANGE_FEED_LAG = ICEKIT.get('API_CHANGE_FEED_LAG', 60)
+
+# Days to keep records of deleted objects for API change feeds, or `None` to
+# keep them forever, see the `prune_tombstones` management command. Change
+# feeds reject `since` times older than this, so clients do a full sync
+# instead of missing deletions.
+API_TOMBSTONE_RETENTION_DAYS = ICEKIT.get('API_TOMBSTONE_RETENTION_DAYS', 90)
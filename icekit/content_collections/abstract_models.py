@@ -5,15 +5,26 @@ try:
 except ImportError:
 	from urllib.parse import urljoin
 
-from django.core.exceptions import ValidationError
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.template.response import TemplateResponse
+from django.utils.translation import get_language
 
+from icekit import appsettings
+from icekit.publishing.middleware import is_draft_request_context
 from icekit.publishing.models import PublishingModel
+from icekit.utils.cache import get_or_set, get_timeout, make_key
 from polymorphic.models import PolymorphicModel
 
 from icekit.page_types.layout_page.abstract_models import AbstractLayoutPage
 from django.db import models
 
+from .listings import Listing, ListingResult
+
+LISTING_CACHE_NAMESPACE = 'listing'
+MOUNT_INDEX_CACHE_NAMESPACE = 'mount_index'
+
 
 class TitleSlugMixin(models.Model):
     # TODO: this should perhaps become part of a wider ICEkit mixin that covers
@@ -76,9 +87,81 @@ class AbstractListingPage(AbstractLayoutPage):
     A Page type that serves lists of things. Good for
     e.g. PressReleaseListingPage or ArticleCategoryPage.
     """
+    # Options for the `Listing` returned by `get_listing()`. See
+    # `icekit.content_collections.listings.Listing`.
+    listing_ordering = None
+    listing_page_size = appsettings.LISTING_PAGE_SIZE
+    listing_select_related = ()
+    listing_prefetch_related = ()
+    # The GET parameter holding the cursor for the current page.
+    listing_cursor_param = 'after'
+    # Seconds to cache the items on each page, or `None` to disable caching.
+    # Cached pages are invalidated when any item is published, unpublished
+    # or deleted, so only enable this for listings of publishable items.
+    # Draft previews are not cached.
+    listing_cache_timeout = None
+
     class Meta:
         abstract = True
 
+    def get_listing(self, request=None):
+        """
+        :return: a `Listing` of the items returned by `get_items_to_list()`.
+        """
+        return Listing(
+            self.get_items_to_list(request),
+            ordering=self.listing_ordering,
+            page_size=self.listing_page_size,
+            select_related=self.listing_select_related,
+            prefetch_related=self.listing_prefetch_related,
+        )
+
+    def get_listing_cache_key(self, request, cursor):
+        query = sorted(request.GET.lists()) if request else ()
+        return make_key(
+            LISTING_CACHE_NAMESPACE,
+            self.pk,
+            get_language(),
+            cursor,
+            query,
+        )
+
+    def get_listing_result(self, request=None):
+        """
+        :return: a `ListingResult` with the current page of items to list,
+        according to the cursor in the request.
+        """
+        cursor = request.GET.get(self.listing_cursor_param) \
+            if request else None
+        listing = self.get_listing(request)
+        # Draft saves don't invalidate cached pages, so previews are not cached
+        if self.listing_cache_timeout is None or not listing.is_queryset or \
+                is_draft_request_context():
+            return listing.paginate(cursor)
+
+        # Cache the PKs on the page, so the ordering and filtering is not
+        # repeated, but always load fresh items.
+        key = self.get_listing_cache_key(request, cursor)
+        pks, cursor, next_cursor = get_or_set(
+            key,
+            lambda: self._get_listing_result_pks(listing, cursor),
+            self.listing_cache_timeout,
+        )
+        items = listing.get_queryset().in_bulk(pks) if pks else {}
+        return ListingResult(
+            [items[pk] for pk in pks if pk in items],
+            cursor=cursor,
+            next_cursor=next_cursor,
+        )
+
+    def _get_listing_result_pks(self, listing, cursor):
+        result = listing.paginate(cursor)
+        return (
+            [item.pk for item in result.items],
+            result.cursor,
+            result.next_cursor,
+        )
+
     def get_items_to_list(self, request=None):
         """
         Get the items that will be show in this page's listing.
@@ -114,6 +197,43 @@ class AbstractListingPage(AbstractLayoutPage):
             "Please implement `get_items_to_mount(request)` on %r" % type(self)
         )
 
+    def get_mount_index_key(self, request, slug):
+        return make_key(
+            MOUNT_INDEX_CACHE_NAMESPACE,
+            self.pk,
+            slug,
+            is_draft_request_context(),
+        )
+
+    def get_item_to_mount(self, request, slug):
+        """
+        Get the item mounted at ``slug`` under this page's path.
+
+        The content type and PK of each item found is recorded in a cached
+        index, so subsequent requests load it by PK with one query instead of
+        repeating `get_items_to_mount()`. The index is invalidated when
+        collected content is saved, deleted, published or unpublished, see
+        `icekit.content_collections.apps`.
+
+        :return: the item
+        :raises ObjectDoesNotExist: if there is no such item
+        """
+        key = self.get_mount_index_key(request, slug)
+        indexed = cache.get(key)
+        if indexed is not None:
+            content_type_id, pk = indexed
+            try:
+                return ContentType.objects.get_for_id(content_type_id) \
+                    .get_object_for_this_type(pk=pk)
+            except ObjectDoesNotExist:
+                pass
+
+        item = self.get_items_to_mount(request).get(slug=slug)
+        content_type = ContentType.objects.get_for_model(
+            type(item), for_concrete_model=False)
+        cache.set(key, (content_type.pk, item.pk), get_timeout())
+        return item
+
 
 class AbstractCollectedContent(ListableMixin):
     """
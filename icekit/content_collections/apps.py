@@ -1,5 +1,53 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+def invalidate_listing_cache(sender, instance, **kwargs):
+    """
+    Invalidate pages of listings cached by `AbstractListingPage` when
+    publishable items are published, unpublished or deleted.
+    """
+    from icekit.utils.cache import invalidate_namespace
+    from .abstract_models import LISTING_CACHE_NAMESPACE
+    invalidate_namespace(LISTING_CACHE_NAMESPACE)
+
+
+def invalidate_mount_index(sender, instance, **kwargs):
+    """
+    Invalidate the index of items mounted under listing pages, used by
+    `AbstractListingPage.get_item_to_mount`, when collected content is saved,
+    deleted, published or unpublished.
+    """
+    from icekit.utils.cache import invalidate_namespace
+    from .abstract_models import MOUNT_INDEX_CACHE_NAMESPACE
+    invalidate_namespace(MOUNT_INDEX_CACHE_NAMESPACE)
+
 
 class AppConfig(AppConfig):
     name = '.'.join(__name__.split('.')[:-1])
     label = "icekit_content_collections"
+
+    def ready(self):
+        from icekit.publishing import signals as publishing_signals
+        from icekit.publishing.models import PublishingModel
+        from icekit.utils.cache import connect_invalidation
+        from .abstract_models import AbstractCollectedContent
+        connect_invalidation(
+            invalidate_listing_cache,
+            PublishingModel,
+            signals=(
+                post_delete,
+                publishing_signals.publishing_post_publish,
+                publishing_signals.publishing_post_unpublish,
+            ),
+        )
+        connect_invalidation(
+            invalidate_mount_index,
+            AbstractCollectedContent,
+            signals=(
+                post_save,
+                post_delete,
+                publishing_signals.publishing_post_publish,
+                publishing_signals.publishing_post_unpublish,
+            ),
+        )
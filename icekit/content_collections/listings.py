@@ -0,0 +1,276 @@
+"""
+A listing engine for `AbstractListingPage` and similar views, which fetches
+one page of items at a time using keyset (or "seek") pagination.
+
+Instead of an offset, which makes the database count past every previous
+item, each page is identified by a cursor holding the ordering values of the
+last item on the previous page, so every page is fetched with an indexable
+``WHERE`` clause and a ``LIMIT``.
+"""
+import base64
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Model, Q
+from django.db.models.query import QuerySet
+from django.utils import six
+from django.utils.encoding import force_bytes, force_text
+
+
+def _encode_value(value):
+    if isinstance(value, Model):
+        # Ordering by a relation uses the related model's ordering, which
+        # cannot be compared with a single value.
+        return None
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        # Keep microseconds, unlike `DjangoJSONEncoder`, so cursors are exact
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return force_text(value)
+    return value
+
+
+def encode_cursor(data):
+    """
+    Return an opaque, URL-safe string for cursor ``data``.
+    """
+    return force_text(base64.urlsafe_b64encode(
+        force_bytes(json.dumps(data, separators=(',', ':'))))).rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Return the data for a cursor from `encode_cursor`, or `None` if it is
+    invalid.
+    """
+    if not cursor:
+        return None
+    try:
+        cursor = force_bytes(cursor)
+        data = json.loads(force_text(
+            base64.urlsafe_b64decode(cursor + b'=' * (-len(cursor) % 4))))
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(data, dict) or \
+            not isinstance(data.get('o'), int) or data['o'] < 0:
+        return None
+    return data
+
+
+class ListingResult(object):
+    """
+    A page of items from a `Listing`.
+
+    ``next_cursor`` is `None` on the last page. ``cursor`` is the cursor used
+    to fetch this page, which is `None` on the first page.
+    """
+    def __init__(self, items, cursor=None, next_cursor=None):
+        self.items = items
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.cursor is not None
+
+
+class Listing(object):
+    """
+    Paginate a queryset (or a list) of items with keyset pagination.
+
+    :param items: A queryset, or a list of items in listing order. Lists are
+    paginated by offset.
+    :param ordering: Field names to order by, as for `QuerySet.order_by()`.
+    Defaults to the queryset's ordering. A ``pk`` tie-breaker is added if
+    necessary so the order is total. Pages after an item with a null value
+    for an ordering field, or ordered by a relation, fall back to an offset.
+    Querysets ordered with ``extra(order_by=...)``, like `published()`
+    querysets in the order of their drafts, keep that ordering and are
+    paginated by offset unless ``ordering`` is given.
+    :param page_size: The maximum number of items per page, or `None` to list
+    all items on one page.
+    :param select_related: Relations to pass to `QuerySet.select_related()`.
+    :param prefetch_related: Lookups to pass to `QuerySet.prefetch_related()`.
+
+    Polymorphic querysets fetch each page with one query for the base model
+    plus one query per child model on the page.
+    """
+    def __init__(self, items, ordering=None, page_size=None,
+                 select_related=(), prefetch_related=()):
+        self.items = items
+        self.ordering = ordering
+        self.page_size = page_size
+        self.select_related = select_related
+        self.prefetch_related = prefetch_related
+
+    @property
+    def is_queryset(self):
+        return isinstance(self.items, QuerySet)
+
+    @property
+    def is_keyset(self):
+        return self.is_queryset and not (
+            self.ordering is None and self.items.query.extra_order_by)
+
+    def get_ordering(self):
+        """
+        Return the ordering field names, ending with a ``pk`` tie-breaker.
+        """
+        ordering = list(
+            self.ordering or
+            self.items.query.order_by or
+            self.items.model._meta.ordering or
+            ()
+        )
+        pk_names = ('pk', self.items.model._meta.pk.name)
+        if not any(name.lstrip('-') in pk_names for name in ordering):
+            descending = ordering and ordering[-1].startswith('-')
+            ordering.append('-pk' if descending else 'pk')
+        return ordering
+
+    def get_queryset(self):
+        queryset = self.items
+        if self.is_keyset:
+            queryset = queryset.order_by(*self.get_ordering())
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+    def get_ordering_values(self, item):
+        values = []
+        for name in self.get_ordering():
+            value = item
+            for attname in name.lstrip('-').split('__'):
+                value = getattr(value, attname)
+                if value is None:
+                    break
+            values.append(_encode_value(value))
+        return values
+
+    def get_ordering_field(self, name):
+        """
+        Return the model field for ordering field ``name``, following
+        relations, or `None` if it is not a model field.
+        """
+        model = self.items.model
+        field = None
+        for attname in name.lstrip('-').split('__'):
+            if model is None:
+                return None
+            if attname == 'pk':
+                field = model._meta.pk
+            else:
+                try:
+                    field = model._meta.get_field(attname)
+                except FieldDoesNotExist:
+                    return None
+            model = field.related_model
+        return field if field.concrete else None
+
+    def to_python_values(self, values):
+        """
+        Return cursor ``values`` converted to the Python values of their
+        ordering fields, or `None` if they are invalid, for example in a
+        forged cursor.
+        """
+        ordering = self.get_ordering()
+        if not isinstance(values, list) or len(values) != len(ordering):
+            return None
+        python_values = []
+        for name, value in zip(ordering, values):
+            field = self.get_ordering_field(name)
+            if field is None:
+                # Values for other orderings, like annotations, are passed on
+                # if they are plain JSON values
+                if not isinstance(
+                        value, (bool, int, float) + six.string_types):
+                    return None
+                python_values.append(value)
+                continue
+            if value is None or isinstance(value, (list, dict)):
+                return None
+            try:
+                python_values.append(field.to_python(value))
+            except (ValidationError, TypeError, ValueError):
+                return None
+        return python_values
+
+    def filter_after(self, queryset, values):
+        """
+        Filter ``queryset`` to items after the item with ordering ``values``.
+        """
+        clauses = []
+        for i, name in enumerate(self.get_ordering()):
+            field_name = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            clause = dict(
+                (prior.lstrip('-'), value)
+                for prior, value in zip(self.get_ordering()[:i], values))
+            clause['%s__%s' % (field_name, lookup)] = values[i]
+            clauses.append(Q(**clause))
+        return queryset.filter(reduce(or_, clauses))
+
+    def paginate(self, cursor=None):
+        """
+        Return a `ListingResult` for the page after ``cursor``, or the first
+        page if the cursor is `None` or invalid.
+        """
+        data = decode_cursor(cursor)
+        values = None
+        if data is not None and self.is_keyset and 'v' in data:
+            values = self.to_python_values(data['v'])
+            if values is None:
+                data = None
+        if data is None:
+            cursor = None
+            offset = 0
+        else:
+            offset = data['o']
+
+        if not self.is_queryset:
+            items = list(self.items)
+            stop = offset + self.page_size if self.page_size else None
+            page_items = items[offset:stop]
+            has_next = stop is not None and stop < len(items)
+        else:
+            queryset = self.get_queryset()
+            if values:
+                queryset = self.filter_after(queryset, values)
+            elif offset:
+                queryset = queryset[offset:]
+            if self.page_size:
+                # Fetch one more item than needed to tell if there's a next
+                # page without a separate count query.
+                page_items = list(queryset[:self.page_size + 1])
+                has_next = len(page_items) > self.page_size
+                page_items = page_items[:self.page_size]
+            else:
+                page_items = list(queryset)
+                has_next = False
+
+        next_cursor = None
+        if has_next:
+            next_data = {'o': offset + len(page_items)}
+            if self.is_keyset:
+                values = self.get_ordering_values(page_items[-1])
+                if None not in values:
+                    next_data['v'] = values
+            next_cursor = encode_cursor(next_data)
+        return ListingResult(page_items, cursor=cursor, next_cursor=next_cursor)
@@ -11,10 +11,16 @@ class ListingPagePlugin(ICEkitFluentContentsPagePlugin):
     model_admin = LayoutPageAdmin
 
     def get_context(self, request, page, **kwargs):
-        """ Include in context items to be visible on listing page """
+        """
+        Include in context the current page of items to be visible on the
+        listing page, and the `ListingResult` for pagination.
+        """
         context = super(ListingPagePlugin, self).get_context(
             request, page, **kwargs)
-        context['items_to_list'] = page.get_items_to_list(request)
+        listing = page.get_listing_result(request)
+        context['listing'] = listing
+        context['listing_cursor_param'] = page.listing_cursor_param
+        context['items_to_list'] = listing.items
         return context
 
     def get_view_response(self, request, page, view_func, view_args, view_kwargs):
@@ -26,8 +32,9 @@ class ListingPagePlugin(ICEkitFluentContentsPagePlugin):
 
     def collected_content_view(request, parent, slug):
         try:
-            # using .visible() here to acknowledge IS_DRAFT context.
-            page = parent.get_items_to_mount(request).get(slug=slug)
+            # `get_items_to_mount` uses .visible() to acknowledge IS_DRAFT
+            # context.
+            page = parent.get_item_to_mount(request, slug)
         except ObjectDoesNotExist:
             raise Http404
 
@@ -1,10 +1,16 @@
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
 from django.http.request import HttpRequest
 from django_webtest import WebTest
+from mock import patch
 
+from icekit.publishing.managers import _order_by_pks
+from icekit.publishing.middleware import override_draft_request_context
 from icekit.tests.models import Article, ArticleListing
 from icekit.models import Layout
 
+from .listings import Listing, encode_cursor
+
 User = get_user_model()
 
 
@@ -181,3 +187,153 @@ class TestContentCollections(WebTest):
         self.article.unpublish()
         self.article_2.unpublish()
         self.listing.unpublish()
+
+    def test_listing_pagination(self):
+        articles = [self.article] + [
+            Article.objects.create(
+                parent=self.listing,
+                title='Article Test %d' % i,
+                slug='article-test-%d' % i,
+            )
+            for i in range(3)
+        ]
+        listing = Listing(
+            Article.objects.filter(parent=self.listing),
+            ordering=('-title',),
+            page_size=3,
+        )
+        result = listing.paginate()
+        self.assertFalse(result.has_previous)
+        self.assertTrue(result.has_next)
+        self.assertEqual(
+            [a.title for a in result],
+            ['Article Test 2', 'Article Test 1', 'Article Test 0'])
+
+        with self.assertNumQueries(1):
+            result = listing.paginate(result.next_cursor)
+        self.assertTrue(result.has_previous)
+        self.assertFalse(result.has_next)
+        self.assertEqual(list(result), [self.article])
+
+        # Invalid cursors return the first page
+        self.assertEqual(len(listing.paginate('invalid')), 3)
+        # Including forged cursors with values that are not valid for the
+        # ordering fields
+        for values in (
+                ['Article Test 2', 'not a pk'],
+                ['Article Test 2', {'pk': 1}],
+                ['Article Test 2', None],
+                ['Article Test 2'],
+                'Article Test 2',
+        ):
+            result = listing.paginate(encode_cursor({'o': 3, 'v': values}))
+            self.assertFalse(result.has_previous)
+            self.assertEqual(
+                [a.title for a in result],
+                ['Article Test 2', 'Article Test 1', 'Article Test 0'])
+
+        # Lists are paginated by offset
+        listing = Listing(articles, page_size=3)
+        result = listing.paginate()
+        self.assertEqual(list(result), articles[:3])
+        self.assertEqual(list(listing.paginate(result.next_cursor)),
+                         articles[3:])
+
+    def test_listing_keeps_extra_ordering(self):
+        articles = [self.article] + [
+            Article.objects.create(
+                parent=self.listing,
+                title='Article Test %d' % i,
+                slug='article-test-%d' % i,
+            )
+            for i in range(3)
+        ]
+        # Like a `published()` queryset in the order of its drafts
+        articles.reverse()
+        listing = Listing(
+            _order_by_pks(Article.objects.all(), [a.pk for a in articles]),
+            page_size=3,
+        )
+        result = listing.paginate()
+        self.assertEqual(list(result), articles[:3])
+        self.assertEqual(list(listing.paginate(result.next_cursor)),
+                         articles[3:])
+
+    def test_listing_result_cache(self):
+        self.listing.listing_cache_timeout = 60
+        self.article.publish()
+        req = HttpRequest()
+        self.assertEqual(
+            list(self.listing.get_listing_result(req)),
+            [self.article.get_published()])
+        self.article_3 = Article.objects.create(
+            parent=self.listing,
+            title='Article Test 3',
+            slug="article-test-3",
+        )
+        self.article_3.publish()
+        self.assertEqual(
+            len(self.listing.get_listing_result(req)), 2)
+        # Draft previews are not cached, as draft saves don't invalidate them
+        with override_draft_request_context(True), patch(
+                'icekit.content_collections.abstract_models.get_or_set',
+                side_effect=AssertionError('Cached draft preview')):
+            self.assertEqual(
+                len(self.listing.get_listing_result(req)), 2)
+        self.article.unpublish()
+        self.article_3.unpublish()
+
+    def test_get_item_to_mount(self):
+        self.article.publish()
+        req = HttpRequest()
+        published = self.article.get_published()
+        self.assertEqual(
+            self.listing.get_item_to_mount(req, 'article-test'), published)
+        # The indexed item is loaded without `get_items_to_mount()`
+        with patch.object(
+                ArticleListing, 'get_items_to_mount',
+                side_effect=AssertionError('Not indexed')):
+            self.assertEqual(
+                self.listing.get_item_to_mount(req, 'article-test'),
+                published)
+        self.assertRaises(
+            ObjectDoesNotExist,
+            self.listing_2.get_item_to_mount, req, 'article-test')
+
+        self.article.slug = 'article-test-renamed'
+        self.article.save()
+        self.article.publish()
+        self.assertRaises(
+            ObjectDoesNotExist,
+            self.listing.get_item_to_mount, req, 'article-test')
+        self.assertEqual(
+            self.listing.get_item_to_mount(req, 'article-test-renamed'),
+            self.article.get_published())
+        # Indexed items that are no longer visible are not mounted
+        self.article.unpublish()
+        self.assertRaises(
+            ObjectDoesNotExist,
+            self.listing.get_item_to_mount, req, 'article-test-renamed')
+
+    def test_get_item_to_mount_index_is_invalidated(self):
+        req = HttpRequest()
+        self.assertRaises(
+            ObjectDoesNotExist,
+            self.listing.get_item_to_mount, req, 'article-test')
+        # Publishing an item invalidates the index
+        self.article.publish()
+        self.assertEqual(
+            self.listing.get_item_to_mount(req, 'article-test'),
+            self.article.get_published())
+        # Moving an item to another listing invalidates the index
+        self.article.unpublish()
+        self.article.parent = self.listing_2
+        self.article.save()
+        self.article.publish()
+        self.assertRaises(
+            ObjectDoesNotExist,
+            self.listing.get_item_to_mount, req, 'article-test')
+        self.assertEqual(
+            self.listing_2.get_item_to_mount(req, 'article-test'),
+            self.article.get_published())
+        self.article.unpublish()
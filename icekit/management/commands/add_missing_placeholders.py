@@ -1,21 +1,69 @@
+from optparse import make_option
+
 from django.apps import apps
-from django.core.management.base import NoArgsCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.utils.encoding import force_text
-from icekit.mixins import FluentFieldsMixin
 
 
-class Command(NoArgsCommand):
+class Command(BaseCommand):
+    args = '[app_label[.ModelName] ...]'
     help = ('Add missing placeholders from templates to database. See: '
             'https://github.com/edoburu/django-fluent-contents/pull/63')
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '-n', '--dry-run', action='store_true', dest='dry-run',
+            default=False,
+            help="Only count missing placeholders, don't create them.",
+        ),
+        make_option(
+            '--batch-size', dest='batch-size', type='int', default=1000,
+            help='Number of placeholders to create in each transaction.',
+        ),
+        make_option(
+            '--per-object', action='store_true', dest='per-object',
+            default=False,
+            help='Check and create placeholders one object at a time.',
+        ),
+    )
+
+    def get_models(self, labels):
+        """
+        Return models with placeholders, optionally limited to the given
+        ``app_label`` or ``app_label.ModelName`` labels.
+        """
+        models = [
+            model for model in apps.get_models()
+            if hasattr(model, 'add_missing_placeholders')
+            and not model._meta.proxy
+        ]
+        if not labels:
+            return models
+        selected = []
+        for label in labels:
+            try:
+                if '.' in label:
+                    selected.append(apps.get_model(label))
+                else:
+                    app_models = apps.get_app_config(label).get_models()
+                    selected.extend(
+                        model for model in app_models if model in models)
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+        return [model for model in models if model in selected]
 
-    def handle_noargs(self, *args, **options):
+    def handle(self, *labels, **options):
         verbosity = int(options.get('verbosity'))
-        for model in apps.get_models():
-            if hasattr(model, 'add_missing_placeholders'):
+        dry_run = options.get('dry-run')
+        if dry_run and options.get('per-object'):
+            raise CommandError('--dry-run cannot be used with --per-object.')
+        for model in self.get_models(labels):
+            name = force_text(model._meta.verbose_name_plural).title()
+            if options.get('per-object') or \
+                    not hasattr(model, 'bulk_add_missing_placeholders'):
                 if verbosity:
                     self.stdout.write('Adding placeholders for %s "%s"...' % (
                         model.objects.count(),
-                        force_text(model._meta.verbose_name_plural).title(),
+                        name,
                     ))
                 ok = updated = 0
                 for obj in model.objects.all():
@@ -25,3 +73,11 @@ class Command(NoArgsCommand):
                         ok += 1
                 if verbosity:
                     self.stdout.write('%s updated, %s OK' % (updated, ok))
+            else:
+                count = model.bulk_add_missing_placeholders(
+                    dry_run=dry_run, batch_size=options.get('batch-size'))
+                if verbosity:
+                    self.stdout.write('%s "%s" placeholders %s' % (
+                        count, name,
+                        'missing' if dry_run else 'added',
+                    ))
@@ -1,11 +1,16 @@
 from urlparse import urljoin
 
+from hashlib import md5
+
 from django.conf import settings
+from django.core.cache import cache
+from django.utils.encoding import force_bytes
+from icekit import appsettings
 from icekit.admin_tools.utils import admin_url
 from icekit.utils.attributes import first_of
 from unidecode import unidecode
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.contenttypes.models import ContentType
 from django.template.defaultfilters import striptags
 from django.utils.translation import ugettext_lazy as _
@@ -15,8 +20,11 @@ from fluent_contents.models import \
 from fluent_contents.rendering import render_content_items
 
 from icekit.tasks import store_readability_score
+from icekit.utils.cache import get_timeout, make_key
 from icekit.utils.readability.readability import Readability
 
+READABILITY_CACHE_NAMESPACE = 'readability'
+
 
 
 class LayoutFieldMixin(models.Model):
@@ -68,6 +76,65 @@ class LayoutFieldMixin(models.Model):
                 result = result or created
         return result
 
+    @classmethod
+    def bulk_add_missing_placeholders(
+            cls, queryset=None, dry_run=False, batch_size=1000):
+        """
+        Add missing placeholders from templates for all objects in
+        ``queryset`` (default: all objects of this model), like
+        `add_missing_placeholders` but with a few queries per layout slot
+        instead of one per object and slot. Missing placeholders are created
+        with `bulk_create`, in a transaction for each batch.
+
+        Return the number of placeholders created, or that would be created
+        if ``dry_run`` is `True`.
+        """
+        content_type = ContentType.objects.get_for_model(cls)
+        if queryset is None:
+            queryset = cls._base_manager.all()
+        if hasattr(queryset, 'non_polymorphic'):
+            # Objects of child models are handled with their own content type
+            queryset = queryset.non_polymorphic()
+        if any(f.name == 'polymorphic_ctype' for f in cls._meta.fields):
+            queryset = queryset.filter(polymorphic_ctype_id=ContentType.objects
+                                       .get_for_model(cls, False).pk)
+        queryset = queryset.order_by()
+
+        layout_model = cls._meta.get_field('layout').rel.to
+        layouts = layout_model.objects.filter(
+            pk__in=queryset.exclude(layout=None).values('layout_id'))
+
+        count = 0
+        for layout in layouts:
+            objects = queryset.filter(layout=layout)
+            for data in layout.get_placeholder_data():
+                placeholders = Placeholder.objects.filter(
+                    parent_type=content_type, slot=data.slot)
+                missing_ids = list(objects
+                    .exclude(pk__in=placeholders.values('parent_id'))
+                    .values_list('pk', flat=True))
+                count += len(missing_ids)
+                if dry_run:
+                    continue
+                # Update existing placeholders, as `add_missing_placeholders`
+                placeholders \
+                    .filter(parent_id__in=objects.values('pk')) \
+                    .exclude(role=data.role, title=data.title) \
+                    .update(role=data.role, title=data.title)
+                for i in range(0, len(missing_ids), batch_size):
+                    with transaction.atomic():
+                        Placeholder.objects.bulk_create([
+                            Placeholder(
+                                parent_type=content_type,
+                                parent_id=pk,
+                                slot=data.slot,
+                                role=data.role,
+                                title=data.title,
+                            )
+                            for pk in missing_ids[i:i + batch_size]
+                        ])
+        return count
+
 
 class FluentFieldsMixin(LayoutFieldMixin):
     """
@@ -105,15 +172,56 @@ class ReadabilityMixin(models.Model):
             request=None, items=self.contentitem_set.all())
         return striptags(html)
 
-    def calculate_readability_score(self):
+    def calculate_readability_score(self, text=None):
         try:
-            return Readability(unidecode(self.extract_text())).SMOGIndex()
+            if text is None:
+                text = unidecode(self.extract_text())
+            return Readability(text).SMOGIndex()
         except:
             return None
 
+    def get_readability_cache_key(self, name):
+        return make_key(
+            READABILITY_CACHE_NAMESPACE,
+            self._meta.app_label,
+            self._meta.model_name,
+            self.pk,
+            name,
+        )
+
+    def update_readability_score(self):
+        """
+        Calculate and save the readability score, unless the extracted text
+        is unchanged since it was last calculated. Return True if the score
+        was calculated.
+        """
+        text = unidecode(self.extract_text())
+        text_hash = md5(force_bytes(text)).hexdigest()
+        hash_key = self.get_readability_cache_key('text_hash')
+        if self.readability_score is not None and \
+                cache.get(hash_key) == text_hash:
+            return False
+        self.readability_score = self.calculate_readability_score(text)
+        # avoid calling save() recursively
+        type(self).objects.filter(pk=self.pk) \
+            .update(readability_score=self.readability_score)
+        cache.set(hash_key, text_hash, get_timeout())
+        return True
+
     def store_readability_score(self):
-        store_readability_score.delay(
-            self._meta.app_label, self._meta.model_name, self.pk)
+        """
+        Queue a task to update the readability score. Saves within
+        ``ICEKIT['READABILITY_DEBOUNCE']`` seconds of a queued task are
+        coalesced into it, since the task reads the latest content.
+        """
+        args = (self._meta.app_label, self._meta.model_name, self.pk)
+        debounce = appsettings.READABILITY_DEBOUNCE
+        if not debounce or not hasattr(store_readability_score, 'apply_async'):
+            store_readability_score.delay(*args)
+        elif cache.add(
+                self.get_readability_cache_key('pending'), True,
+                debounce * 10):
+            store_readability_score.apply_async(args, countdown=debounce)
 
     def save(self, *args, **kwargs):
         r = super(ReadabilityMixin, self).save(*args, **kwargs)
@@ -6,6 +6,138 @@ from django.utils.six import text_type, python_2_unicode_compatible
 from fluent_contents.models import PlaceholderField, ContentItem
 from icekit.fields import ICEkitURLField
 from icekit.plugins import descriptors
+from icekit.utils.cache import get_or_set, make_key
+
+# Cache namespace for compiled navigations and their rendered HTML
+NAVIGATION_CACHE_NAMESPACE = 'navigation'
+
+
+def is_user_authenticated(user):
+    is_authenticated = user.is_authenticated
+    if callable(is_authenticated):
+        is_authenticated = is_authenticated()
+    return bool(is_authenticated)
+
+
+def _get_defining_class(cls, name):
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return klass
+    return None
+
+
+def get_active_url_rules(item):
+    """
+    Return the item's ``get_active_url_rules()``, or `None` if the item is
+    dynamic: it has no rules, or a subclass overrides
+    ``is_active_for_request()`` without also providing matching rules.
+    """
+    rules_class = _get_defining_class(type(item), 'get_active_url_rules')
+    if rules_class is None:
+        return None
+    check_class = _get_defining_class(type(item), 'is_active_for_request')
+    if check_class is not None and check_class is not rules_class \
+            and issubclass(check_class, rules_class):
+        return None
+    return item.get_active_url_rules()
+
+
+def get_compiled_cache_key(navigation_id):
+    return make_key(NAVIGATION_CACHE_NAMESPACE, 'compiled', navigation_id)
+
+
+class CompiledNavigation(object):
+    """
+    A compact representation of a navigation and its items that is cheap to
+    cache, and can find the items active for a request without loading them.
+
+    Items that provide ``get_active_url_rules()`` are compiled into a trie of
+    URL characters, so matching a request path against all items walks the
+    path once. Items with only an ``is_active_for_request()`` method, or that
+    override it without overriding ``get_active_url_rules()``, are "dynamic"
+    and must be loaded and checked individually.
+    """
+    __slots__ = (
+        'navigation_id', 'slug', 'url_trie', 'dynamic_item_ids',
+        'varies_by_user',
+    )
+
+    def __init__(self, navigation, items):
+        self.navigation_id = navigation.pk
+        self.slug = navigation.slug
+        # Trie nodes are dicts keyed by URL character, with rules for URLs
+        # ending at a node stored under the `None` key.
+        self.url_trie = {}
+        dynamic_item_ids = []
+        varies_by_user = False
+        for item in items:
+            varies_by_user = varies_by_user or getattr(
+                item, 'navigation_varies_by_user', False)
+            rules = get_active_url_rules(item)
+            if rules is not None:
+                for url, exact, is_authenticated in rules:
+                    node = self.url_trie
+                    for char in text_type(url):
+                        node = node.setdefault(char, {})
+                    node.setdefault(None, []).append(
+                        (item.pk, exact, is_authenticated))
+            elif hasattr(item, 'is_active_for_request'):
+                dynamic_item_ids.append(item.pk)
+        self.dynamic_item_ids = frozenset(dynamic_item_ids)
+        self.varies_by_user = varies_by_user
+
+    def __getstate__(self):
+        return dict((name, getattr(self, name)) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def get_active_item_ids(self, request):
+        """
+        Return the set of IDs of non-dynamic items active for the request.
+        """
+        is_authenticated = is_user_authenticated(request.user)
+        path = request.path
+        active_ids = set()
+
+        def collect(node, at_end):
+            for item_id, exact, rule_is_authenticated in node.get(None, ()):
+                if exact and not at_end:
+                    continue
+                if rule_is_authenticated is not None \
+                        and rule_is_authenticated != is_authenticated:
+                    continue
+                active_ids.add(item_id)
+
+        node = self.url_trie
+        collect(node, not path)
+        for i, char in enumerate(path):
+            node = node.get(char)
+            if node is None:
+                break
+            collect(node, i == len(path) - 1)
+        return active_ids
+
+    def get_html_cache_key(self, request, *extra_parts):
+        """
+        Return a cache key for HTML rendered for this navigation and request,
+        or `None` if the rendered HTML cannot be cached. ``extra_parts`` are
+        other values the rendered HTML depends on.
+        """
+        if self.dynamic_item_ids:
+            return None
+        parts = [
+            'html',
+            self.navigation_id,
+            ','.join(map(text_type, sorted(
+                self.get_active_item_ids(request)))),
+            is_user_authenticated(request.user),
+        ]
+        parts.extend(extra_parts)
+        if self.varies_by_user:
+            parts.append(getattr(request.user, 'pk', None))
+        return make_key(NAVIGATION_CACHE_NAMESPACE, *parts)
 
 
 @python_2_unicode_compatible
@@ -26,15 +158,42 @@ class AbstractNavigation(models.Model):
     def set_request(self, request):
         self.request = request
 
+    @cached_property
+    def navigation_items(self):
+        return list(self.slots.navigation_content)
+
+    def compile(self):
+        return CompiledNavigation(self, self.navigation_items)
+
+    @cached_property
+    def compiled(self):
+        """
+        Return the `CompiledNavigation` for this navigation from the cache,
+        compiling it if necessary.
+        """
+        return get_or_set(get_compiled_cache_key(self.pk), self.compile)
+
+    @classmethod
+    def get_compiled(cls, pk):
+        """
+        Return the `CompiledNavigation` for the navigation with the given
+        ``pk`` from the cache, loading and compiling it if necessary.
+        """
+        return get_or_set(
+            get_compiled_cache_key(pk),
+            lambda: cls.objects.get(pk=pk).compile())
+
     @cached_property
     def active_items(self):
         if not self.request:
             raise Exception('`active_items` requires access to a request object. Call `.set_request(...)`')
 
+        compiled = self.compiled
+        active_ids = compiled.get_active_item_ids(self.request)
         active_items = []
-        for item in self.slots.navigation_content:
-            if (
-                hasattr(item, 'is_active_for_request') and
+        for item in self.navigation_items:
+            if item.pk in active_ids or (
+                item.pk in compiled.dynamic_item_ids and
                 item.is_active_for_request(self.request)
             ):
                 active_items.append(item)
@@ -64,9 +223,20 @@ class AbstractNavigationItem(ContentItem):
         # Note that `startswith` has an implicit equality check as well as substring matching
         return request.path.startswith(url)
 
+    def get_active_url_rules(self):
+        """
+        Return a list of `(url, exact, is_authenticated)` rules that are
+        equivalent to `is_active_for_request`, for `CompiledNavigation`.
+        An `is_authenticated` value of `None` matches any user.
+        """
+        return [(text_type(self.get_absolute_url()), False, None)]
+
 
 @python_2_unicode_compatible
 class AbstractAccountsNavigationItem(ContentItem):
+    # Rendered with the user's name
+    navigation_varies_by_user = True
+
     class Meta:
         abstract = True
         verbose_name = _('Accounts Navigation Item')
@@ -86,3 +256,9 @@ class AbstractAccountsNavigationItem(ContentItem):
         else:
             return request.path == self.get_login_url()
 
+    def get_active_url_rules(self):
+        return [
+            (self.get_logout_url(), True, True),
+            (self.get_login_url(), True, False),
+        ]
+
@@ -5,3 +5,15 @@ class AppConfig(AppConfig):
     name = '.'.join(__name__.split('.')[:-1])
     label = 'icekit_navigation'
     verbose_name = 'Navigation'
+
+    def ready(self):
+        from fluent_contents.models import ContentItem, Placeholder
+        from fluent_pages.models import UrlNode
+        from icekit.utils.cache import connect_invalidation
+        from .abstract_models import AbstractNavigation
+        from .models import invalidate_navigation_cache, \
+            invalidate_navigation_content_cache
+        connect_invalidation(
+            invalidate_navigation_cache, (AbstractNavigation, UrlNode))
+        connect_invalidation(
+            invalidate_navigation_content_cache, (ContentItem, Placeholder))
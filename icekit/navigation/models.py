@@ -1,6 +1,10 @@
+from django.contrib.contenttypes.models import ContentType
+
 from icekit.navigation.abstract_models import (
-    AbstractNavigation, AbstractNavigationItem, AbstractAccountsNavigationItem
+    AbstractNavigation, AbstractNavigationItem, AbstractAccountsNavigationItem,
+    NAVIGATION_CACHE_NAMESPACE,
 )
+from icekit.utils.cache import invalidate_namespace
 
 
 class Navigation(AbstractNavigation):
@@ -13,3 +17,22 @@ class NavigationItem(AbstractNavigationItem):
 
 class AccountsNavigationItem(AbstractAccountsNavigationItem):
     pass
+
+
+def invalidate_navigation_cache(sender, **kwargs):
+    """
+    Invalidate compiled navigations and their rendered HTML when navigations
+    change. Page changes are included since navigation item URLs can refer to
+    pages.
+    """
+    invalidate_namespace(NAVIGATION_CACHE_NAMESPACE)
+
+
+def invalidate_navigation_content_cache(sender, instance, **kwargs):
+    """
+    Invalidate compiled navigations and their rendered HTML when content items
+    or placeholders of navigations change.
+    """
+    if instance.parent_type_id == ContentType.objects.get_for_model(
+            Navigation).pk:
+        invalidate_namespace(NAVIGATION_CACHE_NAMESPACE)
@@ -6,6 +6,7 @@ from django.test.client import RequestFactory
 from django.template import engines
 from any_urlfield.models import AnyUrlValue
 from fluent_contents.models import Placeholder
+from icekit.navigation.abstract_models import get_active_url_rules
 from icekit.navigation.models import Navigation, NavigationItem, AccountsNavigationItem
 
 django_engine = engines['django']
@@ -174,3 +175,73 @@ class TestNavigation(TestCase):
         navigation.set_request(self.create_request(path=reverse('logout'), is_authenticated=True))
         self.assertEqual(navigation.active_items, [accounts_navigation_item])
         del navigation.active_items
+
+    def test_rendered_navigation_is_invalidated_when_items_change(self):
+        navigation = Navigation.objects.create(
+            name='test nav',
+            slug='test-nav',
+        )
+        placeholder = Placeholder.objects.create(
+            slot='navigation_content',
+            parent=navigation,
+        )
+        request = self.create_request(path='/test/url/')
+        self.assertNotIn(
+            'test nav item title',
+            self.test_template.render({'request': request}))
+        item = NavigationItem.objects.create(
+            placeholder=placeholder,
+            parent_type_id=ContentType.objects.get_for_model(Navigation).id,
+            parent_id=navigation.id,
+            title='test nav item title',
+            url=AnyUrlValue.from_db_value('/test/')
+        )
+        test_template_rendered = self.test_template.render({
+            'request': request,
+        })
+        self.assertIn('test nav item title', test_template_rendered)
+        self.assertIn('ik-nav-item--active', test_template_rendered)
+        self.assertEqual(
+            Navigation.get_compiled(navigation.pk).get_active_item_ids(
+                self.create_request(path='/other/')),
+            set())
+        self.assertEqual(
+            Navigation.get_compiled(navigation.pk).get_active_item_ids(
+                request),
+            set([item.pk]))
+
+    def test_items_overriding_is_active_for_request_are_dynamic(self):
+        class RulesItem(object):
+            def is_active_for_request(self, request):
+                return request.path.startswith('/test/')
+
+            def get_active_url_rules(self):
+                return [('/test/', False, None)]
+
+        class CustomItem(RulesItem):
+            def is_active_for_request(self, request):
+                return True
+
+        class CustomRulesItem(CustomItem):
+            def get_active_url_rules(self):
+                return [('/', False, None)]
+
+        self.assertEqual(
+            get_active_url_rules(RulesItem()), [('/test/', False, None)])
+        self.assertIsNone(get_active_url_rules(CustomItem()))
+        self.assertEqual(
+            get_active_url_rules(CustomRulesItem()), [('/', False, None)])
+
+    def test_rendered_navigation_is_cached_per_page(self):
+        navigation = Navigation.objects.create(
+            name='test nav',
+            slug='test-nav',
+        )
+        compiled = Navigation.get_compiled(navigation.pk)
+        request = self.create_request()
+        self.assertEqual(
+            compiled.get_html_cache_key(request, 1),
+            compiled.get_html_cache_key(request, 1))
+        self.assertNotEqual(
+            compiled.get_html_cache_key(request, 1),
+            compiled.get_html_cache_key(request, 2))
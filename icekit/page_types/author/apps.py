@@ -14,3 +14,9 @@ class AppConfig(AppConfig):
         from .models import Author
         ICEkitURLField.register_model(
             Author, widget=SimpleRawIdWidget(Author), title='Author')
+
+        from fluent_pages.models import UrlNode, UrlNode_Translation
+        from icekit.utils.cache import connect_invalidation
+        from .models import invalidate_author_listing_cache
+        connect_invalidation(
+            invalidate_author_listing_cache, (UrlNode, UrlNode_Translation))
@@ -2,10 +2,17 @@
 Model declaration for the `author` app.
 """
 import re
+from collections import defaultdict
 
+from django.contrib.contenttypes.models import ContentType
 from django.utils.timezone import now
+from django.utils.translation import get_language
 from icekit.mixins import HeroMixin
 from icekit.plugins.links.models import AuthorLink
+from icekit.publishing.middleware import is_draft_request_context
+from icekit.publishing.models import PublishingModel
+from icekit.utils.cache import get_or_set_local, invalidate_namespace, \
+    make_key
 
 try:
     from urlparse import urljoin
@@ -22,6 +29,8 @@ from icekit.content_collections.abstract_models import AbstractListingPage, \
     AbstractCollectedContent
 from icekit.validators import RelativeURLValidator
 
+AUTHOR_LISTING_CACHE_NAMESPACE = 'author_listing'
+
 
 class AuthorListing(AbstractListingPage):
     """
@@ -106,19 +115,55 @@ class Author(
 
     def contributions(self):
         """
-        :return: List of all content that should show for this author.
+        :return: All visible content that has a link to the (draft) author,
+        ordered by publication date.
         """
-        return []
+        draft = self.get_draft()
+        links = AuthorLink.objects \
+            .filter(item_id=draft.id, exclude_from_contributions=False) \
+            .values_list('parent_type_id', 'parent_id')
+
+        # Fetch parents with one query per content type, not one per link
+        parent_ids_by_ct = defaultdict(set)
+        for parent_type_id, parent_id in links:
+            parent_ids_by_ct[parent_type_id].add(parent_id)
+
+        is_draft_context = is_draft_request_context()
+        parents = []
+        for ct_id, parent_ids in parent_ids_by_ct.items():
+            model = ContentType.objects.get_for_id(ct_id).model_class()
+            if model is None:
+                continue
+            qs = model._default_manager.filter(pk__in=parent_ids)
+            if issubclass(model, PublishingModel):
+                qs = qs.filter(publishing_is_draft=is_draft_context)
+            parents += [p for p in qs if getattr(p, 'is_visible', True)]
+
+        # Parents come from several tables, so merge the per-type results
+        default_time = now()
+        def _key(x):
+            return getattr(x, 'publishing_published_at',
+                    getattr(x, 'publishing_modified_at',
+                            default_time)) or default_time
+
+        return sorted(parents, key=_key)
 
     @property
     def parent(self):
         try:
-            return AuthorListing.objects.draft()[0]
+            return self._parent
+        except AttributeError:
+            pass
+        try:
+            self._parent = AuthorListing.objects.draft()[0]
         except IndexError:
             raise IndexError("You need to create a Author Listing Page")
+        return self._parent
 
     def get_absolute_url(self):
-        parent_url = self.parent.get_absolute_url()
+        parent_url = get_or_set_local(
+            make_key(AUTHOR_LISTING_CACHE_NAMESPACE, get_language()),
+            lambda: self.parent.get_absolute_url())
         return urljoin(parent_url, self.slug + "/")
 
     def get_layout_template_name(self):
@@ -127,18 +172,10 @@ class Author(
     class Meta:
         ordering = ('family_name', 'given_names', )
 
-    def contributions(self):
-        """
-        :return: All content that has a link to the (draft) author. 
-        """
-        draft = self.get_draft()
-        links = AuthorLink.objects.filter(item_id=draft.id, exclude_from_contributions=False)
-
-        default_time = now()
-        def _key(x):
-            return getattr(x, 'publishing_published_at',
-                    getattr(x, 'publishing_modified_at',
-                            default_time)) or default_time
-
-        return sorted([x.parent for x in links if x.parent.is_visible], key=_key)
 
+def invalidate_author_listing_cache(sender, **kwargs):
+    """
+    Invalidate the cached author listing URL when pages or their translations
+    are changed, since any change to the page tree may change it.
+    """
+    invalidate_namespace(AUTHOR_LISTING_CACHE_NAMESPACE)
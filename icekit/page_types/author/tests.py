@@ -4,6 +4,12 @@ from django_dynamic_fixture import G
 from django_webtest import WebTest
 from fluent_contents.models import Placeholder
 
+from icekit.models import Layout
+from icekit.page_types.layout_page.models import LayoutPage
+from icekit.plugins.links.models import AuthorLink
+from icekit.publishing.middleware import override_draft_request_context
+from icekit.utils import fluent_contents
+
 from . import models
 
 User = get_user_model()
@@ -35,6 +41,35 @@ class AuthorTests(WebTest):
             )
         )
 
+    def test_get_absolute_url_is_updated_when_listing_changes(self):
+        self.author_1.get_absolute_url()
+        self.author_listing.slug = 'contributors'
+        self.author_listing.save()
+        self.assertEqual(
+            models.Author.objects.get(pk=self.author_1.pk).get_absolute_url(),
+            '/contributors/%s/' % self.author_1.slug
+        )
+
+    def test_contributions(self):
+        page = LayoutPage.objects.create(
+            author=self.staff_1,
+            title='Test page',
+            layout=G(Layout),
+        )
+        fluent_contents.create_content_instance(
+            AuthorLink,
+            page,
+            item=self.author_1,
+        )
+        self.assertEqual(self.author_1.contributions(), [])
+        with override_draft_request_context(True):
+            self.assertEqual(self.author_1.contributions(), [page])
+        self.assertEqual(self.author_2.contributions(), [])
+
+        page.publish()
+        self.assertEqual(
+            self.author_1.contributions(), [page.get_published()])
+
     def test_admin(self):
         admin_app_list = (
             ('icekit_authors_author', self.author_1),
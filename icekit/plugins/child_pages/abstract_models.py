@@ -2,6 +2,8 @@ from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 from fluent_contents.models import ContentItem
 
+from icekit.publishing.utils import get_child_pages
+
 
 @python_2_unicode_compatible
 class AbstractChildPagesItem(ContentItem):
@@ -15,9 +17,7 @@ class AbstractChildPagesItem(ContentItem):
     def get_child_pages(self):
         # If my parent page is draft, show parent's (draft) children
         # if my parent page is published, show published equivalents of parent's children
-        parent = self.parent
-
-        if parent.is_draft:
-            return [p for p in parent.get_draft().get_children() if p.publishing_is_draft]
-        else:
-            return parent.get_draft().get_children().published()
+        # Memoised, since templates typically access this more than once.
+        if not hasattr(self, '_child_pages'):
+            self._child_pages = get_child_pages(self.parent)
+        return self._child_pages
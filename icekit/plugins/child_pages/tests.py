@@ -3,6 +3,8 @@ from django.contrib.sites.models import Site
 from django.contrib.auth import get_user_model
 from django_dynamic_fixture import G
 from django_webtest import WebTest
+from fluent_pages.models import PageLayout, UrlNode
+from fluent_pages.pagetypes.fluentpage.models import FluentPage
 from icekit.utils import fluent_contents
 from icekit.models import Layout
 from icekit.page_types.layout_page.models import LayoutPage
@@ -90,3 +92,36 @@ class ChildPagesTestCase(WebTest):
         expected_children = [self.page_3.get_published()]
         for child in expected_children:
             self.assertIn(child, pcp2.get_child_pages())
+
+    def test_get_child_pages_published_is_updated_on_publish(self):
+        pcp2 = self.page_2.get_published().contentitem_set.all()[0]
+        self.assertEqual(len(pcp2.get_child_pages()), 1)
+
+        self.page_4.publish()
+        # Fetch item again, as results are memoised per instance
+        pcp2 = self.page_2.get_published().contentitem_set.all()[0]
+        self.assertEqual(
+            [self.page_3.get_published().pk, self.page_4.get_published().pk],
+            [x.pk for x in pcp2.get_child_pages()])
+
+    def test_get_child_pages_includes_non_publishing_children(self):
+        page_layout = G(
+            PageLayout,
+            template_path='icekit/layouts/default.html',
+        )
+        fluent_page = FluentPage.objects.create(
+            title='Fluent Page',
+            slug='fluent-page',
+            parent_site=Site.objects.first(),
+            layout=page_layout,
+            author=self.staff_1,
+            parent=self.page_2,
+            status=UrlNode.PUBLISHED,
+        )
+        self.assertIn(
+            fluent_page.pk,
+            [x.pk for x in self.child_pages_2.get_child_pages()])
+        pcp2 = self.page_2.get_published().contentitem_set.all()[0]
+        self.assertEqual(
+            [self.page_3.get_published().pk, fluent_page.pk],
+            [x.pk for x in pcp2.get_child_pages()])
@@ -1,10 +1,94 @@
+from collections import defaultdict
+
 from django.contrib.contenttypes.models import ContentType
 from fluent_contents.models import Placeholder
 
 
+class PlaceholderAccess(object):
+    """
+    Access the content items of an object's placeholders by slot name, as
+    attributes or items.
+
+    For example if the slot was named `main` and you had a descriptor named
+    `slots` on an object named `page` you would call it by `page.slots.main`
+    or `page.slots['main']`.
+
+    Content items (or absence) of each slot are memoised, with `None`
+    recorded for slots without a placeholder. Memoised slots are discarded
+    when the object is pickled, such as when it is cached.
+    """
+    def __init__(self, instance, related_model=Placeholder):
+        self._instance = instance
+        self._related_model = related_model
+        self._slot_cache = {}
+
+    def __reduce__(self):
+        return (PlaceholderAccess, (self._instance, self._related_model))
+
+    def _get_related_model_objects(self, name):
+        """
+        Obtains the related model objects based upon the slot name.
+
+        :param name: The slot name in string form.
+        :returns; Related model contents if they exist or it will
+        raise a `DoesNotExist` exception.
+        """
+        related_model = self._related_model
+        try:
+            content_items = self._slot_cache[name]
+        except KeyError:
+            # Parent type, parent id and slot are set to be unique on the
+            # default related model and therefore treated as such here.
+            try:
+                content_items = related_model.objects.get(
+                    parent_type=ContentType.objects.get_for_model(
+                        type(self._instance)),
+                    parent_id=self._instance.id,
+                    slot=name,
+                ).get_content_items()
+            except related_model.DoesNotExist:
+                content_items = None
+            self._slot_cache[name] = content_items
+        if content_items is None:
+            raise related_model.DoesNotExist
+        return content_items
+
+    def __getattr__(self, name):
+        """
+        If a slot name is used that does not exist an `AttributeError` will
+        be raised.
+
+        If you get this error for a slot that should exist, you may need to
+        run `manage.py add_missing_placeholders`.
+        """
+        # Special and private names are never slots, and may be looked up
+        # before `__init__` runs, such as by `copy`.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._get_related_model_objects(name)
+        except self._related_model.DoesNotExist:
+            raise AttributeError(name)
+
+    def __getitem__(self, item):
+        """
+        If a slot name is used that does not exist a `KeyError` will be
+        raised.
+        """
+        try:
+            return self._get_related_model_objects(item)
+        except self._related_model.DoesNotExist:
+            raise KeyError(item)
+
+
 class PlaceholderDescriptor(object):
     """
     Descriptor to append appropriate slot content to a `UrlNode` derivative.
+
+    The `PlaceholderAccess` object is memoised per instance, and it memoises
+    the content items (or absence) of each slot it looks up, so repeated slot
+    access does not repeat queries. Use ``del instance.<name>`` to discard
+    memoised slots, for example after adding placeholders.
     """
     place_holder_access = None
 
@@ -20,7 +104,13 @@ class PlaceholderDescriptor(object):
         if instance is None:
             return self
 
-        return self.create_placeholder_access_object(instance)
+        return self.get_placeholder_access_object(instance)
+
+    def __delete__(self, instance):
+        """
+        Discard the memoised placeholder access object.
+        """
+        instance.__dict__.pop(self.get_cache_name(), None)
 
     def contribute_to_class(self, cls, name):
         """
@@ -30,71 +120,31 @@ class PlaceholderDescriptor(object):
         self.model_class = cls
         setattr(cls, self.name, self)
 
+    def get_cache_name(self):
+        return '_%s_placeholder_access' % getattr(self, 'name', 'slots')
+
+    def get_placeholder_access_object(self, instance):
+        """
+        Return the memoised placeholder access object for the instance,
+        creating it if necessary.
+        """
+        cache_name = self.get_cache_name()
+        cached = instance.__dict__.get(cache_name)
+        # The instance PK is checked in case the instance is saved or copied,
+        # such as when it is published.
+        if cached is None or cached[0] != instance.pk:
+            cached = (
+                instance.pk,
+                self.create_placeholder_access_object(instance),
+            )
+            instance.__dict__[cache_name] = cached
+        return cached[1]
+
     def create_placeholder_access_object(self, instance):
         """
-        Created objects with placeholder slots as properties.
-
-        Each placeholder created for an object will be added to a
-        `PlaceHolderAccess` object as a set property.
-        """
-        related_model = self.related_model
-
-        def get_related_model_objects(name):
-            """
-            Obtains the related model objects based upon the slot name.
-
-            :param name: The slot name in string form.
-            :returns; Related model contents if they exist or it will
-            raise a `DoesNotExist` exception.
-            """
-            # Parent type, parent id and slot are set to be unique on the default
-            # related model and therefore treated as such here.
-            return related_model.objects.get(
-                parent_type=ContentType.objects.get_for_model(type(instance)),
-                parent_id=instance.id,
-                slot=name,
-            ).get_content_items()
-
-        class PlaceholderAccess(object):
-            def __getattribute__(self, name):
-                """
-                Allow placeholder contents to be accessed via slot
-                name on the descriptor object.
-
-                For example if the slot was named `main` and you had
-                a descriptor named `slots` on an object named `page`
-                you would call it by `page.slots.main`.
-
-                If a slot name is used that does not exist an
-                `AttributeError` will be raised.
-
-                If you get this error for a slot that should exist, you may
-                need to run `manage.py add_missing_placeholders`.
-                """
-                try:
-                    return get_related_model_objects(name)
-                except related_model.DoesNotExist:
-                    return super(PlaceholderAccess, self).__getattribute__(name)
-
-            def __getitem__(self, item):
-                """
-                Allow placeholder contents to be accessed via slot
-                name one the descriptor object via a dictionary
-                lookup.
-
-                For example if the slot was named `main` and you had
-                a descriptor named `slots` on an object named `page`
-                you would call it by `page.slots['main']`.
-
-                If a slot name is used that does not exist a
-                `KeyError` will be raised.
-                """
-                try:
-                    return get_related_model_objects(item)
-                except related_model.DoesNotExist:
-                    raise KeyError
-
-        return PlaceholderAccess()
+        Return a `PlaceholderAccess` object for the instance.
+        """
+        return PlaceholderAccess(instance, self.related_model)
 
 
 def contribute_to_class(model_class, name='slots', descriptor=None):
@@ -113,3 +163,55 @@ def contribute_to_class(model_class, name='slots', descriptor=None):
     rel_obj.contribute_to_class(model_class, name)
     setattr(model_class, name, rel_obj)
     return True
+
+
+def prefetch_slots(objects, slot_names, name='slots'):
+    """
+    Load the placeholders and content items for the given slots of many
+    objects at once, and memoise them on each object's placeholder descriptor
+    so that ``obj.<name>.<slot>`` does not query the database.
+
+    This takes one query for placeholders per content type of the objects,
+    plus one query for content items per content item type of those
+    placeholders, regardless of the number of objects.
+
+    :param objects: An iterable of model instances with a
+    `PlaceholderDescriptor`, such as a queryset.
+    :param slot_names: The slot names to load.
+    :param name: The attribute name of the descriptor.
+    :return: A list of the objects.
+    """
+    objects = list(objects)
+    slot_names = list(slot_names)
+    if not objects or not slot_names:
+        return objects
+
+    # Group objects by the content type used for their placeholders
+    objects_by_ct = defaultdict(dict)
+    for obj in objects:
+        ct = ContentType.objects.get_for_model(type(obj))
+        objects_by_ct[ct.pk][obj.pk] = obj
+
+    placeholders = []
+    for ct_id, objects_by_pk in objects_by_ct.items():
+        placeholders += list(
+            Placeholder.objects.filter(
+                parent_type_id=ct_id,
+                parent_id__in=objects_by_pk.keys(),
+                slot__in=slot_names,
+            )
+            # `get_content_items()` returns the prefetched items
+            .prefetch_related('contentitems')
+        )
+
+    # Every requested slot is recorded, so missing slots are not queried
+    slot_contents = defaultdict(lambda: dict.fromkeys(slot_names))
+    for placeholder in placeholders:
+        slot_contents[(placeholder.parent_type_id, placeholder.parent_id)][
+            placeholder.slot] = placeholder.get_content_items()
+
+    for ct_id, objects_by_pk in objects_by_ct.items():
+        for pk, obj in objects_by_pk.items():
+            slots = getattr(obj, name)
+            slots._slot_cache.update(slot_contents[(ct_id, pk)])
+    return objects
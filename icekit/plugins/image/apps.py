@@ -5,3 +5,9 @@ class AppConfig(AppConfig):
     name = '.'.join(__name__.split('.')[:-1])
     label = 'icekit_plugins_image'
     verbose_name = "Image"
+
+    def ready(self):
+        from icekit.utils.cache import connect_invalidation
+        from .abstract_models import AbstractImage
+        from .models import invalidate_image_cache
+        connect_invalidation(invalidate_image_cache, AbstractImage)
@@ -5,11 +5,14 @@ from django.utils.translation import ugettext_lazy as _
 from django.template import loader
 from fluent_contents.extensions import ContentPlugin, plugin_pool
 
+from icekit.utils.cache import get_namespace_version
+from icekit.utils.fluent_contents import RenderCachePluginMixin
+
 from . import models
 
 
 @plugin_pool.register
-class ImagePlugin(ContentPlugin):
+class ImagePlugin(RenderCachePluginMixin, ContentPlugin):
     model = models.ImageItem
     category = _('Assets')
     raw_id_fields = ['image', ]
@@ -30,6 +33,15 @@ class ImagePlugin(ContentPlugin):
         })
     )
 
+    def get_render_cache_parts(self, request, instance):
+        # Output includes the image's details and caption. Use the image's
+        # cache namespace rather than loading the image to check it.
+        return (
+            instance.image_id,
+            get_namespace_version(
+                models.get_image_cache_namespace(instance.image_id)),
+        )
+
     def get_render_template(self, request, instance, **kwargs):
         opts = type(instance.parent)._meta
         template = loader.select_template(
@@ -3,6 +3,7 @@ from urlparse import urljoin
 from icekit.content_collections.abstract_models import TitleSlugMixin
 from icekit.plugins.iiif.utils import SUPPORTED_EXTENSIONS
 from icekit.plugins.iiif.utils import SUPPORTED_QUALITY
+from icekit.utils.cache import invalidate_namespace
 from django.db import models
 
 from . import abstract_models
@@ -11,11 +12,28 @@ from . import abstract_models
 FORMAT_CHOICES = [(x, x) for x in SUPPORTED_EXTENSIONS]
 QUALITY_CHOICES = [(x, x) for x in SUPPORTED_QUALITY]
 
+# Prefix of the namespace per image, for cached output showing the image
+IMAGE_CACHE_NAMESPACE = 'image'
+
 class Image(abstract_models.AbstractImage):
     """
     A reusable image.
     """
-    pass
+    class Meta:
+        # For API change feeds, which page through items by modified time
+        index_together = (('date_modified', 'id'),)
+
+
+def get_image_cache_namespace(image_pk):
+    """
+    Return the cache namespace for output showing the image with primary key
+    ``image_pk``, which is invalidated when the image is saved or deleted.
+    """
+    return '%s:%s' % (IMAGE_CACHE_NAMESPACE, image_pk)
+
+
+def invalidate_image_cache(sender, instance, **kwargs):
+    invalidate_namespace(get_image_cache_namespace(instance.pk))
 
 
 class ImageItem(abstract_models.AbstractImageItem):
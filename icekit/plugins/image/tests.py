@@ -62,6 +62,18 @@ class ImageItem(WebTest):
         self.image_item_1.caption = test_text
         self.assertEqual(self.image_item_1.caption, test_text)
 
+    def test_render_cache_parts(self):
+        image_item = models.ImageItem.objects.get(pk=self.image_item_1.pk)
+        plugin = image_item.plugin
+        # The image is not loaded to identify its state
+        with self.assertNumQueries(0):
+            parts = plugin.get_render_cache_parts(None, image_item)
+        self.assertEqual(
+            parts, plugin.get_render_cache_parts(None, image_item))
+        self.image_1.save()
+        self.assertNotEqual(
+            parts, plugin.get_render_cache_parts(None, image_item))
+
     def test_render(self):
         self.page_1.publish()
         response = self.app.get(self.page_1.publishing_linked.get_absolute_url())
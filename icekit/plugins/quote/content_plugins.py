@@ -5,11 +5,13 @@ import warnings
 from django.utils.translation import ugettext_lazy as _
 from fluent_contents.extensions import ContentPlugin, plugin_pool
 
+from icekit.utils.fluent_contents import RenderCachePluginMixin
+
 from . import models
 
 
 @plugin_pool.register
-class QuotePlugin(ContentPlugin):
+class QuotePlugin(RenderCachePluginMixin, ContentPlugin):
     model = models.QuoteItem
     category = _('Text')
     render_template = 'icekit/plugins/quote/default.html'
@@ -1,3 +1,5 @@
+import pickle
+
 from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
 from django_dynamic_fixture import G
@@ -8,6 +10,7 @@ from fluent_pages.pagetypes.fluentpage.models import FluentPage
 from . import descriptors
 from icekit.utils import fluent_contents
 from icekit.plugins.horizontal_rule.models import HorizontalRuleItem
+from icekit.plugins.text.models import TextItem
 
 User = get_user_model()
 
@@ -36,15 +39,111 @@ class PlaceholderDescriptor(WebTest):
             HorizontalRuleItem,
             self.page_1
         )
+        # The missing slot is memoised until the slots are discarded
+        self.assertFalse(hasattr(self.page_1.slots, 'main'))
+        del self.page_1.slots
         self.assertEqual(self.page_1.slots.main.count(), 1)
         with self.assertRaises(AttributeError):
             getattr(self.page_1.slots, 'fake_slot')
         horizontal_rule_1.delete()
         self.assertEqual(self.page_1.slots.main.count(), 0)
 
-        # Test that the same object is not returned. For context, we have had previous issues with
-        # slots which were bound to class objects and cached across instances.
-        self.assertNotEqual(self.page_1.slots, self.page_1.slots)
+        # Slots are memoised per instance, but not shared between instances. For context, we have
+        # had previous issues with slots which were bound to class objects and cached across
+        # instances.
+        self.assertIs(self.page_1.slots, self.page_1.slots)
+        self.assertIsNot(
+            self.page_1.slots, FluentPage.objects.get(pk=self.page_1.pk).slots)
+
+    def test_descriptor_pickle(self):
+        fluent_contents.create_content_instance(
+            HorizontalRuleItem,
+            self.page_1
+        )
+        self.assertEqual(self.page_1.slots.main.count(), 1)
+        # Memoised slots are not pickled, so pages can be cached
+        page = pickle.loads(pickle.dumps(self.page_1))
+        self.assertEqual(page.slots._slot_cache, {})
+        self.assertEqual(page.slots.main.count(), 1)
+
+    def test_prefetch_slots(self):
+        page_2 = FluentPage.objects.create(
+            author=self.user_1,
+            title='Test title 2',
+            layout=self.page_layout_1,
+        )
+        fluent_contents.create_content_instance(
+            HorizontalRuleItem,
+            self.page_1
+        )
+        pages = descriptors.prefetch_slots(
+            FluentPage.objects.filter(pk__in=[self.page_1.pk, page_2.pk])
+                .order_by('pk'),
+            ['main', 'related'],
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(pages[0].slots.main.count(), 1)
+            self.assertFalse(hasattr(pages[0].slots, 'related'))
+            self.assertFalse(hasattr(pages[1].slots, 'main'))
+        page_2.delete()
+
+    def tearDown(self):
+        self.page_1.delete()
+        self.page_layout_1.delete()
+        self.site.delete()
+
+
+class RenderCachePluginMixin(WebTest):
+    def setUp(self):
+        self.site, __ = Site.objects.get_or_create(
+            pk=1,
+            defaults={'name': 'example.com', 'domain': 'example.com'})
+        self.user_1 = G(User)
+        self.page_layout_1 = G(
+            PageLayout,
+            template_path='icekit/layouts/default.html',
+        )
+        self.page_1 = FluentPage.objects.create(
+            author=self.user_1,
+            title='Test title',
+            layout=self.page_layout_1,
+        )
+
+    def test_render_cache(self):
+        text_item = fluent_contents.create_content_instance(
+            TextItem,
+            self.page_1,
+            text='<p>Original text</p>',
+        )
+        self.assertIn('Original text', text_item.plugin.render(None, text_item))
+        # Updates without signals do not invalidate the cached output...
+        TextItem.objects.filter(pk=text_item.pk).update(text='<p>Updated</p>')
+        text_item = TextItem.objects.get(pk=text_item.pk)
+        self.assertIn('Original text', text_item.plugin.render(None, text_item))
+        # ...but saving the item does
+        text_item.save()
+        self.assertIn('Updated', text_item.plugin.render(None, text_item))
+
+    def test_render_cache_is_invalidated_per_item(self):
+        text_item = fluent_contents.create_content_instance(
+            TextItem,
+            self.page_1,
+            text='<p>Original text</p>',
+        )
+        other_item = fluent_contents.create_content_instance(
+            TextItem,
+            self.page_1,
+            text='<p>Other text</p>',
+        )
+        self.assertIn('Original text', text_item.plugin.render(None, text_item))
+        TextItem.objects.filter(pk=text_item.pk).update(text='<p>Updated</p>')
+        text_item = TextItem.objects.get(pk=text_item.pk)
+        # Saving other content items or models does not invalidate the output
+        other_item.save()
+        self.page_1.save()
+        self.assertIn('Original text', text_item.plugin.render(None, text_item))
+        other_item.delete()
+        self.assertIn('Original text', text_item.plugin.render(None, text_item))
 
     def tearDown(self):
         self.page_1.delete()
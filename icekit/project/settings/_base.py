@@ -378,6 +378,10 @@ CELERYBEAT_SCHEDULE = {
         'task': 'icekit.tasks.UpdateSearchIndexTask',
         'schedule': crontab(minute='*/15'),  # Every 15 minutes.
     },
+    'PruneTombstonesTask': {
+        'task': 'icekit.tasks.PruneTombstonesTask',
+        'schedule': crontab(hour=3, minute=0),  # Every day at 3am.
+    },
 }
 
 # Redis (by setting CELERY_RESULT_BACKEND to BROKER_URL) is an alternative
@@ -5,18 +5,20 @@ from django.utils.datastructures import OrderedSet
 from django.utils.translation import get_language
 
 from fluent_pages import appsettings
-from fluent_pages.models import UrlNode
+from fluent_pages.models import UrlNode, UrlNode_Translation
 from fluent_pages.models.managers import UrlNodeQuerySet
 
 from polymorphic.models import PolymorphicModel
 
 from mptt.models import MPTTModel
 
+from icekit.utils.cache import connect_invalidation
+
 from . import monkey_patches
 from .managers import PublishingQuerySet, PublishingPolymorphicManager, \
     PublishingUrlNodeManager, UrlNodeQuerySetWithPublishingFeatures, \
     _queryset_iterator
-from .models import PublishingModel
+from .models import PublishingModel, invalidate_child_pages_cache
 from .middleware import is_draft_request_context, \
     override_draft_request_context
 
@@ -75,6 +77,10 @@ class AppConfig(AppConfig):
         monkey_patches.APPLY_patch_django_17_collector_collect()
         monkey_patches.APPLY_patch_django_18_get_candidate_relations_to_delete()
 
+        # Invalidate cached child pages when pages or their translations change
+        connect_invalidation(
+            invalidate_child_pages_cache, (UrlNode, UrlNode_Translation))
+
         # Monkey-patch `UrlNodeQuerySet.published` to avoid filtering out draft
         # items when we are in a draft request context when the special-case
         # `for_user` parameter is supplied. The original only avoids this
@@ -7,15 +7,22 @@ from django.db import models
 from django.dispatch import receiver
 from django.utils import timezone
 
+try:
+    from mptt.signals import node_moved
+except ImportError:  # Older versions of django-mptt
+    node_moved = None
+
 from fluent_contents.models import Placeholder
-from fluent_pages.models import UrlNode
+from fluent_pages.models import UrlNode, UrlNode_Translation
 from fluent_pages.integration.fluent_contents import FluentContentsPage
 
 from icekit.mixins import FluentFieldsMixin
+from icekit.utils.cache import invalidate_namespace
 
 from .managers import PublishingManager, PublishingUrlNodeManager
 from .middleware import is_draft_request_context
-from .utils import PublishingException, assert_draft
+from .utils import CHILD_PAGES_CACHE_NAMESPACE, PublishingException, \
+    assert_draft
 from . import signals as publishing_signals
 
 
@@ -724,6 +731,22 @@ def update_fluent_cached_urls_post_publish(sender, instance, **kwargs):
     update_fluent_cached_urls(instance.publishing_linked)
 
 
+@receiver(publishing_signals.publishing_post_publish)
+@receiver(publishing_signals.publishing_post_unpublish)
+def invalidate_child_pages_cache(sender, instance, **kwargs):
+    """
+    Invalidate cached lists of child pages when pages or their translations
+    are changed, or when the page tree changes. Connected to ``post_save``
+    and ``post_delete`` for pages in `AppConfig.ready()`.
+    """
+    if isinstance(instance, (UrlNode, UrlNode_Translation)):
+        invalidate_namespace(CHILD_PAGES_CACHE_NAMESPACE)
+
+
+if node_moved is not None:
+    node_moved.connect(invalidate_child_pages_cache)
+
+
 @receiver(models.signals.post_save)
 def sync_mptt_tree_fields_from_draft_to_published_post_save(
         sender, instance, **kwargs):
@@ -93,3 +93,78 @@ def verify_draft_url(url):
         salt, hmac = preview_hmac.split(':')
         return hmac == get_draft_hmac(salt, url.path)
     return False
+
+
+# Cache namespace for lists of visible child pages
+CHILD_PAGES_CACHE_NAMESPACE = 'child_pages'
+
+
+def is_visible_published_page(page, now):
+    """
+    Return ``True`` if ``page`` is a published copy within its publication
+    dates, as for `PublishingUrlNodeQuerySet.published`. Pages that are not
+    publishable have no separate copies, and are visible if their status is
+    published.
+    """
+    is_draft = getattr(page, 'publishing_is_draft', None)
+    if is_draft is None:
+        if not getattr(page, 'is_published', False):
+            return False
+    elif is_draft:
+        return False
+    publication_date = getattr(page, 'publication_date', None)
+    publication_end_date = getattr(page, 'publication_end_date', None)
+    return (
+        (publication_date is None or publication_date <= now) and
+        (publication_end_date is None or publication_end_date > now)
+    )
+
+
+def get_child_pages(page):
+    """
+    Return a list of the children of a publishable page that are visible in
+    the same context as the page: draft children for a draft page, or the
+    visible published copies of children for a published page. Children
+    that are not publishable are included in both.
+
+    Both draft and published copies of pages are children of the draft parent
+    in the page tree, so we fetch all of them in a single tree query and pick
+    the right copies, instead of exchanging draft children for published ones
+    with `published()`. Results are cached per parent and draft/published
+    status, and invalidated when pages are saved, deleted, (un)published or
+    moved. Publication dates are checked each time so scheduled pages appear
+    and disappear on time.
+    """
+    from django.utils import timezone
+    from icekit.utils.cache import get_or_set, make_key
+    from .middleware import is_draft_request_context, \
+        is_publishing_middleware_active
+
+    draft = page.get_draft()
+
+    def get_children():
+        return list(draft.get_children().prefetch_related('translations'))
+
+    # Draft children are wrapped in booby traps in public request contexts,
+    # and cannot be cached.
+    if page.is_draft and is_publishing_middleware_active() \
+            and not is_draft_request_context():
+        children = get_children()
+    else:
+        children = get_or_set(
+            make_key(CHILD_PAGES_CACHE_NAMESPACE, draft.pk, page.is_draft),
+            lambda: [
+                child for child in get_children()
+                if getattr(child, 'publishing_is_draft', page.is_draft) ==
+                page.is_draft
+            ],
+        )
+
+    if page.is_draft:
+        return [
+            child for child in children
+            if getattr(child, 'publishing_is_draft', True)
+        ]
+    now = timezone.now()
+    return [
+        child for child in children if is_visible_published_page(child, now)]
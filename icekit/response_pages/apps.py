@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class AppConfig(AppConfig):
+    name = '.'.join(__name__.split('.')[:-1])
+    label = 'response_pages'
+
+    def ready(self):
+        from fluent_contents.models import ContentItem, Placeholder
+        from icekit.utils.cache import connect_invalidation
+        from .models import ResponsePage, invalidate_response_page_cache, \
+            invalidate_response_page_content_cache
+        connect_invalidation(invalidate_response_page_cache, ResponsePage)
+        connect_invalidation(
+            invalidate_response_page_content_cache, (ContentItem, Placeholder))
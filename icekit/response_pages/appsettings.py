@@ -9,3 +9,12 @@ RESPONSE_PAGE_CONTENT_PLUGINS = getattr(
     'RESPONSE_PAGE_PLUGINS',
     ['ImagePlugin', 'TextPlugin', ]
 )
+
+# Seconds to cache the rendered bodies of response pages for anonymous
+# requests. Rendered bodies are invalidated when response pages change, but
+# may include other site content, like navigation, so keep this short.
+RESPONSE_PAGE_CACHE_TIMEOUT = getattr(
+    settings,
+    'RESPONSE_PAGE_CACHE_TIMEOUT',
+    60 * 5
+)
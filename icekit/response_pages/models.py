@@ -1,5 +1,11 @@
+from django.contrib.contenttypes.models import ContentType
+
+from icekit.utils.cache import invalidate_namespace
+
 from . import abstract_models
 
+RESPONSE_PAGE_CACHE_NAMESPACE = 'response_pages'
+
 
 class ResponsePage(abstract_models.AbstractResponsePage):
     """
@@ -7,3 +13,24 @@ class ResponsePage(abstract_models.AbstractResponsePage):
     to manage the content for pages such and 404 and 500.
     """
     pass
+
+
+def invalidate_response_page_cache(sender, **kwargs):
+    """
+    Invalidate cached response pages and their rendered bodies when response
+    pages change, and render the fallback 500 page.
+    """
+    from .views import store_fallback_bodies
+    invalidate_namespace(RESPONSE_PAGE_CACHE_NAMESPACE)
+    store_fallback_bodies()
+
+
+def invalidate_response_page_content_cache(sender, instance, **kwargs):
+    """
+    Invalidate cached response pages and their rendered bodies when content
+    items or placeholders of response pages change, and render the fallback
+    500 page.
+    """
+    if instance.parent_type_id == ContentType.objects.get_for_model(
+            ResponsePage).pk:
+        invalidate_response_page_cache(sender)
@@ -1,13 +1,121 @@
 """
 Views for ``response_pages`` app.
 """
+import logging
 
 from django import http
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.template import (RequestContext, loader)
+from django.utils import translation
+from django.utils.html import escape
+from django.utils.translation import get_language
 from django.views.decorators.csrf import requires_csrf_token
 from django.views import defaults
 
-from . import abstract_models, models
+from icekit.utils.cache import get_or_set, make_key
+
+from . import abstract_models, appsettings, models
+
+logger = logging.getLogger(__name__)
+
+# Rendered in place of the request path in cached bodies, and replaced with
+# the path of each request.
+REQUEST_PATH_PLACEHOLDER = 'icekit-response-page-request-path'
+
+# The body of the active 500 response page for each language, rendered when
+# response pages change by `store_fallback_bodies`. This is not versioned or
+# expired, so it is available even when the database is not.
+FALLBACK_CACHE_KEY = 'icekit:response_pages:fallback:%s:%s'
+
+SERVER_ERROR_TEMPLATE = 'icekit/response_pages/500.html'
+
+
+def get_active_response_page_pk(response_page_type):
+    """
+    Return the PK of the active response page of the given type, or 0 if
+    there is none. The result is cached until response pages change.
+    """
+    return get_or_set(
+        make_key(
+            models.RESPONSE_PAGE_CACHE_NAMESPACE, 'pk', response_page_type),
+        lambda: models.ResponsePage.objects
+        .filter(is_active=True, type=response_page_type)
+        .values_list('pk', flat=True).first() or 0,
+    )
+
+
+def is_cacheable_request(request):
+    """
+    Return True if response pages rendered for the request can be shared
+    with other requests, which is only the case for anonymous users.
+    """
+    user = getattr(request, 'user', None)
+    return user is None or not user.is_authenticated()
+
+
+def get_fallback_languages():
+    return set([settings.LANGUAGE_CODE, get_language()])
+
+
+def get_fallback_body(response_page_type):
+    """
+    Return the body stored for the response page type by
+    `store_fallback_bodies`, without using the database, or `None`.
+    """
+    try:
+        return cache.get(
+            FALLBACK_CACHE_KEY % (response_page_type, get_language())) or \
+            cache.get(FALLBACK_CACHE_KEY % (
+                response_page_type, settings.LANGUAGE_CODE))
+    except Exception:
+        return None
+
+
+def render_response_page(request, page, template_location):
+    template = loader.get_template(template_location)
+    return template.render(
+        RequestContext(request, {
+            'request_path': REQUEST_PATH_PLACEHOLDER,
+            'page': page,
+        })
+    )
+
+
+def store_fallback_bodies():
+    """
+    Render the active 500 response page for an anonymous request to the site
+    root, in the default and current languages, and store the bodies to serve
+    when rendering the page fails, or remove them if there is no active page.
+    This is called when response pages or their content change.
+    """
+    response_page_type = abstract_models.RESPONSE_HTTP500
+    page = models.ResponsePage.objects \
+        .filter(is_active=True, type=response_page_type).first()
+    for language in get_fallback_languages():
+        key = FALLBACK_CACHE_KEY % (response_page_type, language)
+        if page is None:
+            cache.delete(key)
+            continue
+        request = http.HttpRequest()
+        request.method = 'GET'
+        request.path = request.path_info = '/'
+        request.user = AnonymousUser()
+        try:
+            with translation.override(language):
+                body = render_response_page(
+                    request, page, SERVER_ERROR_TEMPLATE)
+        except Exception:
+            # Don't prevent saving the page, which may be incomplete
+            logger.exception('Failed to render the fallback 500 page')
+            cache.delete(key)
+            continue
+        # Don't share bodies that include a CSRF token
+        if request.META.get('CSRF_COOKIE_USED'):
+            cache.delete(key)
+        else:
+            cache.set(key, body, None)
 
 
 def get_response_page(request, return_type, template_location, response_page_type):
@@ -18,26 +126,49 @@ def get_response_page(request, return_type, template_location, response_page_typ
     a helper function which can be called to check if a ResponsePage
     exists for a ResponsePage type (which is also active).
 
+    For anonymous users the rendered body is cached per type and language,
+    with only ``request_path`` substituted for each request, so templates
+    should use ``request_path`` rather than ``request.path``.
+
     :param request:
     :param return_type:
     :param template_location:
     :param response_page_type:
     :return:
     """
-    try:
-        page = models.ResponsePage.objects.get(
-            is_active=True,
-            type=response_page_type,
-        )
-        template = loader.get_template(template_location)
-        content_type = None
+    pk = get_active_response_page_pk(response_page_type)
+    if not pk:
+        return None
+    content_type = None
+    request_path = escape(request.path)
+
+    cacheable = is_cacheable_request(request)
+    key = make_key(
+        models.RESPONSE_PAGE_CACHE_NAMESPACE,
+        'body',
+        response_page_type,
+        template_location,
+        get_language(),
+    )
+    if cacheable:
+        body = cache.get(key)
+        if body is not None:
+            return return_type(
+                body.replace(REQUEST_PATH_PLACEHOLDER, request_path),
+                content_type=content_type)
 
-        body = template.render(
-            RequestContext(request, {'request_path': request.path, 'page': page, })
-        )
-        return return_type(body, content_type=content_type)
+    try:
+        page = models.ResponsePage.objects.get(pk=pk)
     except models.ResponsePage.DoesNotExist:
         return None
+    csrf_cookie_used = request.META.get('CSRF_COOKIE_USED')
+    body = render_response_page(request, page, template_location)
+    # Don't share bodies that include the CSRF token for this request
+    if cacheable and request.META.get('CSRF_COOKIE_USED') == csrf_cookie_used:
+        cache.set(key, body, appsettings.RESPONSE_PAGE_CACHE_TIMEOUT)
+    return return_type(
+        body.replace(REQUEST_PATH_PLACEHOLDER, request_path),
+        content_type=content_type)
 
 
 @requires_csrf_token
@@ -77,7 +208,9 @@ def server_error(request, template_name='500.html'):
     The exception clause is so broad to capture any 500 errors that
     may have been generated from getting the response page e.g. if the
     database was down. If they were not handled they would cause a 500
-    themselves and form an infinite loop.
+    themselves and form an infinite loop. In that case the response page
+    rendered when it was last changed is served from the cache, if there is
+    one.
 
     If no ResponsePage exists for with type ``RESPONSE_HTTP500`` then
     the default template render view will be used.
@@ -91,12 +224,15 @@ def server_error(request, template_name='500.html'):
         rendered_page = get_response_page(
             request,
             http.HttpResponseServerError,
-            'icekit/response_pages/500.html',
+            SERVER_ERROR_TEMPLATE,
             abstract_models.RESPONSE_HTTP500
         )
         if rendered_page is not None:
             return rendered_page
     except Exception:
-        pass
+        body = get_fallback_body(abstract_models.RESPONSE_HTTP500)
+        if body is not None:
+            return http.HttpResponseServerError(
+                body.replace(REQUEST_PATH_PLACEHOLDER, escape(request.path)))
 
     return defaults.server_error(request, template_name)
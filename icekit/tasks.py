@@ -11,6 +11,7 @@ except ImportError:
         return f
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.management import call_command
 from django.db.models.loading import get_model
 
@@ -69,12 +70,18 @@ def store_readability_score(app_label, model_name, pk):
     # items are relevant
     cls = get_model(app_label, model_name)
     obj = cls.objects.get(pk=pk)
-    obj.readability_score = obj.calculate_readability_score()
-     # avoid calling save() recursively
-    type(obj).objects.filter(pk=obj.pk).update(readability_score=obj.readability_score)
+    # allow saves from now on to queue another task
+    cache.delete(obj.get_readability_cache_key('pending'))
+    obj.update_readability_score()
 
 
 class UpdateSearchIndexTask(Task):
     @one_instance(key='UpdateSearchIndexTask')
     def run(self, **kwargs):
         call_command('update_index', remove=True)
+
+
+class PruneTombstonesTask(Task):
+    @one_instance(key='PruneTombstonesTask')
+    def run(self, **kwargs):
+        call_command('prune_tombstones', verbosity=0)
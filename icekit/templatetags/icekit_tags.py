@@ -8,14 +8,22 @@ from django.conf import settings
 from django.http import QueryDict
 from django.template import Library
 from django.template.base import Token, Variable
+from django.template.loader import render_to_string
 from django.template.loader_tags import do_include
 from django.utils.text import slugify
 from django.utils.encoding import force_text
 from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 from fluent_contents.plugins.oembeditem.backend import get_oembed_data
 from micawber import ProviderException
 from icekit.admin_tools.utils import admin_link as admin_link_fn, admin_url as admin_url_fn
+from icekit import appsettings as icekit_appsettings
 from icekit.navigation import models as navigation_models
+from icekit.navigation.abstract_models import NAVIGATION_CACHE_NAMESPACE
+from icekit.utils.cache import get_or_set, get_or_set_local, make_key
+
+# Cache namespace for `sharedcontent_exists` slugs, invalidated in `icekit.apps`
+SHAREDCONTENT_CACHE_NAMESPACE = 'sharedcontent'
 
 register = Library()
 
@@ -360,25 +368,66 @@ def sharedcontent_exists(slug):
     from django.contrib.sites.models import Site
     from fluent_contents.plugins.sharedcontent.models import SharedContent
     site = Site.objects.get_current()
-    return SharedContent.objects.parent_site(site).filter(slug=slug).exists()
-
-
-@register.inclusion_tag(
-    'icekit/navigation/navigation.html',
+    # Check against the set of all slugs for the site, cached in process and
+    # invalidated when shared content changes.
+    slugs = get_or_set_local(
+        make_key(SHAREDCONTENT_CACHE_NAMESPACE, site.pk),
+        lambda: frozenset(
+            SharedContent.objects.parent_site(site)
+            .values_list('slug', flat=True)),
+    )
+    return slug in slugs
+
+
+@register.simple_tag(
     name='render_navigation',
     takes_context=True,
 )
 def render_navigation(context, identifier):
+    """
+    Render the navigation with the slugified ``identifier``.
+
+    Navigations are compiled and cached, and unless the
+    ``ICEKIT['NAVIGATION_CACHE_HTML']`` setting is disabled the rendered HTML
+    is cached per navigation, set of active items, authentication state,
+    page and language. Templates that override
+    ``icekit/navigation/navigation.html`` or item templates must not vary on
+    anything else, or disable the setting.
+    """
     request = context['request']
+    page = context.get('page')
 
     navigation_slug = slugify(identifier)
-    navigation = navigation_models.Navigation.objects.filter(slug=navigation_slug).first()
-    if navigation:
-        navigation.set_request(request)
-
-    return {
-        'navigation': navigation,
-        'page': context.get('page'),
-        'request': context.get('request'),
-    }
+    navigation_id = get_or_set(
+        make_key(NAVIGATION_CACHE_NAMESPACE, 'slug', navigation_slug),
+        lambda: navigation_models.Navigation.objects
+            .filter(slug=navigation_slug)
+            .values_list('pk', flat=True)
+            .first() or 0,
+    )
+
+    def render():
+        navigation = None
+        if navigation_id:
+            navigation = navigation_models.Navigation.objects.get(
+                pk=navigation_id)
+            navigation.set_request(request)
+        return render_to_string(
+            'icekit/navigation/navigation.html',
+            {
+                'navigation': navigation,
+                'page': page,
+            },
+            request=request,
+        )
+
+    if not navigation_id or not icekit_appsettings.NAVIGATION_CACHE_HTML:
+        return mark_safe(render())
+
+    compiled = navigation_models.Navigation.get_compiled(navigation_id)
+    cache_key = compiled.get_html_cache_key(
+        request, getattr(page, 'pk', None), get_language())
+    if cache_key is None:
+        return mark_safe(render())
+    return mark_safe(get_or_set(cache_key, render))
 
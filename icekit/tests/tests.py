@@ -13,6 +13,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
 from django.core import exceptions
 from django.core.urlresolvers import reverse
+from django.template.loader import get_template
 from django.utils import six
 from django_dynamic_fixture import G
 from django_webtest import WebTest
@@ -161,6 +162,64 @@ class LayoutTest(WebTest):
             'bar with layout, baz with layout, foo with layout',
         )
 
+    def test_placeholder_data_is_cached(self):
+        layout = models.Layout.auto_add(
+            'icekit/layouts/default.html',
+            test_models.FooWithLayout,
+        )
+        with patch(
+                'icekit.utils.fluent_contents.get_template_placeholder_data'
+        ) as get_template_placeholder_data:
+            slots = [p.slot for p in layout.get_placeholder_data()]
+            self.assertEqual(get_template_placeholder_data.call_count, 0)
+        self.assertIn('main', slots)
+
+    def test_placeholder_data_uses_layout_template(self):
+        layout = models.Layout.auto_add(
+            'icekit/layouts/default.html',
+            test_models.FooWithLayout,
+        )
+        self.assertIn(
+            'main', [p.slot for p in layout.get_placeholder_data()])
+        # Layouts that render another template get its placeholders
+        with patch.object(
+                models.Layout, 'get_template',
+                return_value=get_template(
+                    'icekit/layouts/test_slot_contents.html')):
+            slots = [p.slot for p in layout.get_placeholder_data()]
+        self.assertEqual(['test-main'], slots)
+
+    def test_bulk_add_missing_placeholders(self):
+        layout = models.Layout.auto_add(
+            'icekit/layouts/default.html',
+            test_models.FooWithLayout,
+        )
+        foos = [G(test_models.FooWithLayout, layout=layout) for i in range(3)]
+        G(test_models.FooWithLayout, layout=None)
+        foos[0].add_missing_placeholders()
+        Placeholder.objects.update(title='Old title')
+
+        self.assertEqual(
+            test_models.FooWithLayout.bulk_add_missing_placeholders(
+                dry_run=True),
+            2)
+        self.assertEqual(Placeholder.objects.count(), 1)
+
+        self.assertEqual(
+            test_models.FooWithLayout.bulk_add_missing_placeholders(
+                batch_size=1),
+            2)
+        placeholders = Placeholder.objects.filter(slot='main')
+        self.assertEqual(
+            sorted(placeholders.values_list('parent_id', flat=True)),
+            sorted(foo.pk for foo in foos))
+        title = [p.title for p in layout.get_placeholder_data()
+                 if p.slot == 'main'][0]
+        self.assertEqual(
+            set(placeholders.values_list('title', flat=True)), set([title]))
+        self.assertEqual(
+            test_models.FooWithLayout.bulk_add_missing_placeholders(), 0)
+
 
 class Models(WebTest):
     def setUp(self):
@@ -519,6 +578,31 @@ class Views(WebTest):
         self.response_page_2.is_active = True
         self.response_page_2.save()
 
+    def test_response_pages_are_cached(self):
+        response = self.app.get(reverse('404'), expect_errors=404)
+        response.mustcontain(self.response_page_1.title)
+        # Updating without signals leaves the cached body in place
+        ResponsePage.objects.filter(pk=self.response_page_1.pk) \
+            .update(title='Updated title')
+        response = self.app.get(reverse('404'), expect_errors=404)
+        response.mustcontain(self.response_page_1.title)
+        # Saving invalidates it
+        self.response_page_1.title = 'Saved title'
+        self.response_page_1.save()
+        response = self.app.get(reverse('404'), expect_errors=404)
+        response.mustcontain('Saved title')
+
+        # The 500 page rendered when it was saved is served if rendering
+        # fails, even if it has not been requested
+        self.response_page_2.title = 'Saved 500 title'
+        self.response_page_2.save()
+        with patch(
+                'icekit.response_pages.views.get_active_response_page_pk',
+                side_effect=Exception):
+            response = self.app.get(reverse('500'), expect_errors=500)
+        self.assertEqual(response.status_code, 500)
+        response.mustcontain('Saved 500 title')
+
     def test_layoutpage_front_end(self):
         # LayoutPage is unpublished
         response = self.client.get(self.layoutpage_1.get_absolute_url())
@@ -591,3 +675,15 @@ class TestIceKitTags(WebTest):
         response.mustcontain('<div class="tag-fake-slot-render">None</div>')
         response.mustcontain('div class="filter-fake-slot">None</div>')
 
+
+    def test_sharedcontent_exists(self):
+        from fluent_contents.plugins.sharedcontent.models import SharedContent
+        from icekit.templatetags.icekit_tags import sharedcontent_exists
+        self.assertFalse(sharedcontent_exists('test-shared-content'))
+        shared_content = SharedContent.objects.create(
+            slug='test-shared-content',
+            parent_site=Site.objects.get_current(),
+        )
+        self.assertTrue(sharedcontent_exists('test-shared-content'))
+        shared_content.delete()
+        self.assertFalse(sharedcontent_exists('test-shared-content'))
@@ -0,0 +1,160 @@
+"""
+Helpers for caching derived data, like rendered HTML, in the Django cache.
+
+Cached values are grouped into named "namespaces". Each namespace has a version
+number stored in the cache which forms part of every key in the namespace, so
+all values in a namespace can be invalidated at once by bumping the version
+instead of tracking and deleting individual keys.
+"""
+import time
+from hashlib import md5
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.utils.encoding import force_bytes
+
+from icekit import appsettings
+
+KEY_PREFIX = 'icekit'
+
+# Names of fields that record when an object was last modified, in order of
+# preference, as used by `get_modified_timestamp`.
+MODIFIED_FIELD_NAMES = (
+    'publishing_modified_at',
+    'modification_date',
+    'date_modified',
+    'modified',
+    'datetime_modified',
+)
+
+
+# Process-local copies of cached values, see `get_or_set_local`
+_local_cache = {}
+LOCAL_CACHE_MAX_ENTRIES = 1000
+
+
+def _version_key(namespace):
+    return '%s:ns:%s' % (KEY_PREFIX, namespace)
+
+
+def get_namespace_version(namespace):
+    """
+    Return the current version number for a cache namespace, initialising it
+    if necessary.
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the current time so a version that was evicted from the
+        # cache is never reused for stale values.
+        version = int(time.time() * 1000)
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def invalidate_namespace(namespace):
+    """
+    Invalidate all values cached in a namespace by bumping its version.
+    """
+    key = _version_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Version is not yet set, or was evicted
+        cache.set(key, int(time.time() * 1000), None)
+
+
+def make_key(namespace, *parts, **kwargs):
+    """
+    Return a cache key for the given parts within a namespace, including the
+    namespace's current version. Parts are hashed to keep keys short and safe
+    for all cache backends.
+
+    Pass a ``version`` keyword argument from `get_namespace_version` to avoid
+    looking it up again when making many keys.
+    """
+    version = kwargs.get('version')
+    if version is None:
+        version = get_namespace_version(namespace)
+    digest = md5(force_bytes(
+        u':'.join([u'%s' % (p,) for p in parts]))).hexdigest()
+    return '%s:%s:%s:%s' % (KEY_PREFIX, namespace, version, digest)
+
+
+def get_or_set(key, default, timeout=None):
+    """
+    Return the value cached for ``key``, or call ``default`` to produce it
+    and cache the result for ``timeout`` seconds (defaults to the
+    ``ICEKIT['CACHE_TIMEOUT']`` setting).
+    """
+    value = cache.get(key)
+    if value is None:
+        value = default()
+        if value is not None:
+            cache.set(key, value, get_timeout(timeout))
+    return value
+
+
+def get_or_set_local(key, default, timeout=None):
+    """
+    Like `get_or_set`, but also keep a copy of the value in process memory,
+    for small values that are checked very often. Since the key includes the
+    namespace version, local copies are invalidated with the shared cache.
+    """
+    try:
+        return _local_cache[key]
+    except KeyError:
+        pass
+    value = get_or_set(key, default, timeout)
+    if len(_local_cache) >= LOCAL_CACHE_MAX_ENTRIES:
+        # Discard everything, including values for old namespace versions
+        _local_cache.clear()
+    _local_cache[key] = value
+    return value
+
+
+def get_timeout(timeout=None):
+    if timeout is None:
+        return appsettings.CACHE_TIMEOUT
+    return timeout
+
+
+def get_modified_timestamp(obj):
+    """
+    Return the last modified date of ``obj`` from the first available well
+    known field, or `None` if it has no such field.
+    """
+    for field_name in MODIFIED_FIELD_NAMES:
+        value = getattr(obj, field_name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def get_object_cache_parts(obj):
+    """
+    Return a tuple of values that identify the current state of ``obj``, for
+    use in cache keys.
+    """
+    return (
+        obj._meta.app_label,
+        obj._meta.model_name,
+        obj.pk,
+        get_modified_timestamp(obj),
+    )
+
+
+def connect_invalidation(receiver, base_classes,
+                         signals=(post_save, post_delete)):
+    """
+    Connect ``receiver`` to ``signals`` for each installed model that is a
+    subclass of ``base_classes``, so it is not called for saves of unrelated
+    models. Call this from `AppConfig.ready()`, once all models are loaded.
+    """
+    for model in apps.get_models():
+        if not issubclass(model, base_classes):
+            continue
+        for signal in signals:
+            signal.connect(receiver, sender=model)
@@ -1,4 +1,32 @@
+import logging
+import os
+
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.template import engines
+from django.template.loader import get_template
+from django.utils import six
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from fluent_contents.analyzer import get_template_placeholder_data
+
+from icekit.publishing.middleware import is_draft_request_context
+from icekit.utils.cache import get_timeout, make_key
+
+logger = logging.getLogger(__name__)
+
+# Cache namespace for rendered content items, see `RenderCachePluginMixin`.
+# Items are invalidated in `icekit.apps`.
+CONTENT_ITEM_RENDER_CACHE_NAMESPACE = 'content_item_render'
+
+
+def get_content_item_render_cache_key(pk):
+    """
+    Return the key for output cached by `RenderCachePluginMixin` for the
+    content item with ``pk``.
+    """
+    return make_key(CONTENT_ITEM_RENDER_CACHE_NAMESPACE, pk)
 
 
 # USEFUL FUNCTIONS FOR FLUENT CONTENTS #############################################################
@@ -45,4 +73,132 @@ def create_content_instance(content_plugin_class, page, placeholder_name='main',
         )
     return content_instance
 
+
+# Placeholder data parsed from templates, as `(mtime, data)` tuples by template
+# name, shared by all layouts in the process. See `get_placeholder_data`.
+_placeholder_data_registry = {}
+
+
+def _get_template_loaders():
+    loaders = []
+    for engine in engines.all():
+        template_loaders = getattr(
+            getattr(engine, 'engine', None), 'template_loaders', ())
+        for loader in template_loaders:
+            # Unwrap the cached loader
+            loaders.extend(getattr(loader, 'loaders', [loader]))
+    return loaders
+
+
+def get_template_mtime(template_name):
+    """
+    Return the modification time of the source file for a template, as found
+    by the installed template loaders, or `None` if it cannot be found.
+    """
+    for loader in _get_template_loaders():
+        try:
+            sources = list(loader.get_template_sources(template_name))
+        except Exception:
+            continue
+        for source in sources:
+            try:
+                return os.path.getmtime(getattr(source, 'name', source))
+            except (OSError, TypeError):
+                continue
+    return None
+
+
+def get_loaded_template_name(template):
+    """
+    Return the name a loaded template was found by, or `None`.
+    """
+    # Templates of the Django backend wrap a `django.template.base.Template`
+    return getattr(getattr(template, 'template', template), 'name', None)
+
+
+def get_placeholder_data(template_name, template=None):
+    """
+    Return a list of ``PlaceholderData`` for the placeholders in a template.
+    Pass the loaded ``template`` named ``template_name``, if you have it, to
+    parse it instead of loading the template again.
+
+    Parsed placeholder data is kept in a process-wide registry, and only
+    parsed again when the template's source file is modified. Changes to
+    templates it extends are only picked up on restart.
+    """
+    mtime = get_template_mtime(template_name)
+    registered = _placeholder_data_registry.get(template_name)
+    if registered is None or registered[0] != mtime:
+        registered = (
+            mtime,
+            get_template_placeholder_data(
+                template or get_template(template_name)),
+        )
+        _placeholder_data_registry[template_name] = registered
+    return list(registered[1])
+
+
+def warm_placeholder_data(template_names):
+    """
+    Parse placeholder data for the given templates into the registry used by
+    `get_placeholder_data`, logging templates that cannot be parsed.
+    """
+    for template_name in template_names:
+        try:
+            get_placeholder_data(template_name)
+        except Exception:
+            logger.warning(
+                'Could not get placeholder data for template %r',
+                template_name, exc_info=True)
+
 # END Fluent Contents Helper Functions #############################################################
+
+
+# Fluent Contents Plugin Mixins ###################################################################
+class RenderCachePluginMixin(object):
+    """
+    Opt-in render cache for content plugins, which applies wherever the
+    plugin's ``render()`` is called: page rendering, `render_content_items`
+    (e.g. for readability scores), and the pages API.
+
+    Output is cached per content item, draft or published request context, and
+    language, all under one cache key for the item. Cached output is
+    invalidated when the item is saved or deleted.
+
+    Only use this for plugins with output that does not vary by request. If
+    the output depends on other objects, such as a linked image, return values
+    identifying their state from `get_render_cache_parts`.
+    """
+    # Timeout in seconds, defaults to the `ICEKIT['CACHE_TIMEOUT']` setting
+    render_cache_timeout = None
+
+    def get_render_cache_parts(self, request, instance):
+        """
+        Return additional values that identify the state of objects the output
+        for ``instance`` depends on.
+        """
+        return ()
+
+    def get_render_cache_key(self, request, instance):
+        return get_content_item_render_cache_key(instance.pk)
+
+    def render(self, request, instance, **kwargs):
+        if instance.pk is None:
+            return super(RenderCachePluginMixin, self).render(
+                request, instance, **kwargs)
+        cache_key = self.get_render_cache_key(request, instance)
+        variant = (is_draft_request_context(), get_language())
+        parts = tuple(self.get_render_cache_parts(request, instance))
+        # Output by variant, with the parts it was rendered for
+        outputs = cache.get(cache_key) or {}
+        cached_parts, output = outputs.get(variant, (None, None))
+        if output is None or cached_parts != parts:
+            output = super(RenderCachePluginMixin, self).render(
+                request, instance, **kwargs)
+            # Don't cache non-HTML output, such as redirects
+            if not isinstance(output, six.string_types):
+                return output
+            outputs[variant] = (parts, output)
+            cache.set(
+                cache_key, outputs, get_timeout(self.render_cache_timeout))
+        return mark_safe(output)
@@ -6,6 +6,8 @@ from django.http import Http404
 from el_pagination.utils import get_page_numbers
 from rest_framework.pagination import PageNumberPagination
 
+from icekit.api.pagination import KeysetPaginationMixin
+
 
 # We use a subclass of Http404 so that unexpected page numbers
 # are handled by default by Django
@@ -77,8 +79,9 @@ def parse_page_number(page_number):
     return page_number
 
 
-class ICEKitAPIPagination(PageNumberPagination):
+class ICEKitAPIPagination(KeysetPaginationMixin, PageNumberPagination):
     """
-    Default API pagination configuration for ICEKit.
+    Default API pagination configuration for ICEKit. Pass a ``cursor``
+    query parameter for keyset pagination, see `KeysetPaginationMixin`.
     """
     page_size = 5
@@ -0,0 +1,119 @@
+"""
+Benchmarks for readability scoring over a corpus of long-form texts.
+
+Run with::
+
+    $ python -m icekit.utils.readability.benchmark [texts] [processes]
+
+This needs the NLTK punkt data set, see README.md.
+"""
+import bisect
+import random
+import sys
+import time
+
+from .readability import Readability, score_many
+
+# Syllable parts to generate the words of a corpus from
+ONSETS = (
+    '', '', 'b', 'bl', 'br', 'c', 'ch', 'cl', 'cr', 'd', 'dr', 'f', 'fl', 'g',
+    'gr', 'h', 'j', 'k', 'l', 'm', 'n', 'p', 'pl', 'pr', 'qu', 'r', 's', 'sh',
+    'sl', 'sp', 'st', 't', 'th', 'tr', 'v', 'w', 'wh', 'y', 'z',
+)
+VOWELS = (
+    'a', 'a', 'e', 'e', 'i', 'i', 'o', 'o', 'u', 'ai', 'ea', 'ee', 'ie', 'oa',
+    'oo', 'ou', 'y',
+)
+CODAS = (
+    '', '', '', 'b', 'ck', 'd', 'ft', 'g', 'l', 'ld', 'm', 'mp', 'n', 'nd',
+    'ng', 'nt', 'p', 'r', 'rd', 'rn', 's', 'sh', 'st', 't', 'th', 'x',
+)
+# Relative frequency of words with one to five syllables
+SYLLABLE_WEIGHTS = (40, 30, 17, 9, 4)
+
+
+def _weighted_choice(rng, cumulative_weights):
+    return bisect.bisect(
+        cumulative_weights, rng.random() * cumulative_weights[-1])
+
+
+def _cumulative(weights):
+    total = 0
+    cumulative = []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+
+def make_vocabulary(size, rng):
+    """
+    Return a list of ``size`` distinct generated words, with a spread of
+    lengths and syllable counts like English, mostly shortest first.
+    """
+    syllable_weights = _cumulative(SYLLABLE_WEIGHTS)
+    vocabulary = set()
+    while len(vocabulary) < size:
+        syllables = _weighted_choice(rng, syllable_weights) + 1
+        vocabulary.add(''.join(
+            rng.choice(ONSETS) + rng.choice(VOWELS) + rng.choice(CODAS)
+            for i in range(syllables)))
+    # Common words tend to be short
+    return sorted(
+        sorted(vocabulary), key=lambda word: len(word) + rng.random() * 8)
+
+
+def make_corpus(count=200, sentences_per_text=120, vocabulary_size=20000,
+                seed=0):
+    """
+    Return a list of ``count`` long-form texts, like a typical page or
+    collection record, of sentences of words generated by `make_vocabulary`.
+
+    Words are used with a Zipf distribution, as in natural language, so that
+    a few words are very common and most are rare, and sentences vary in
+    length.
+    """
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(vocabulary_size, rng)
+    word_weights = _cumulative(
+        1.0 / rank for rank in range(1, vocabulary_size + 1))
+    texts = []
+    for j in range(count):
+        sentences = []
+        for i in range(sentences_per_text):
+            words = [
+                vocabulary[_weighted_choice(rng, word_weights)]
+                for k in range(rng.randint(4, 30))
+            ]
+            if len(words) > 10 and rng.random() < 0.5:
+                words[rng.randint(3, len(words) - 4)] += ','
+            sentences.append(' '.join(words).capitalize() + '.')
+        texts.append(' '.join(sentences))
+    return texts
+
+
+def timed(label, func, *args, **kwargs):
+    start = time.time()
+    result = func(*args, **kwargs)
+    sys.stdout.write('%-40s %8.3fs\n' % (label, time.time() - start))
+    return result
+
+
+def run(count=200, processes=4):
+    corpus = make_corpus(count)
+    words = sum(len(text.split()) for text in corpus)
+    sys.stdout.write('Scoring %s texts, %s words\n' % (len(corpus), words))
+    expected = timed(
+        'Readability(text).SMOGIndex()',
+        lambda: [Readability(text).SMOGIndex() for text in corpus])
+    scores = timed('score_many(texts)', score_many, corpus)
+    assert scores == expected
+    if processes > 1:
+        scores = timed(
+            'score_many(texts, processes=%s)' % processes,
+            score_many, corpus, processes=processes)
+        assert scores == expected
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:3]])
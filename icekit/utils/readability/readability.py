@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 
 import math
+from functools import partial
+from multiprocessing import Pool
 
 from .readability_utils import get_char_count
 from .readability_utils import get_words
@@ -12,16 +14,21 @@ from .readability_utils import count_complex_words
 class Readability:
     analyzedVars = {}
 
-    def __init__(self, text):
-        self.analyze_text(text)
+    def __init__(self, text, syllable_cache=None):
+        self.analyze_text(text, syllable_cache)
 
-    def analyze_text(self, text):
+    def analyze_text(self, text, syllable_cache=None):
         words = get_words(text)
+        sentences = get_sentences(text)
         char_count = get_char_count(words)
         word_count = len(words)
-        sentence_count = len(get_sentences(text))
-        syllable_count = count_syllables(words)
-        complexwords_count = count_complex_words(text)
+        sentence_count = len(sentences)
+        if syllable_cache is None:
+            syllable_cache = {}
+        syllable_count = count_syllables(words, syllable_cache)
+        complexwords_count = count_complex_words(
+            text, words=words, sentences=sentences,
+            syllable_cache=syllable_cache)
         avg_words_p_sentence = word_count/sentence_count
 
         self.analyzedVars = {
@@ -90,6 +97,43 @@ class Readability:
             score = longwords / self.analyzedVars['sentence_cnt']
         return score
 
+
+def _score_many(texts, metric):
+    # Share syllable counts for each word across all texts
+    syllable_cache = {}
+    scores = []
+    for text in texts:
+        try:
+            readability = Readability(text, syllable_cache=syllable_cache)
+            scores.append(getattr(readability, metric)())
+        except Exception:
+            scores.append(None)
+    return scores
+
+
+def score_many(texts, metric='SMOGIndex', processes=None, chunk_size=500):
+    """
+    Return a list of scores for many texts, with the given metric (the name
+    of a `Readability` method), or `None` for texts that cannot be scored.
+
+    Syllable counts are memoised per word across texts. If ``processes`` is
+    greater than 1, texts are scored in chunks of ``chunk_size`` across a
+    pool of that many processes.
+    """
+    texts = list(texts)
+    if not processes or processes <= 1:
+        return _score_many(texts, metric)
+    chunks = [
+        texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    pool = Pool(processes)
+    try:
+        results = pool.map(partial(_score_many, metric=metric), chunks)
+    finally:
+        pool.close()
+        pool.join()
+    return [score for chunk in results for score in chunk]
+
+
 # commenting for quick py3 compatibility
 # if __name__ == "__main__":
 #     text = """We are close to wrapping up our 10 week Rails Course. This week we will cover a handful of topics commonly encountered in Rails projects. We then wrap up with part 2 of our Reddit on Rails exercise!  By now you should be hard at work on your personal projects. The students in the course just presented in front of the class with some live demos and a brief intro to to the problems their app were solving. Maybe set aside some time this week to show someone your progress, block off 5 minutes and describe what goal you are working towards, the current state of the project (is it almost done, just getting started, needs UI, etc.), and then show them a quick demo of the app. Explain what type of feedback you are looking for (conceptual, design, usability, etc.) and see what they have to say.  As we are wrapping up the course you need to be focused on learning as much as you can, but also making sure you have the tools to succeed after the class is over."""
@@ -3,57 +3,83 @@ utility functions for breaking down a given block of text
 into it's component syntactic parts.
 """
 
+import re
+
 import nltk
 
 from nltk.tokenize import RegexpTokenizer
 from . import syllables_en
 
 TOKENIZER = RegexpTokenizer('(?u)\W+|\$[\d\.]+|\S+')
-SPECIAL_CHARS = ['.', ',', '!', '?']
+SPECIAL_CHARS = frozenset(['.', ',', '!', '?', ' '])
+SPECIAL_CHARS_RE = re.compile('[.,!?]')
 
 def get_char_count(words):
-    characters = 0
-    for word in words:
-        characters += len(word.decode("utf-8"))
-    return characters
+    return sum(
+        len(word.decode("utf-8")) if isinstance(word, bytes) else len(word)
+        for word in words)
 
 def get_words(text=''):
-    words = []
-    words = TOKENIZER.tokenize(text)
-    filtered_words = []
-    for word in words:
-        if word in SPECIAL_CHARS or word == " ":
-            pass
-        else:
-            new_word = word.replace(",","").replace(".","")
-            new_word = new_word.replace("!","").replace("?","")
-            filtered_words.append(new_word)
-    return filtered_words
+    strip_special_chars = SPECIAL_CHARS_RE.sub
+    return [
+        strip_special_chars('', word)
+        for word in TOKENIZER.tokenize(text)
+        if word not in SPECIAL_CHARS
+    ]
+
+_sentence_tokenizer = None
+
+def get_sentence_tokenizer():
+    """
+    Return the punkt sentence tokenizer, which is loaded once per process.
+    """
+    global _sentence_tokenizer
+    if _sentence_tokenizer is None:
+        _sentence_tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
+    return _sentence_tokenizer
 
 def get_sentences(text=''):
-    tokenizer = nltk.data.load('tokenizers/punkt/english.pickle')
-    sentences = tokenizer.tokenize(text)
+    sentences = get_sentence_tokenizer().tokenize(text)
     return sentences
 
-def count_syllables(words):
-    syllableCount = 0
-    for word in words:
-        syllableCount += syllables_en.count(word)
-    return syllableCount
+def count_word_syllables(word, cache=None):
+    """
+    Return the syllables in ``word``, memoised in the ``cache`` dict if given.
+    """
+    if cache is None:
+        return syllables_en.count(word)
+    try:
+        return cache[word]
+    except KeyError:
+        count = cache[word] = syllables_en.count(word)
+        return count
+
+def count_syllables(words, cache=None):
+    return sum(count_word_syllables(word, cache) for word in words)
 
 #This method must be enhanced. At the moment it only
 #considers the number of syllables in a word.
 #This often results in that too many complex words are detected.
-def count_complex_words(text=''):
-    words = get_words(text)
-    sentences = get_sentences(text)
+def count_complex_words(text='', words=None, sentences=None,
+                        syllable_cache=None):
+    """
+    Count words with 3 or more syllables, excluding capitalised words (which
+    are probably proper nouns) unless they start a sentence.
+
+    Pass ``words`` and ``sentences`` if they are already known, to avoid
+    tokenizing the text again, and a ``syllable_cache`` dict to memoise
+    syllable counts.
+    """
+    if words is None:
+        words = get_words(text)
+    if sentences is None:
+        sentences = get_sentences(text)
     complex_words = 0
-    found = False
-    cur_word = []
+    # The starts of sentences, by length, to check capitalised words against
+    sentence_starts = {}
 
     for word in words:
-        cur_word.append(word)
-        if count_syllables(cur_word)>= 3:
+        if count_word_syllables(word, syllable_cache) >= 3:
 
             #Checking proper nouns. If a word starts with a capital letter
             #and is NOT at the beginning of a sentence we don't add it
@@ -61,14 +87,11 @@ def count_complex_words(text=''):
             if not(word[0].isupper()):
                 complex_words += 1
             else:
-                for sentence in sentences:
-                    if str(sentence).startswith(word):
-                        found = True
-                        break
-                if found:
+                length = len(word)
+                if length not in sentence_starts:
+                    sentence_starts[length] = set(
+                        str(sentence)[:length] for sentence in sentences)
+                if word in sentence_starts[length]:
                     complex_words += 1
-                    found = False
 
-        cur_word.remove(word)
     return complex_words
-
@@ -1,14 +1,20 @@
 import os
 import shutil
 
+from django.apps import apps
 from django.conf import settings
 from django_dynamic_fixture import G
 from django_webtest import WebTest
 
-from icekit.utils import testing
+from icekit.admin_tools import previews
+from icekit.utils import cache, testing
 from icekit.tests.models import ImageTest
 from icekit.utils.sequences import slice_sequences
 from icekit.utils.pagination import describe_page_numbers, parse_page_number
+from icekit.utils.readability import benchmark, readability_utils
+from icekit.utils.readability.readability import Readability, score_many
+
+Image = apps.get_model('icekit_plugins_image.Image')
 
 
 class TestingUtils(WebTest):
@@ -205,3 +211,57 @@ class TestingUtils(WebTest):
         self.assertEqual(parse_page_number('2'), 2)
         self.assertEqual(parse_page_number('-2'), 1)
         self.assertEqual(parse_page_number('2.1'), 1)
+
+
+class CacheUtils(WebTest):
+    def test_namespace_invalidation(self):
+        key = cache.make_key('test', 'a', 1)
+        self.assertEqual(key, cache.make_key('test', 'a', 1))
+        self.assertNotEqual(key, cache.make_key('test', 'a', 2))
+        self.assertNotEqual(key, cache.make_key('other', 'a', 1))
+
+        self.assertEqual('x', cache.get_or_set(key, lambda: 'x'))
+        # Cached value is returned without calling `default`
+        self.assertEqual('x', cache.get_or_set(key, lambda: 'y'))
+
+        cache.invalidate_namespace('test')
+        new_key = cache.make_key('test', 'a', 1)
+        self.assertNotEqual(key, new_key)
+        self.assertEqual('y', cache.get_or_set(new_key, lambda: 'y'))
+
+    def test_preview_cache_invalidation(self):
+        # Saves invalidate cached previews without a preview being rendered
+        # first in this process.
+        self.assertIn(Image, previews.get_preview_models())
+        namespace = previews.get_preview_cache_namespace(Image)
+        key = cache.make_key(namespace, 'a')
+        G(Image)
+        self.assertNotEqual(key, cache.make_key(namespace, 'a'))
+
+
+class ReadabilityUtils(WebTest):
+    def test_count_complex_words(self):
+        sentences = [
+            'Beautiful gardens surround Adelaide.',
+            'Everybody visits Adelaide in summer.',
+        ]
+        words = readability_utils.get_words(' '.join(sentences))
+        # "Beautiful" and "Everybody" start sentences and are counted, but
+        # "Adelaide" is treated as a proper noun.
+        self.assertEqual(
+            readability_utils.count_complex_words(
+                words=words, sentences=sentences),
+            2)
+
+    def test_score_many(self):
+        try:
+            readability_utils.get_sentence_tokenizer()
+        except LookupError:
+            self.skipTest('NLTK punkt data is not installed')
+        corpus = benchmark.make_corpus(count=5, sentences_per_text=20)
+        self.assertEqual(
+            score_many(corpus),
+            [Readability(text).SMOGIndex() for text in corpus])
+        self.assertEqual(
+            score_many(corpus, metric='ARI'),
+            [Readability(text).ARI() for text in corpus])
@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.admin import GenericTabularInline
 from django import forms
+from django.db.models import Q
 from django.utils.text import Truncator
 
 from . import models
@@ -14,6 +15,52 @@ def get_users_for_assigned_to():
     return User.objects.filter(is_active=True, is_staff=True)
 
 
+def filter_queryset_by_workflow_states(queryset, **kwargs):
+    """
+    Return the given queryset filtered to items with related ``WorkflowState``
+    records matching the given ``kwargs``, in the database.
+
+    For polymorphic querysets we cannot follow the generic relationship since
+    workflow states are related to the real (child) content type, so instead
+    we match each item's ``polymorphic_ctype_id`` and ``pk`` against a
+    subquery on ``WorkflowState`` for each relevant content type.
+    """
+    wfstates_qs = models.WorkflowState.objects.filter(**kwargs)
+
+    # If admin is for a `WorkflowStateMixin` subclass use simple query,
+    # unless it's polymorphic which won't always work...
+    if issubclass(queryset.model, models.WorkflowStateMixin) \
+            and not hasattr(queryset, 'non_polymorphic'):
+        return queryset.filter(
+            **dict(('workflow_states__%s' % k, v) for k, v in kwargs.items()))
+
+    # ...if admin is for a non-polymorphic model match its content type...
+    if not hasattr(queryset, 'non_polymorphic'):
+        ct = ContentType.objects.get_for_model(
+            queryset.model, for_concrete_model=False)
+        return queryset.filter(pk__in=wfstates_qs.filter(
+            content_type=ct).values('object_id'))
+
+    # ...otherwise match each item's polymorphic content type and PK with a
+    # subquery per content type that has matching workflow states. There are
+    # only ever a handful of such content types.
+    ct_ids = wfstates_qs \
+        .order_by() \
+        .values_list('content_type_id', flat=True) \
+        .distinct()
+    q = None
+    for ct_id in ct_ids:
+        ct_q = Q(
+            polymorphic_ctype_id=ct_id,
+            pk__in=wfstates_qs.filter(
+                content_type_id=ct_id).values('object_id'),
+        )
+        q = ct_q if q is None else q | ct_q
+    if q is None:
+        return queryset.none()
+    return queryset.filter(q)
+
+
 class WorkflowStateStatusFilter(admin.SimpleListFilter):
     title = 'Workflow Status'
     parameter_name = 'workflow_status'
@@ -24,27 +71,8 @@ class WorkflowStateStatusFilter(admin.SimpleListFilter):
     def queryset(self, request, queryset):
         if self.value() is None:
             return queryset
-
-        value = self.value()
-
-        # If admin is for a `WorkflowStateMixin` subclass use simple query,
-        # unless it's polymorphic which won't always work...
-        if issubclass(queryset.model, models.WorkflowStateMixin) \
-                and not hasattr(queryset, 'non_polymorphic'):
-            return queryset.filter(
-                workflow_states__status=value)
-
-        # ...if admin is not for a `WorkflowStateForm` subclass we must iterate
-        # over child model instances to find the items that should be filterd
-        wf_state_ct_pks = set([
-            (wfstate.content_type_id, wfstate.object_id)
-            for wfstate in models.WorkflowState.objects.filter(status=value)
-        ])
-        pks_to_exclude = []
-        for item in queryset.get_real_instances():
-            if (item.polymorphic_ctype_id, item.pk) not in wf_state_ct_pks:
-                pks_to_exclude.append(item.pk)
-        return queryset.exclude(pk__in=pks_to_exclude)
+        return filter_queryset_by_workflow_states(
+            queryset, status=self.value())
 
 
 class WorkflowStateAssignedToFilter(admin.SimpleListFilter):
@@ -60,28 +88,8 @@ class WorkflowStateAssignedToFilter(admin.SimpleListFilter):
     def queryset(self, request, queryset):
         if self.value() is None:
             return queryset
-
-        value = self.value()
-
-        # If admin is for a `WorkflowStateMixin` subclass use simple query,
-        # unless it's polymorphic which won't always work...
-        if issubclass(queryset.model, models.WorkflowStateMixin) \
-                and not hasattr(queryset, 'non_polymorphic'):
-            return queryset.filter(
-                workflow_states__assigned_to=value)
-
-        # ...if admin is not for a `WorkflowStateForm` subclass we must iterate
-        # over child model instances to find the items that should be filterd
-        wf_state_ct_pks = set([
-            (wfstate.content_type_id, wfstate.object_id)
-            for wfstate in models.WorkflowState.objects.filter(
-                assigned_to=value)
-        ])
-        pks_to_exclude = []
-        for item in queryset.get_real_instances():
-            if (item.polymorphic_ctype_id, item.pk) not in wf_state_ct_pks:
-                pks_to_exclude.append(item.pk)
-        return queryset.exclude(pk__in=pks_to_exclude)
+        return filter_queryset_by_workflow_states(
+            queryset, assigned_to=self.value())
 
 
 class WorkflowStateForm(forms.ModelForm):
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('icekit_workflow', '0006_auto_20170308_2044'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='workflowstate',
+            index_together=set([('content_type', 'object_id', 'status')]),
+        ),
+    ]
@@ -55,6 +55,10 @@ class WorkflowState(models.Model):
     class Meta:
         app_label = 'icekit_workflow'
         ordering = ("-datetime_modified", )
+        # Supports admin filtering of polymorphic items by workflow state
+        index_together = (
+            ('content_type', 'object_id', 'status'),
+        )
 
     def __str__(self):
         if self.assigned_to:
@@ -7,11 +7,13 @@ from django.test import TestCase
 
 from django_dynamic_fixture import G
 from django_webtest import WebTest
+from fluent_pages.models import UrlNode
 
-from icekit.page_types.article.models import Article
+from icekit.page_types.article.models import Article, ArticleCategoryPage
 from icekit.page_types.layout_page.models import LayoutPage
 
 from . import models
+from .admin import filter_queryset_by_workflow_states
 
 
 User = get_user_model()
@@ -79,6 +81,59 @@ class TestWorkflowStateMixin(TestCase):
             list(self.obj_with_mixin.workflow_states.all()))
 
 
+class TestFilterQuerysetByWorkflowStates(TestCase):
+
+    def setUp(self):
+        self.user = G(User)
+        self.layoutpage_1 = G(LayoutPage)
+        self.layoutpage_2 = G(LayoutPage)
+        self.categorypage_1 = G(ArticleCategoryPage)
+        self.categorypage_2 = G(ArticleCategoryPage)
+        self.article_1 = G(Article)
+        self.article_2 = G(Article)
+        for obj, status in (
+                (self.layoutpage_1, 'ready_to_review'),
+                (self.layoutpage_2, 'approved'),
+                (self.categorypage_1, 'ready_to_review'),
+                (self.article_1, 'ready_to_review'),
+                (self.article_2, 'approved'),
+                (self.user, 'ready_to_review')):
+            models.WorkflowState.objects.create(
+                content_object=obj, status=status)
+
+    def assertFiltered(self, expected, queryset, **kwargs):
+        self.assertEqual(
+            sorted(obj.pk for obj in expected),
+            sorted(filter_queryset_by_workflow_states(queryset, **kwargs)
+                   .values_list('pk', flat=True)))
+
+    def test_polymorphic_queryset(self):
+        # Items of several content types are matched by their own type
+        self.assertFiltered(
+            [self.layoutpage_1, self.categorypage_1],
+            UrlNode.objects.all(), status='ready_to_review')
+        self.assertFiltered(
+            [self.layoutpage_2],
+            UrlNode.objects.all(), status='approved')
+        self.assertFiltered(
+            [self.categorypage_1],
+            ArticleCategoryPage.objects.all(), status='ready_to_review')
+        self.assertFiltered([], UrlNode.objects.all(), status='new')
+
+    def test_workflow_state_mixin_queryset(self):
+        self.assertFiltered(
+            [self.article_1],
+            Article.objects.all(), status='ready_to_review')
+        self.assertFiltered(
+            [self.article_2], Article.objects.all(), status='approved')
+        self.assertFiltered([], Article.objects.all(), status='new')
+
+    def test_other_queryset(self):
+        self.assertFiltered(
+            [self.user], User.objects.all(), status='ready_to_review')
+        self.assertFiltered([], User.objects.all(), status='approved')
+
+
 class TestWorkflowMixinAdmin(WebTest):
 
     def setUp(self):